@@ -88,7 +88,9 @@ def run_backtest(
     renko_mode=None,
     renko_brick_size=None,
     renko_atr_period=None,
-    renko_volume_mode=None
+    renko_volume_mode=None,
+    n_jobs=None,
+    search=None
 ):
     """
     Main entry point for running backtests.
@@ -150,6 +152,8 @@ def run_backtest(
     enable_wfo = enable_wfo if enable_wfo is not None else config.optimization.enable_wfo
     enable_plotting = enable_plotting if enable_plotting is not None else config.optimization.enable_plotting
     view_plotting = view_plotting if view_plotting is not None else getattr(config.optimization, 'view_plotting', False)
+    n_jobs = n_jobs if n_jobs is not None else getattr(config.optimization, 'n_jobs', 1)
+    search = search if search is not None else getattr(config.optimization, 'search', 'auto')
 
     # 4. Determine Tickers
     synthetic_components = []
@@ -256,12 +260,19 @@ def run_backtest(
         combinations_count = 1
         for v in values: combinations_count *= len(v)
 
-        if combinations_count < 500:
+        # 'auto' runs the full grid when it is small and samples it otherwise
+        if search == 'auto':
+            search = 'grid' if combinations_count < 500 else 'random'
+
+        if search == 'coarse':
+            logging.info(f"Running Coarse-to-Fine Search ({combinations_count} grid points)...")
+            grid_results = engine.run_coarse_to_fine_search(StrategyClass, param_grid, metric=metric, n_jobs=n_jobs)
+        elif search == 'grid':
             logging.info(f"Running Grid Search ({combinations_count} combinations)...")
-            grid_results = engine.run_grid_search(StrategyClass, param_grid)
+            grid_results = engine.run_grid_search(StrategyClass, param_grid, n_jobs=n_jobs)
         else:
             logging.info(f"Running Random Search (500 iterations)...")
-            grid_results = engine.run_random_search(StrategyClass, param_grid, n_iter=500)
+            grid_results = engine.run_random_search(StrategyClass, param_grid, n_iter=500, n_jobs=n_jobs)
         
         if grid_results.empty:
             logging.error("Optimization returned no results.")
@@ -431,7 +442,8 @@ def run_backtest(
             param_grid, 
             window_size_days=252, 
             step_size_days=63, 
-            metric=metric
+            metric=metric,
+            n_jobs=n_jobs
         )
         if not oos_equity.empty:
             wfo_path = os.path.join(run_dir, "wfo_equity.csv")
@@ -485,6 +497,8 @@ if __name__ == "__main__":
     parser.add_argument("--renko_brick_size", type=float, help="Renko brick size (required for fixed mode)", default=None)
     parser.add_argument("--renko_atr_period", type=int, help="Renko ATR period (for atr mode)", default=None)
     parser.add_argument("--renko_volume_mode", type=str, choices=['last', 'equal', 'zero'], help="Volume allocation mode for Renko bricks", default=None)
+    parser.add_argument("--search", type=str, choices=['auto', 'grid', 'random', 'coarse'], help="Optimization search: auto (grid under 500 combinations, else random), grid, random, or coarse (coarse-to-fine)", default=None)
+    parser.add_argument("--n_jobs", "--n-jobs", type=int, help="Worker processes for parameter optimization (-1 = all cores)", default=None)
 
     # Batch Mode
     parser.add_argument("--batch", type=str, help="Path to batch configuration file (.json or .yaml)")
@@ -521,4 +535,6 @@ if __name__ == "__main__":
             renko_brick_size=args.renko_brick_size,
             renko_atr_period=args.renko_atr_period,
             renko_volume_mode=args.renko_volume_mode,
+            n_jobs=args.n_jobs,
+            search=args.search,
         )
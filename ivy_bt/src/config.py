@@ -28,6 +28,8 @@ class OptimizationConfig(BaseModel):
     enable_wfo: bool
     enable_plotting: bool
     view_plotting: bool = False
+    n_jobs: int = 1
+    search: Literal["auto", "grid", "random", "coarse"] = "auto"
 
 class AlpacaConfig(BaseModel):
     api_key: str = None
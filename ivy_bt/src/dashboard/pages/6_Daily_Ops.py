@@ -9,9 +9,8 @@ import logging
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
-import src.signals
-import importlib
-importlib.reload(src.signals)
+# Imported normally (not reloaded on every rerun) so src.signals' preset and signal
+# caches persist across Streamlit reruns
 from src.signals import generate_signals, load_preset
 from src.live_trader import execute_rebalance
 from src.config import load_config
@@ -80,7 +79,9 @@ if selected_preset_name:
                     target_vol=vol_target,
                     end_date=end_date.strftime('%Y-%m-%d'),
                     lookback=lookback,
-                    max_leverage=max_leverage
+                    max_leverage=max_leverage,
+                    # A past analysis date can't gain new bars, so repeat runs may reuse it
+                    use_cache=end_date < datetime.today().date()
                 )
                 
                 if signals_df is not None and not signals_df.empty:
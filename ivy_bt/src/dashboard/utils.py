@@ -17,6 +17,7 @@ if project_root not in sys.path:
 
 from src.strategies import get_all_strategies
 from src.risk import FixedSignalSizer, VolatilitySizer, KellySizer
+from src.reporting import monthly_returns_grid
 try:
     from src.instruments import crypto_assets, forex_assets, futures_assets, sector_etfs, get_sp500_crosswalk
 except ImportError:
@@ -389,13 +390,7 @@ def generate_pdf_from_results(equity_df, metrics, run_id, output_path):
         
         # Monthly Heatmap
         ax3 = plt.subplot(2, 1, 2)
-        monthly_rets = portfolio_log_returns.resample('M').apply(lambda x: np.exp(x.sum()) - 1)
-        monthly_rets_df = pd.DataFrame(monthly_rets)
-        monthly_rets_df['Year'] = monthly_rets_df.index.year
-        monthly_rets_df['Month'] = monthly_rets_df.index.month
-        # Use column name 0 or the series name
-        val_col = monthly_rets_df.columns[0]
-        pivot_rets = monthly_rets_df.pivot(index='Year', columns='Month', values=val_col)
+        pivot_rets = monthly_returns_grid(portfolio_log_returns)
         
         sns.heatmap(pivot_rets, annot=True, fmt=".1%", cmap="RdYlGn", center=0, ax=ax3, cbar=False)
         ax3.set_title("Monthly Returns")
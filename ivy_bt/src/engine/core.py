@@ -12,6 +12,20 @@ from .optimization import OptimizationMixin
 from .analysis import AnalysisMixin
 from .reporting import ReportingMixin
 
+def _as_int8_signal(signal: pd.Series) -> pd.Series:
+    """
+    Downcasts a whole-number signal (e.g. -1/0/1) to int8.
+    Fractional, NaN or out-of-range signals are returned unchanged.
+    """
+    values = signal.to_numpy()
+    if values.dtype == np.int8 or values.dtype.kind not in 'biuf' or values.size == 0:
+        return signal
+    if values.dtype.kind == 'f' and not (np.isfinite(values).all() and (values == np.trunc(values)).all()):
+        return signal
+    if values.min() < -128 or values.max() > 127:
+        return signal
+    return signal.astype(np.int8)
+
 class BacktestEngine(OptimizationMixin, AnalysisMixin, ReportingMixin):
     """
     The core engine for running backtests, optimizations, and analysis.
@@ -282,6 +296,26 @@ class BacktestEngine(OptimizationMixin, AnalysisMixin, ReportingMixin):
         logging.info(f"Created synthetic asset: {name} ({spread_type})")
         return name
 
+    def get_panel(self, fields):
+        """
+        Stacks per-ticker columns into one contiguous (time, asset, field) float64 array.
+        
+        Only non-empty tickers sharing the first one's index are stacked, so rows line up
+        without reindexing. Returns (panel, tickers, index); tickers on another calendar
+        are left out and stay available in self.data.
+        """
+        frames = [(t, self.data[t]) for t in self.tickers if t in self.data and not self.data[t].empty]
+        if not frames:
+            return np.empty((0, 0, len(fields))), [], pd.Index([])
+        
+        index = frames[0][1].index
+        frames = [(t, df) for t, df in frames if df.index.equals(index)]
+        panel = np.empty((len(index), len(frames), len(fields)), dtype=np.float64)
+        for j, (_, df) in enumerate(frames):
+            for k, field in enumerate(fields):
+                panel[:, j, k] = df[field].to_numpy(dtype=np.float64)
+        return panel, [t for t, _ in frames], index
+
     def run_strategy(self, strategy_logic, name=None, stop_loss=None):
         """
         Runs the strategy and stores metrics.
@@ -332,6 +366,8 @@ class BacktestEngine(OptimizationMixin, AnalysisMixin, ReportingMixin):
                     if stop_loss is not None:
                         df = apply_stop_loss(df, stop_loss_pct=stop_loss, trailing=False)
 
+                    # Signals are small whole numbers; int8 keeps the column 8x smaller
+                    df = df.assign(signal=_as_int8_signal(df['signal']))
                     df = self.position_sizer.size_position(df)
 
                     df['position'] = df['position_size'].shift(1).fillna(0)
@@ -354,6 +390,7 @@ class BacktestEngine(OptimizationMixin, AnalysisMixin, ReportingMixin):
                 if stop_loss is not None:
                     df = apply_stop_loss(df, stop_loss_pct=stop_loss, trailing=False)
 
+                df = df.assign(signal=_as_int8_signal(df['signal']))
                 df = self.position_sizer.size_position(df)
 
                 df['position'] = df['position_size'].shift(1).fillna(0)
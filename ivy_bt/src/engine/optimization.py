@@ -8,6 +8,145 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import gc
 from datetime import datetime
+from joblib import Parallel, delayed
+
+# Parameter combinations handed to a strategy's batch_apply per call
+_BATCH_SIZE = 64
+
+# Arrays above this size are handed to joblib workers as one shared read-only
+# memmap instead of being pickled into every chunk's task
+_MMAP_MAX_NBYTES = '1K'
+
+def _batch_apply_frames(batch_apply, data, tickers, combinations):
+    """
+    Runs a strategy's batch_apply over a chunk of parameter combinations on
+    every ticker.
+
+    Returns {ticker: [strat_apply-equivalent frame per combination]}. Tickers
+    whose batch call fails are left out, so the caller falls back to
+    strat_apply for them and logs the error per combination as usual.
+    """
+    frames = {}
+    for ticker in tickers:
+        try:
+            frames[ticker] = batch_apply(data[ticker], combinations)
+        except Exception:
+            continue
+    return frames
+
+def _evaluate_combinations(strategy_class, combinations, data, tickers, position_sizer, annualization_factor):
+    """
+    Backtests each parameter combination on the given data and returns one
+    {**params, 'Sharpe', 'Return'} dict per combination that produced returns.
+
+    A plain function over plain arguments (rather than an engine method), so
+    chunks of combinations can be shipped to joblib worker processes.
+    """
+    grid_results = []
+
+    # Determine if portfolio strategy
+    is_portfolio = getattr(strategy_class, 'is_portfolio_strategy', False)
+    # Strategies with a batch_apply evaluate _BATCH_SIZE combinations per call
+    batch_apply = None if is_portfolio else getattr(strategy_class, 'batch_apply', None)
+    batches = {}
+    # Strategies taking a buffers dict reuse one set of working arrays per ticker
+    uses_buffers = 'buffers' in inspect.signature(strategy_class.strat_apply).parameters
+    buffers = {ticker: {} for ticker in tickers}
+    # Strategies that build a new frame read the cached data without a per-run copy
+    mutates_input = getattr(strategy_class, 'mutates_input', True)
+
+    if is_portfolio:
+        # The universe's MultiIndex frame is concatenated once, not per combination
+        frames = []
+        keys_list = []
+        for ticker, df in data.items():
+            if not df.empty:
+                frames.append(df)
+                keys_list.append(ticker)
+        combined = pd.concat(frames, keys=keys_list, names=['ticker', 'timestamp']) if frames else None
+
+    for i, params in enumerate(combinations):
+        strat = strategy_class(**params)
+        if batch_apply is not None and i % _BATCH_SIZE == 0:
+            batches = _batch_apply_frames(batch_apply, data, tickers, combinations[i:i + _BATCH_SIZE])
+        run_returns = {} # Use a dict to keep track of ticker names
+
+        if is_portfolio:
+            # Portfolio Strategy Execution
+            if combined is None:
+                continue
+
+            try:
+                combined_df = strat.strat_apply(combined.copy() if mutates_input else combined)
+                
+                for ticker in keys_list:
+                    try:
+                        df = combined_df.xs(ticker, level='ticker', drop_level=True)
+                        df = position_sizer.size_position(df)
+                        df = df.dropna()
+                        df['position'] = df['position_size'].shift(1).fillna(0)
+                        df['log_return'] = np.log(df['close'] / df['close'].shift(1)).fillna(0)
+                        run_returns[ticker] = df['position'] * df['log_return']
+                    except KeyError:
+                        pass
+            except Exception as e:
+                logging.error(f"Error processing portfolio strategy: {e}")
+                continue
+        else:
+            for ticker in tickers:
+                try:
+                    if ticker in batches:
+                        df = batches[ticker][i % _BATCH_SIZE]
+                    else:
+                        df = data[ticker].copy() if mutates_input else data[ticker]
+                        if uses_buffers:
+                            df = strat.strat_apply(df, buffers=buffers[ticker])
+                        else:
+                            df = strat.strat_apply(df)
+                    
+                    # Apply Position Sizing
+                    df = position_sizer.size_position(df)
+                    
+                    df = df.dropna()
+
+                    # Signal Shift & Return Calculation
+                    df['position'] = df['position_size'].shift(1).fillna(0)
+                    df['log_return'] = np.log(df['close'] / df['close'].shift(1)).fillna(0)
+                    # Store in dict with ticker as key
+                    run_returns[ticker] = df['position'] * df['log_return']
+                except Exception as e:
+                    logging.error(f"Error processing {ticker}: {e}")
+                    continue
+
+        if not run_returns:
+            continue
+
+        # FIX: Align all tickers by Date Index before taking the mean
+        all_log_rets_df = pd.DataFrame(run_returns).fillna(0)
+        
+        # Convert to simple returns for portfolio aggregation
+        all_simple_rets_df = np.exp(all_log_rets_df) - 1
+        portfolio_simple_rets = all_simple_rets_df.mean(axis=1)
+        
+        # Convert back to log returns for metrics calculation
+        portfolio_rets = np.log1p(portfolio_simple_rets)
+
+        # Calculate Metrics (Dropping the first NaN from the shift)
+        clean_rets = portfolio_rets.dropna()
+        if len(clean_rets) > 0:
+            ann_ret = np.exp(clean_rets.mean() * annualization_factor) - 1
+            ann_vol = clean_rets.std() * np.sqrt(annualization_factor)
+            sharpe = ann_ret / ann_vol if ann_vol != 0 else 0
+        else:
+            ann_ret, sharpe = 0, 0
+
+        grid_results.append({**params, 'Sharpe': sharpe, 'Return': ann_ret})
+        
+        # Memory Cleanup periodically
+        if i % 10 == 0:
+            gc.collect()
+
+    return grid_results
 
 class OptimizationMixin:
     def optimize_portfolio_selection(self, sharpe_threshold=0.3):
@@ -26,7 +165,7 @@ class OptimizationMixin:
         self.tickers = passed_tickers
         return passed_tickers
 
-    def run_walk_forward_optimization(self, strategy_class, param_grid, window_size_days, step_size_days, metric='Sharpe'):
+    def run_walk_forward_optimization(self, strategy_class, param_grid, window_size_days, step_size_days, metric='Sharpe', n_jobs=1):
         """
         Performs a Walk-Forward Optimization (WFO).
         """
@@ -78,7 +217,7 @@ class OptimizationMixin:
             # Run Grid Search
             try:
                 # Suppress inner logging if possible or accept it
-                grid_res = self.run_grid_search(strategy_class, param_grid)
+                grid_res = self.run_grid_search(strategy_class, param_grid, n_jobs=n_jobs)
             except Exception as e:
                 logging.error(f"Grid search failed for window: {e}")
                 self.data = full_data_backup # Restore
@@ -204,7 +343,26 @@ class OptimizationMixin:
         }
         return grid_template
 
-    def run_grid_search(self, strategy_class, param_grid):
+    def _run_combinations(self, strategy_class, combinations, n_jobs=1):
+        """
+        Evaluates parameter combinations in-process, or split into chunks of
+        _BATCH_SIZE across joblib worker processes when n_jobs != 1. Results keep
+        the order of `combinations` either way.
+
+        Workers get the price data's arrays as read-only memmaps of a single dump
+        (see _MMAP_MAX_NBYTES); strategies that mutate their input still copy it.
+        """
+        args = (self.data, self.tickers, self.position_sizer, self.annualization_factor)
+        if n_jobs == 1 or len(combinations) <= _BATCH_SIZE:
+            return _evaluate_combinations(strategy_class, combinations, *args)
+
+        chunks = [combinations[i:i + _BATCH_SIZE] for i in range(0, len(combinations), _BATCH_SIZE)]
+        chunk_results = Parallel(n_jobs=n_jobs, backend="loky", max_nbytes=_MMAP_MAX_NBYTES, mmap_mode="r")(
+            delayed(_evaluate_combinations)(strategy_class, chunk, *args) for chunk in chunks
+        )
+        return [row for rows in chunk_results for row in rows]
+
+    def run_grid_search(self, strategy_class, param_grid, n_jobs=1):
       """
       Executes a Grid Search optimization over the specified parameter grid.
       
@@ -212,6 +370,8 @@ class OptimizationMixin:
           strategy_class (StrategyTemplate): The strategy class to optimize.
           param_grid (dict): Dictionary mapping parameter names to lists of values.
                              Example: {'length': [10, 20], 'std': [1.5, 2.0]}
+          n_jobs (int): Worker processes for evaluating combinations (joblib
+                        semantics, -1 = all cores). Defaults to 1 (in-process).
       
       Returns:
           pd.DataFrame: A DataFrame containing the parameters and resulting metrics 
@@ -219,99 +379,12 @@ class OptimizationMixin:
       """
       keys, values = zip(*param_grid.items())
       combinations = [dict(zip(keys, v)) for v in itertools.product(*values)]
-      grid_results = []
 
       logging.info(f"Starting Grid Search: {len(combinations)} combinations...")
 
-      # Determine if portfolio strategy
-      is_portfolio = getattr(strategy_class, 'is_portfolio_strategy', False)
-
-      for i, params in enumerate(combinations):
-          strat = strategy_class(**params)
-          run_returns = {} # Use a dict to keep track of ticker names
-
-          if is_portfolio:
-              # Portfolio Strategy Execution
-              frames = []
-              keys_list = []
-              for ticker, df in self.data.items():
-                  if not df.empty:
-                      frames.append(df)
-                      keys_list.append(ticker)
-              
-              if not frames:
-                  continue
-
-              try:
-                  combined_df = pd.concat(frames, keys=keys_list, names=['ticker', 'timestamp'])
-                  combined_df = strat.strat_apply(combined_df)
-                  
-                  for ticker in keys_list:
-                      try:
-                          df = combined_df.xs(ticker, level='ticker', drop_level=True)
-                          df = self.position_sizer.size_position(df)
-                          df = df.dropna()
-                          df['position'] = df['position_size'].shift(1).fillna(0)
-                          df['log_return'] = np.log(df['close'] / df['close'].shift(1)).fillna(0)
-                          run_returns[ticker] = df['position'] * df['log_return']
-                      except KeyError:
-                          pass
-              except Exception as e:
-                  logging.error(f"Error processing portfolio strategy: {e}")
-                  continue
-
-          else:
-              for ticker in self.tickers:
-                  try:
-                      df = self.data[ticker].copy()
-                      df = strat.strat_apply(df)
-                      
-                      # Apply Position Sizing
-                      df = self.position_sizer.size_position(df)
-                      
-                      df = df.dropna()
-
-                      # Signal Shift & Return Calculation
-                      df['position'] = df['position_size'].shift(1).fillna(0)
-                      df['log_return'] = np.log(df['close'] / df['close'].shift(1)).fillna(0)
-                      # Store in dict with ticker as key
-                      run_returns[ticker] = df['position'] * df['log_return']
-                  except Exception as e:
-                      logging.error(f"Error processing {ticker}: {e}")
-                      continue
-
-          if not run_returns:
-              continue
-
-          # FIX: Align all tickers by Date Index before taking the mean
-          all_log_rets_df = pd.DataFrame(run_returns).fillna(0)
-          
-          # Convert to simple returns for portfolio aggregation
-          all_simple_rets_df = np.exp(all_log_rets_df) - 1
-          portfolio_simple_rets = all_simple_rets_df.mean(axis=1)
-          
-          # Convert back to log returns for metrics calculation
-          portfolio_rets = np.log1p(portfolio_simple_rets)
-
-          # Calculate Metrics (Dropping the first NaN from the shift)
-          clean_rets = portfolio_rets.dropna()
-          if len(clean_rets) > 0:
-              # Use self.annualization_factor
-              ann_ret = np.exp(clean_rets.mean() * self.annualization_factor) - 1
-              ann_vol = clean_rets.std() * np.sqrt(self.annualization_factor)
-              sharpe = ann_ret / ann_vol if ann_vol != 0 else 0
-          else:
-              ann_ret, sharpe = 0, 0
-
-          grid_results.append({**params, 'Sharpe': sharpe, 'Return': ann_ret})
-          
-          # Memory Cleanup periodically
-          if i % 10 == 0:
-              gc.collect()
-
-      return pd.DataFrame(grid_results)
-
-    def run_random_search(self, strategy_class, param_grid, n_iter=100):
+      return pd.DataFrame(self._run_combinations(strategy_class, combinations, n_jobs))
+
+    def run_random_search(self, strategy_class, param_grid, n_iter=100, n_jobs=1):
         """
         Executes a Random Search optimization, sampling a fixed number of combinations.
         
@@ -319,6 +392,7 @@ class OptimizationMixin:
             strategy_class (StrategyTemplate): The strategy class to optimize.
             param_grid (dict): Dictionary mapping parameter names to lists of values.
             n_iter (int): Number of random combinations to test. Defaults to 100.
+            n_jobs (int): Worker processes, as in run_grid_search. Defaults to 1.
             
         Returns:
             pd.DataFrame: Results DataFrame similar to run_grid_search.
@@ -334,7 +408,7 @@ class OptimizationMixin:
         # If the grid is small enough, just run exhaustive search
         if total_combinations <= n_iter:
             logging.info(f"Random Search: Requested {n_iter} iterations but only {total_combinations} possible. Running full grid search.")
-            return self.run_grid_search(strategy_class, param_grid)
+            return self.run_grid_search(strategy_class, param_grid, n_jobs=n_jobs)
 
         # Generate unique random combinations
         combinations = set()
@@ -351,94 +425,55 @@ class OptimizationMixin:
         combo_dicts = [dict(zip(keys, c)) for c in combinations]
         
         logging.info(f"Starting Random Search: {len(combo_dicts)} combinations (sampled from {total_combinations})...")
-        
-        grid_results = []
-        
-        # Determine if portfolio strategy
-        is_portfolio = getattr(strategy_class, 'is_portfolio_strategy', False)
 
-        for i, params in enumerate(combo_dicts):
-            strat = strategy_class(**params)
-            run_returns = {} # Use a dict to keep track of ticker names
+        return pd.DataFrame(self._run_combinations(strategy_class, combo_dicts, n_jobs))
 
-            if is_portfolio:
-                # Portfolio Strategy Execution
-                frames = []
-                keys_list = []
-                for ticker, df in self.data.items():
-                    if not df.empty:
-                        frames.append(df)
-                        keys_list.append(ticker)
-                
-                if not frames:
-                    continue
-
-                try:
-                    combined_df = pd.concat(frames, keys=keys_list, names=['ticker', 'timestamp'])
-                    combined_df = strat.strat_apply(combined_df)
-                    
-                    for ticker in keys_list:
-                        try:
-                            df = combined_df.xs(ticker, level='ticker', drop_level=True)
-                            df = self.position_sizer.size_position(df)
-                            df = df.dropna()
-                            df['position'] = df['position_size'].shift(1).fillna(0)
-                            df['log_return'] = np.log(df['close'] / df['close'].shift(1)).fillna(0)
-                            run_returns[ticker] = df['position'] * df['log_return']
-                        except KeyError:
-                            pass
-                except Exception as e:
-                    logging.error(f"Error processing portfolio strategy: {e}")
-                    continue
-            else:
-                for ticker in self.tickers:
-                    try:
-                        df = self.data[ticker].copy()
-                        df = strat.strat_apply(df)
-                        
-                        # Apply Position Sizing
-                        df = self.position_sizer.size_position(df)
-                        
-                        df = df.dropna()
-
-                        # Signal Shift & Return Calculation
-                        df['position'] = df['position_size'].shift(1).fillna(0)
-                        df['log_return'] = np.log(df['close'] / df['close'].shift(1)).fillna(0)
-                        # Store in dict with ticker as key
-                        run_returns[ticker] = df['position'] * df['log_return']
-                    except Exception as e:
-                        logging.error(f"Error processing {ticker}: {e}")
-                        continue
-
-            if not run_returns:
-                continue
-
-            # FIX: Align all tickers by Date Index before taking the mean
-            all_log_rets_df = pd.DataFrame(run_returns).fillna(0)
-            
-            # Convert to simple returns for portfolio aggregation
-            all_simple_rets_df = np.exp(all_log_rets_df) - 1
-            portfolio_simple_rets = all_simple_rets_df.mean(axis=1)
-            
-            # Convert back to log returns for metrics calculation
-            portfolio_rets = np.log1p(portfolio_simple_rets)
-
-            # Calculate Metrics (Dropping the first NaN from the shift)
-            clean_rets = portfolio_rets.dropna()
-            if len(clean_rets) > 0:
-                ann_ret = np.exp(clean_rets.mean() * self.annualization_factor) - 1
-                ann_vol = clean_rets.std() * np.sqrt(self.annualization_factor)
-                sharpe = ann_ret / ann_vol if ann_vol != 0 else 0
-            else:
-                ann_ret, sharpe = 0, 0
+    def run_coarse_to_fine_search(self, strategy_class, param_grid, stride=4, topk=5, refine_radius=2, metric='Sharpe', n_jobs=1):
+        """
+        Executes a two-pass search: a coarse grid of every `stride`-th value per
+        parameter, then full-resolution grids around the `topk` best coarse results.
 
-            grid_results.append({**params, 'Sharpe': sharpe, 'Return': ann_ret})
-            
-            # Memory Cleanup periodically
-            if i % 10 == 0:
-                gc.collect()
+        Args:
+            strategy_class (StrategyTemplate): The strategy class to optimize.
+            param_grid (dict): Dictionary mapping parameter names to lists of values
+                               (ordered, so neighbouring values are neighbours).
+            stride (int): Spacing of the coarse pass. Defaults to 4.
+            topk (int): Number of coarse winners to refine around. Defaults to 5.
+            refine_radius (int): Grid steps either side of a winner's value to
+                                 re-grid per parameter. Defaults to 2.
+            metric (str): Column the winners are ranked by. Defaults to 'Sharpe'.
+            n_jobs (int): Worker processes, as in run_grid_search. Defaults to 1.
 
-        return pd.DataFrame(grid_results)
+        Returns:
+            pd.DataFrame: Results of both passes (each combination once), similar
+                          to run_grid_search.
+        """
+        keys = list(param_grid.keys())
+        values = [list(v) for v in param_grid.values()]
+
+        # Phase 1: every stride-th grid point
+        coarse = [dict(zip(keys, c)) for c in itertools.product(*(v[::stride] for v in values))]
+        logging.info(f"Coarse-to-Fine Search: {len(coarse)} coarse combinations...")
+        results = self._run_combinations(strategy_class, coarse, n_jobs)
+
+        # Phase 2: local full-resolution grids around the best coarse results
+        seen = {tuple(c[k] for k in keys) for c in coarse}
+        best = sorted(results, key=lambda r: r[metric], reverse=True)[:topk]
+        fine = []
+        for row in best:
+            local = []
+            for k, v in zip(keys, values):
+                i = v.index(row[k])
+                local.append(v[max(0, i - refine_radius):i + refine_radius + 1])
+            for combo in itertools.product(*local):
+                if combo not in seen:
+                    seen.add(combo)
+                    fine.append(dict(zip(keys, combo)))
+
+        logging.info(f"Coarse-to-Fine Search: refining with {len(fine)} combinations...")
+        results += self._run_combinations(strategy_class, fine, n_jobs)
+
+        return pd.DataFrame(results)
 
     def plot_heatmap(self, grid_df, param_x, param_y, metric='Sharpe'):
         """Visualizes the grid search results to find stable plateaus."""
@@ -9,6 +9,8 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 
+from ..reporting import figure_to_div, monthly_returns_grid
+
 class ReportingMixin:
     def generate_report(self):
         """Generates a professional comparison tearsheet with Position Size."""
@@ -184,11 +186,7 @@ class ReportingMixin:
             
             # Monthly Heatmap
             ax3 = plt.subplot(2, 1, 2)
-            monthly_rets = portfolio_log_returns.resample('M').apply(lambda x: np.exp(x.sum()) - 1)
-            monthly_rets_df = pd.DataFrame(monthly_rets)
-            monthly_rets_df['Year'] = monthly_rets_df.index.year
-            monthly_rets_df['Month'] = monthly_rets_df.index.month
-            pivot_rets = monthly_rets_df.pivot(index='Year', columns='Month', values=0)
+            pivot_rets = monthly_returns_grid(portfolio_log_returns)
             
             sns.heatmap(pivot_rets, annot=True, fmt=".1%", cmap="RdYlGn", center=0, ax=ax3, cbar=False)
             ax3.set_title("Monthly Returns")
@@ -269,9 +267,15 @@ class ReportingMixin:
             return
             
         all_returns = pd.DataFrame(strat_rets_dict).fillna(0)
-        # Equal weight portfolio
-        portfolio_log_returns = np.log1p((np.exp(all_returns) - 1).mean(axis=1))
-        portfolio_cum = np.exp(portfolio_log_returns.cumsum())
+        # Equal weight portfolio: average simple returns on the raw ndarray, then back to log space
+        simple_rets = np.expm1(all_returns.to_numpy(dtype=np.float64, copy=False))
+        portfolio_log_returns = pd.Series(np.log1p(simple_rets.mean(axis=1)), index=all_returns.index)
+
+        # Equity curve and drawdown from one ndarray pass; wrapped as Series only for plotting
+        cum_arr = np.exp(np.cumsum(portfolio_log_returns.to_numpy()))
+        dd_arr = cum_arr / np.maximum.accumulate(cum_arr) - 1
+        portfolio_cum = pd.Series(cum_arr, index=portfolio_log_returns.index)
+        dd = pd.Series(dd_arr, index=portfolio_log_returns.index)
         
         # Benchmark
         bench_cum = None
@@ -296,20 +300,13 @@ class ReportingMixin:
                                      line=dict(color='gray', dash='dash')), row=1, col=1)
 
         # Drawdown
-        peak = portfolio_cum.cummax()
-        dd = (portfolio_cum - peak) / peak
         fig.add_trace(go.Scatter(x=dd.index, y=dd, name="Drawdown", 
                                  fill='tozeroy', line=dict(color='#EF553B')), row=2, col=1)
 
         fig.update_layout(template="plotly_white", height=600, title_text=f"Backtest Report: {self.strat_name}")
         
         # 2. Monthly Returns Heatmap
-        monthly_rets = portfolio_log_returns.resample('M').apply(lambda x: np.exp(x.sum()) - 1)
-        monthly_rets_df = pd.DataFrame(monthly_rets)
-        monthly_rets_df['Year'] = monthly_rets_df.index.year
-        monthly_rets_df['Month'] = monthly_rets_df.index.month
-        
-        pivot_rets = monthly_rets_df.pivot(index='Year', columns='Month', values=0)
+        pivot_rets = monthly_returns_grid(portfolio_log_returns)
         # Rename columns to month names
         import calendar
         pivot_rets.columns = [calendar.month_abbr[i] for i in pivot_rets.columns]
@@ -373,11 +370,11 @@ class ReportingMixin:
                 </div>
 
                 <div class="plot-container">
-                    {fig.to_html(full_html=False, include_plotlyjs=False)}
+                    {figure_to_div(fig, 'equity-drawdown')}
                 </div>
                 
                 <div class="plot-container">
-                    {fig_heatmap.to_html(full_html=False, include_plotlyjs=False)}
+                    {figure_to_div(fig_heatmap, 'monthly-returns')}
                 </div>
             </div>
         </body>
@@ -8,6 +8,39 @@ from matplotlib.backends.backend_pdf import PdfPages
 import seaborn as sns
 import os
 
+def figure_to_div(fig, div_id):
+    """
+    Renders a Plotly figure as an empty div plus a single Plotly.newPlot call on the figure JSON.
+    
+    Lighter than fig.to_html(): no per-figure bootstrap script, and plotly.js itself
+    is loaded once by the page <head>.
+    """
+    # Escape '</' so titles/labels can never terminate the inline <script> early
+    fig_json = fig.to_json(validate=False).replace("</", "<\\/")
+    return (
+        f'<div id="{div_id}"></div>\n'
+        f'<script>(function() {{ var fig = {fig_json}; '
+        f'Plotly.newPlot("{div_id}", fig.data, fig.layout, {{"responsive": true}}); }})();</script>'
+    )
+
+def monthly_returns_grid(log_returns):
+    """
+    Year x Month grid (columns 1-12) of compounded monthly returns from a log-return series.
+    
+    Log returns are summed per (Year, Month) with a groupby, then unstacked. Months inside
+    the sample with no bars count as 0%, as a month-end resample would; months outside it
+    are NaN.
+    """
+    idx = log_returns.index
+    monthly = log_returns.groupby([idx.year.rename('Year'), idx.month.rename('Month')]).sum()
+    if not monthly.empty:
+        span = pd.period_range(idx.min(), idx.max(), freq='M')
+        monthly = monthly.reindex(
+            pd.MultiIndex.from_arrays([span.year, span.month], names=['Year', 'Month']), fill_value=0.0
+        )
+    grid = monthly.unstack('Month').reindex(columns=pd.RangeIndex(1, 13, name='Month'))
+    return np.expm1(grid)
+
 def generate_pdf_report(engine, filename=None):
     """
     Generates a PDF tearsheet using Matplotlib.
@@ -81,11 +114,7 @@ def generate_pdf_report(engine, filename=None):
         
         # Monthly Heatmap
         ax3 = plt.subplot(2, 1, 2)
-        monthly_rets = portfolio_log_returns.resample('M').apply(lambda x: np.exp(x.sum()) - 1)
-        monthly_rets_df = pd.DataFrame(monthly_rets)
-        monthly_rets_df['Year'] = monthly_rets_df.index.year
-        monthly_rets_df['Month'] = monthly_rets_df.index.month
-        pivot_rets = monthly_rets_df.pivot(index='Year', columns='Month', values=0)
+        pivot_rets = monthly_returns_grid(portfolio_log_returns)
         
         sns.heatmap(pivot_rets, annot=True, fmt=".1%", cmap="RdYlGn", center=0, ax=ax3, cbar=False)
         ax3.set_title("Monthly Returns")
@@ -116,9 +145,17 @@ def generate_html_report(engine, filename=None):
         return
         
     all_returns = pd.DataFrame(strat_rets_dict).fillna(0)
-    # Equal weight portfolio
-    portfolio_log_returns = np.log1p((np.exp(all_returns) - 1).mean(axis=1))
-    portfolio_cum = np.exp(portfolio_log_returns.cumsum())
+    # Equal weight portfolio: average simple returns on the raw ndarray, then back to log space
+    simple_rets = np.expm1(all_returns.to_numpy(dtype=np.float64, copy=False))
+    portfolio_log_returns = pd.Series(np.log1p(simple_rets.mean(axis=1)), index=all_returns.index)
+
+    # Equity curve and drawdown from one ndarray pass; wrapped as Series only for plotting
+    cum_arr = np.exp(np.cumsum(portfolio_log_returns.to_numpy()))
+    dd_arr = cum_arr / np.maximum.accumulate(cum_arr) - 1
+    portfolio_cum = pd.Series(cum_arr, index=portfolio_log_returns.index)
+    dd = pd.Series(dd_arr, index=portfolio_log_returns.index)
+    ann_ret = np.exp(portfolio_log_returns.to_numpy().mean() * 252) - 1
+    ann_vol = portfolio_log_returns.to_numpy().std(ddof=1) * np.sqrt(252)
     
     # Benchmark
     bench_cum = None
@@ -143,20 +180,13 @@ def generate_html_report(engine, filename=None):
                                  line=dict(color='gray', dash='dash')), row=1, col=1)
 
     # Drawdown
-    peak = portfolio_cum.cummax()
-    dd = (portfolio_cum - peak) / peak
     fig.add_trace(go.Scatter(x=dd.index, y=dd, name="Drawdown", 
                              fill='tozeroy', line=dict(color='#EF553B')), row=2, col=1)
 
     fig.update_layout(template="plotly_white", height=600, title_text=f"Backtest Report: {engine.strat_name}")
     
     # 2. Monthly Returns Heatmap
-    monthly_rets = portfolio_log_returns.resample('M').apply(lambda x: np.exp(x.sum()) - 1)
-    monthly_rets_df = pd.DataFrame(monthly_rets)
-    monthly_rets_df['Year'] = monthly_rets_df.index.year
-    monthly_rets_df['Month'] = monthly_rets_df.index.month
-    
-    pivot_rets = monthly_rets_df.pivot(index='Year', columns='Month', values=0)
+    pivot_rets = monthly_returns_grid(portfolio_log_returns)
     # Rename columns to month names
     import calendar
     pivot_rets.columns = [calendar.month_abbr[i] for i in pivot_rets.columns]
@@ -199,29 +229,29 @@ def generate_html_report(engine, filename=None):
                     <div class="metric-label">Total Return</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{np.exp(portfolio_log_returns.mean()*252)-1:.2%}</div>
+                    <div class="metric-value">{ann_ret:.2%}</div>
                     <div class="metric-label">Ann. Return</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{portfolio_log_returns.std()*np.sqrt(252):.2f}</div>
+                    <div class="metric-value">{ann_vol:.2f}</div>
                     <div class="metric-label">Ann. Volatility</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{(np.exp(portfolio_log_returns.mean()*252)-1) / (portfolio_log_returns.std()*np.sqrt(252) + 1e-9):.2f}</div>
+                    <div class="metric-value">{ann_ret / (ann_vol + 1e-9):.2f}</div>
                     <div class="metric-label">Sharpe Ratio</div>
                 </div>
                  <div class="metric-card">
-                    <div class="metric-value">{dd.min():.2%}</div>
+                    <div class="metric-value">{dd_arr.min():.2%}</div>
                     <div class="metric-label">Max Drawdown</div>
                 </div>
             </div>
 
             <div class="plot-container">
-                {fig.to_html(full_html=False, include_plotlyjs=False)}
+                {figure_to_div(fig, 'equity-drawdown')}
             </div>
             
             <div class="plot-container">
-                {fig_heatmap.to_html(full_html=False, include_plotlyjs=False)}
+                {figure_to_div(fig_heatmap, 'monthly-returns')}
             </div>
         </div>
     </body>
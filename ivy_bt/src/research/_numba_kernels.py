@@ -0,0 +1,172 @@
+"""Numba kernels for the pair scanner's per-pair statistics."""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def adf_fixed_lag_nb(series, lag, const):
+    """
+    Dickey-Fuller t-statistic with a fixed number of lagged differences.
+
+    Regresses ``dy_t`` on ``y_{t-1}``, ``lag`` lagged differences and an
+    optional constant, matching the design ``adfuller(..., maxlag=lag,
+    autolag=None)`` builds. Returns NaN when there are too few observations
+    or the normal equations are singular.
+    """
+    n = series.shape[0]
+    nobs = n - 1 - lag
+    k = 1 + lag + (1 if const else 0)
+    if lag < 0 or nobs <= k + 1:
+        return np.nan
+
+    dy = np.empty(n - 1)
+    for t in range(n - 1):
+        dy[t] = series[t + 1] - series[t]
+
+    xtx = np.zeros((k, k))
+    xty = np.zeros(k)
+    row = np.empty(k)
+    for t in range(nobs):
+        pos = t + lag
+        row[0] = series[pos]
+        for j in range(lag):
+            row[1 + j] = dy[pos - 1 - j]
+        if const:
+            row[k - 1] = 1.0
+        target = dy[pos]
+        for a in range(k):
+            xty[a] += row[a] * target
+            for b in range(a, k):
+                xtx[a, b] += row[a] * row[b]
+    for a in range(k):
+        for b in range(a):
+            xtx[a, b] = xtx[b, a]
+
+    if np.abs(np.linalg.det(xtx)) < 1e-300:
+        return np.nan
+    inv = np.linalg.inv(xtx)
+    coef = inv @ xty
+
+    ssr = 0.0
+    for t in range(nobs):
+        pos = t + lag
+        fitted = coef[0] * series[pos]
+        for j in range(lag):
+            fitted += coef[1 + j] * dy[pos - 1 - j]
+        if const:
+            fitted += coef[k - 1]
+        resid = dy[pos] - fitted
+        ssr += resid * resid
+
+    s2 = ssr / (nobs - k)
+    if s2 <= 0.0:
+        return -np.inf
+    return coef[0] / np.sqrt(s2 * inv[0, 0])
+
+
+@njit(cache=True)
+def _window_corr_nb(x, y, x_start, y_start, m):
+    """Pearson correlation of x[x_start:x_start+m] with y[y_start:y_start+m] (two-pass)."""
+    mx = 0.0
+    my = 0.0
+    for t in range(m):
+        mx += x[x_start + t]
+        my += y[y_start + t]
+    mx /= m
+    my /= m
+    sxx = 0.0
+    syy = 0.0
+    sxy = 0.0
+    for t in range(m):
+        dx = x[x_start + t] - mx
+        dy = y[y_start + t] - my
+        sxx += dx * dx
+        syy += dy * dy
+        sxy += dx * dy
+    denom = np.sqrt(sxx * syy)
+    if denom == 0.0:
+        return np.nan
+    return sxy / denom
+
+
+@njit(cache=True)
+def best_lag_corr_nb(x, y, max_lag):
+    """
+    Lag in ``[-max_lag, max_lag]`` maximising ``|corr(x[t], y[t + lag])|``.
+
+    Inputs must be aligned and NaN-free. Lags leaving fewer than 30 overlapping
+    observations are skipped; ties keep the earliest (most negative) lag.
+    Returns ``(best_lag, best_corr)`` with ``best_corr`` NaN if no lag qualifies.
+    """
+    n = x.shape[0]
+    best_lag = 0
+    best_corr = np.nan
+    for lag in range(-max_lag, max_lag + 1):
+        m = n - abs(lag)
+        if m < 30:
+            continue
+        if lag >= 0:
+            c = _window_corr_nb(x, y, 0, lag, m)
+        else:
+            c = _window_corr_nb(x, y, -lag, 0, m)
+        if np.isnan(c):
+            continue
+        if np.isnan(best_corr) or abs(c) > abs(best_corr):
+            best_corr = c
+            best_lag = lag
+    return best_lag, best_corr
+
+
+@njit(cache=True)
+def half_life_nb(spread):
+    """
+    Ornstein-Uhlenbeck half-life from the OLS slope of d(spread) on lagged spread.
+
+    NaNs are dropped first. Returns NaN for fewer than 30 observations or a
+    constant spread, and inf when the slope is non-negative (no mean reversion).
+    """
+    n = spread.shape[0]
+    clean = np.empty(n)
+    k = 0
+    for t in range(n):
+        if not np.isnan(spread[t]):
+            clean[k] = spread[t]
+            k += 1
+    if k < 30:
+        return np.nan
+
+    m = k - 1
+    mean_lag = 0.0
+    mean_delta = 0.0
+    for t in range(m):
+        mean_lag += clean[t]
+        mean_delta += clean[t + 1] - clean[t]
+    mean_lag /= m
+    mean_delta /= m
+
+    sxx = 0.0
+    sxy = 0.0
+    for t in range(m):
+        d_lag = clean[t] - mean_lag
+        sxx += d_lag * d_lag
+        sxy += d_lag * (clean[t + 1] - clean[t] - mean_delta)
+    if sxx == 0.0:
+        return np.nan
+    beta = sxy / sxx
+    if beta >= 0.0:
+        return np.inf
+    return -np.log(2.0) / beta
+
+
+def warm_kernels():
+    """
+    Compiles (or loads from the on-disk cache) the pair-scanner kernels, so the
+    first scanned pair does not pay the JIT cost inside a worker. Not run at
+    import; the Docker build calls it to fill NUMBA_CACHE_DIR.
+    """
+    warm = np.linspace(0.0, 1.0, 40) + np.sin(np.arange(40.0))
+    adf_fixed_lag_nb(warm, 1, True)
+    best_lag_corr_nb(warm, warm[::-1].copy(), 2)
+    best_lag_corr_nb(warm.astype(np.float32), warm[::-1].astype(np.float32), 2)
+    half_life_nb(warm)
@@ -43,20 +43,13 @@ def run_analysis():
     # Engine stores data in self.data (dict of DFs). We need to concat.
     df_dict = engine.data
     
-    # Add ticker column to each DF and concat
-    dfs = []
-    for ticker, df in df_dict.items():
-        df_copy = df.copy()
-        # Ensure index is named timestamp so reset_index() works predictably
-        df_copy.index.name = 'timestamp'
-        df_copy['ticker'] = ticker
-        dfs.append(df_copy)
-    
-    if not dfs:
+    if not df_dict:
         print("No data fetched.")
         return
 
-    combined_df = pd.concat(dfs).reset_index().set_index(['ticker', 'timestamp']).sort_index()
+    # Concat with the dict keys as the outer index level; the MultiIndex stores tickers
+    # as level codes, so there is no per-row ticker column or reset/set_index round trip.
+    combined_df = pd.concat(df_dict, names=['ticker', 'timestamp']).sort_index()
     
     # Apply strategy
     results_df = strategy.strat_apply(combined_df)
@@ -72,17 +65,15 @@ def run_analysis():
     # results_df is (Ticker, Timestamp). Alphalens expects (Timestamp, Ticker) or (Date, Asset)
     
     # Our results_df index is (ticker, timestamp). We swap levels.
-    factor_data = results_df['z_score'].swaplevel() # Now (timestamp, ticker)
+    # Filter out NaNs in Factor Data (Alphalens doesn't like them)
+    # The strategy produces NaNs for assets NOT in the cluster.
+    factor_data = results_df['z_score'].swaplevel().dropna() # Now (timestamp, ticker)
     factor_data.index.names = ['date', 'asset']
     
-    # Extract Pricing (Wide Format)
-    prices = results_df.reset_index().pivot(index='timestamp', columns='ticker', values='close')
+    # Extract Pricing (Wide Format) straight from the MultiIndex
+    prices = results_df['close'].unstack(level='ticker')
     prices.index.name = 'date'
     
-    # Filter out NaNs in Factor Data (Alphalens doesn't like them)
-    # The strategy produces NaNs for assets NOT in the cluster.
-    factor_data = factor_data.dropna()
-    
     if factor_data.empty:
         print("No factor data generated (no cluster found?). Exiting.")
         return
@@ -4,16 +4,20 @@ import logging
 import os
 from dataclasses import dataclass
 from datetime import datetime
-from itertools import combinations
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from statsmodels.tsa.stattools import adfuller, coint
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from joblib import Parallel, delayed
+from statsmodels.tsa.adfvalues import mackinnonp
 
 from src.config import load_config
 from src.data_manager import DataManager
 from src.instruments import get_assets
+from src.research._numba_kernels import adf_fixed_lag_nb, best_lag_corr_nb, half_life_nb
 
 
 @dataclass
@@ -21,7 +25,9 @@ class PairScannerConfig:
     bars: int = 1000
     timeframes: Tuple[str, ...] = ("1d", "1h", "5m")
     max_lag: int = 20
+    adf_lag: int = 1
     corr_prefilter: float = 0.5
+    prefilter_stride: int = 1
     corr_min: float = 0.7
     coint_pmax: float = 0.05
     adf_pmax: float = 0.05
@@ -29,80 +35,116 @@ class PairScannerConfig:
     require_adf: bool = True
     include_groups: Tuple[str, ...] = ("forex", "crypto", "etf", "spy")
     output_root: str = "outputs/pair_scans"
-
-
-def _safe_adf(series: pd.Series) -> Dict[str, Optional[float]]:
-    series = series.dropna()
+    n_jobs: int = -1
+
+
+# Downsampled-screen threshold as a fraction of corr_prefilter; the slack keeps pairs
+# whose full-series correlation clears the prefilter from being screened out.
+_PREFILTER_SLACK = 0.9
+
+# Output schema of the pair table: (column, dtype), in the order _pair_row emits values.
+_PAIR_COLUMNS: Tuple[Tuple[str, object], ...] = (
+    ("ticker_x", object),
+    ("ticker_y", object),
+    ("corr_lag0", np.float64),
+    ("best_lag", np.int64),
+    ("best_lag_corr", np.float64),
+    ("lead_ticker", object),
+    ("follow_ticker", object),
+    ("coint_stat", np.float64),
+    ("coint_pvalue", np.float64),
+    ("hedge_alpha", np.float64),
+    ("hedge_beta", np.float64),
+    ("spread_adf_stat", np.float64),
+    ("spread_adf_pvalue", np.float64),
+    ("spread_adf_lag", np.float64),
+    ("spread_half_life", np.float64),
+    ("passed_filters", bool),
+)
+
+
+def _safe_adf(series, lag: int = 1) -> Dict[str, Optional[float]]:
+    """ADF test (constant, fixed lag) with MacKinnon approximate p-value."""
+    series = np.asarray(series, dtype=np.float64)
+    series = series[~np.isnan(series)]
     if len(series) < 30:
         return {"adf_stat": np.nan, "adf_pvalue": np.nan, "adf_lag": np.nan}
     try:
-        stat, pvalue, used_lag, _, _, _ = adfuller(series.values, autolag="AIC")
-        return {"adf_stat": float(stat), "adf_pvalue": float(pvalue), "adf_lag": int(used_lag)}
+        stat = adf_fixed_lag_nb(series, lag, True)
+        if np.isnan(stat):
+            return {"adf_stat": np.nan, "adf_pvalue": np.nan, "adf_lag": np.nan}
+        pvalue = mackinnonp(stat, regression="c", N=1)
+        return {"adf_stat": float(stat), "adf_pvalue": float(pvalue), "adf_lag": int(lag)}
     except Exception:
         return {"adf_stat": np.nan, "adf_pvalue": np.nan, "adf_lag": np.nan}
 
 
-def _ols_alpha_beta(x: pd.Series, y: pd.Series) -> Tuple[float, float]:
-    x = x.values
-    y = y.values
-    X = np.column_stack([np.ones(len(x)), x])
-    coeffs, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
-    return float(coeffs[0]), float(coeffs[1])
-
-
-def _half_life(spread: pd.Series) -> float:
-    spread = spread.dropna()
-    if len(spread) < 30:
-        return np.nan
-
-    lagged = spread.shift(1).dropna()
-    delta = spread.diff().dropna()
-    aligned = pd.concat([lagged, delta], axis=1).dropna()
-    if aligned.empty:
-        return np.nan
-
-    x = aligned.iloc[:, 0].values
-    y = aligned.iloc[:, 1].values
-    X = np.column_stack([np.ones(len(x)), x])
-    coeffs, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
-    beta = coeffs[1]
-    if beta >= 0:
-        return np.inf
-    return float(-np.log(2) / beta)
-
-
-def _lagged_corr(x: pd.Series, y: pd.Series, lag: int) -> float:
-    if lag == 0:
-        x_vals = x.values
-        y_vals = y.values
-    elif lag > 0:
-        x_vals = x.iloc[:-lag].values
-        y_vals = y.iloc[lag:].values
-    else:
-        lag = abs(lag)
-        x_vals = x.iloc[lag:].values
-        y_vals = y.iloc[:-lag].values
-
-    if len(x_vals) < 30 or len(y_vals) < 30 or len(x_vals) != len(y_vals):
-        return np.nan
-
-    mask = np.isfinite(x_vals) & np.isfinite(y_vals)
-    if mask.sum() < 30:
-        return np.nan
-
-    return float(np.corrcoef(x_vals[mask], y_vals[mask])[0, 1])
+def _engle_granger(spread: np.ndarray, lag: int) -> Tuple[float, float]:
+    """
+    Engle-Granger cointegration test on an already-fitted OLS residual.
 
-
-def _best_lag_corr(x: pd.Series, y: pd.Series, max_lag: int) -> Tuple[int, float, str, str]:
-    best_lag = 0
-    best_corr = np.nan
-    for lag in range(-max_lag, max_lag + 1):
-        c = _lagged_corr(x, y, lag)
-        if pd.isna(c):
-            continue
-        if pd.isna(best_corr) or abs(c) > abs(best_corr):
-            best_corr = c
-            best_lag = lag
+    Equivalent to ``statsmodels.tsa.stattools.coint`` with a fixed ADF lag:
+    no-constant ADF on the residual, p-value from MacKinnon with N=2.
+    """
+    try:
+        stat = adf_fixed_lag_nb(spread, lag, False)
+    except Exception:
+        return np.nan, np.nan
+    if np.isnan(stat):
+        return np.nan, np.nan
+    return float(stat), float(mackinnonp(stat, regression="c", N=2))
+
+
+def _pairwise_hedge_ratios(log_px: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    OLS hedge ratios for every column pair from a handful of Gram-matrix products.
+
+    ``alpha[i, j]`` / ``beta[i, j]`` regress column ``i`` on column ``j`` (with intercept)
+    over the rows where both are observed, i.e. ``col_i ~ alpha + beta * col_j``.
+    Columns are centered first so the normal equations do not lose precision to
+    the large common level of log prices.
+    """
+    valid = ~np.isnan(log_px)
+    mu = np.nanmean(log_px, axis=0)
+    z = np.where(valid, log_px - mu, 0.0)
+    m = valid.astype(np.float64)
+
+    n = m.T @ m
+    sum_x = z.T @ m
+    sum_y = m.T @ z
+    sum_yy = m.T @ (z * z)
+    sum_xy = z.T @ z
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = n * sum_yy - sum_y * sum_y
+        beta = np.where(denom > 0, (n * sum_xy - sum_x * sum_y) / denom, np.nan)
+        alpha = (sum_x - beta * sum_y) / n + mu[:, None] - beta * mu[None, :]
+    return alpha, beta
+
+
+def _half_life(spread) -> float:
+    """Ornstein-Uhlenbeck half-life from the closed-form OLS slope of d(spread) on lagged spread."""
+    return float(half_life_nb(np.asarray(spread, dtype=np.float64)))
+
+
+def _align_dropna(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Drops rows where either series is non-finite; a no-op (no copy) for clean input."""
+    mask = np.isfinite(x) & np.isfinite(y)
+    if mask.all():
+        return x, y
+    return x[mask], y[mask]
+
+
+def _best_lag_corr(x, y, max_lag: int) -> Tuple[int, float, str, str]:
+    # One finiteness pass up front; the compiled kernel then scans every lag on plain
+    # offsets. Non-finite rows are dropped jointly, so gaps are closed rather than
+    # shifted across (the scanner's forward-filled slices have none).
+    # float32 returns stay float32 (the kernel accumulates in float64); anything else is
+    # promoted to float64.
+    dtype = np.result_type(np.asarray(x).dtype, np.asarray(y).dtype, np.float32)
+    x, y = _align_dropna(np.asarray(x, dtype=dtype), np.asarray(y, dtype=dtype))
+    best_lag, best_corr = best_lag_corr_nb(x, y, int(max_lag))
+    best_lag = int(best_lag)
 
     if best_lag > 0:
         lead, follow = "x", "y"
@@ -148,38 +190,46 @@ def _create_close_matrix(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
 
 
 def _pair_row(
-    x_ticker: str,
-    y_ticker: str,
-    close_df: pd.DataFrame,
-    ret_df: pd.DataFrame,
+    x_idx: int,
+    y_idx: int,
+    symbols: List[str],
+    log_px: np.ndarray,
+    ret_arr: np.ndarray,
+    start: int,
+    alpha: float,
+    beta: float,
+    corr0: float,
     max_lag: int,
+    corr_min: float,
     coint_pmax: float,
     adf_pmax: float,
     require_adf: bool,
-) -> Optional[Dict[str, object]]:
-    x_px = np.log(close_df[x_ticker].dropna())
-    y_px = np.log(close_df[y_ticker].dropna())
-    px = pd.concat([x_px, y_px], axis=1).dropna()
-    if len(px) < 80:
+    adf_lag: int = 1,
+) -> Optional[Tuple[object, ...]]:
+    x_ticker = symbols[x_idx]
+    y_ticker = symbols[y_idx]
+
+    # Both series are observed from row ``start`` onward; these are views, not copies.
+    x_px = log_px[start:, x_idx]
+    y_px = log_px[start:, y_idx]
+    if len(x_px) < 80:
         return None
 
-    x_r = ret_df[x_ticker].dropna()
-    y_r = ret_df[y_ticker].dropna()
-    rets = pd.concat([x_r, y_r], axis=1).dropna()
-    if len(rets) < 80:
+    x_r = ret_arr[start:, x_idx]
+    y_r = ret_arr[start:, y_idx]
+    if len(x_r) < 80:
         return None
 
-    corr0 = float(rets.iloc[:, 0].corr(rets.iloc[:, 1]))
-    best_lag, lag_corr, lead_side, follow_side = _best_lag_corr(rets.iloc[:, 0], rets.iloc[:, 1], max_lag)
-
-    try:
-        c_stat, c_pvalue, _ = coint(px.iloc[:, 0].values, px.iloc[:, 1].values)
-    except Exception:
-        c_stat, c_pvalue = np.nan, np.nan
+    best_lag, lag_corr, lead_side, follow_side = _best_lag_corr(x_r, y_r, max_lag)
+    # The shortlist requires |best_lag_corr| >= corr_min, so a pair that fails it can
+    # never be kept; skip the cointegration/ADF/half-life work entirely.
+    if pd.isna(lag_corr) or abs(lag_corr) < corr_min:
+        return None
 
-    alpha, beta = _ols_alpha_beta(px.iloc[:, 1], px.iloc[:, 0])
-    spread = px.iloc[:, 0] - (alpha + beta * px.iloc[:, 1])
-    spread_adf = _safe_adf(spread)
+    # The hedge regression residual is both the Engle-Granger residual and the spread.
+    spread = x_px - (alpha + beta * y_px)
+    c_stat, c_pvalue = _engle_granger(spread, adf_lag)
+    spread_adf = _safe_adf(spread, lag=adf_lag)
     spread_half_life = _half_life(spread)
 
     keep = (
@@ -191,24 +241,98 @@ def _pair_row(
     lead_ticker = x_ticker if lead_side == "x" else (y_ticker if lead_side == "y" else "none")
     follow_ticker = y_ticker if follow_side == "y" else (x_ticker if follow_side == "x" else "none")
 
-    return {
-        "ticker_x": x_ticker,
-        "ticker_y": y_ticker,
-        "corr_lag0": corr0,
-        "best_lag": best_lag,
-        "best_lag_corr": lag_corr,
-        "lead_ticker": lead_ticker,
-        "follow_ticker": follow_ticker,
-        "coint_stat": float(c_stat) if not pd.isna(c_stat) else np.nan,
-        "coint_pvalue": float(c_pvalue) if not pd.isna(c_pvalue) else np.nan,
-        "hedge_alpha": alpha,
-        "hedge_beta": beta,
-        "spread_adf_stat": spread_adf["adf_stat"],
-        "spread_adf_pvalue": spread_adf["adf_pvalue"],
-        "spread_adf_lag": spread_adf["adf_lag"],
-        "spread_half_life": spread_half_life,
-        "passed_filters": bool(keep),
-    }
+    # Positional, in _PAIR_COLUMNS order; _scan_pairs assembles the typed columns.
+    return (
+        x_ticker,
+        y_ticker,
+        corr0,
+        best_lag,
+        lag_corr,
+        lead_ticker,
+        follow_ticker,
+        c_stat,
+        c_pvalue,
+        alpha,
+        beta,
+        spread_adf["adf_stat"],
+        spread_adf["adf_pvalue"],
+        spread_adf["adf_lag"],
+        spread_half_life,
+        bool(keep),
+    )
+
+
+def _scan_pairs(symbols: List[str], log_px: np.ndarray, config: PairScannerConfig) -> pd.DataFrame:
+    """
+    Prefilter pairs on lag-0 return correlation, then score the candidates in parallel.
+
+    ``log_px`` is the log of the forward-filled close matrix, so each column's missing
+    values are a leading block; a pair is observed from the later of the two first-valid
+    rows onward. Log prices and returns are computed once here and sliced per pair.
+    Workers receive plain ndarrays plus integer column indices (not DataFrames), and
+    results come back in candidate order so the output is deterministic. The table is
+    assembled column-wise from _PAIR_COLUMNS with explicit dtypes, not from row dicts.
+
+    Returns are differenced in float64 and then held as float32: they only feed the
+    correlation screens and the lag search, whose thresholds are far coarser than
+    float32 resolution. Log prices stay float64 for the hedge regression and ADF tests.
+    """
+    ret_arr = np.diff(log_px, axis=0).astype(np.float32)
+    first_valid = np.argmax(~np.isnan(log_px), axis=0)
+
+    # Optional cheap screen (prefilter_stride > 1): one pairwise-complete correlation
+    # matrix on every k-th return row, and only pairs within a slack of the prefilter
+    # there get the full-series correlation. It is approximate, so it is off by default.
+    stride = max(int(config.prefilter_stride), 1)
+    if stride > 1:
+        corr_ds = pd.DataFrame(ret_arr[::stride]).corr().to_numpy()
+        screen = np.abs(np.nan_to_num(corr_ds, nan=1.0)) >= _PREFILTER_SLACK * config.corr_prefilter
+    else:
+        screen = np.ones((len(symbols), len(symbols)), dtype=bool)
+
+    candidate_pairs = []
+    for x_idx, y_idx in zip(*np.nonzero(np.triu(screen, k=1))):
+        start = int(max(first_valid[x_idx], first_valid[y_idx]))
+        x_r = ret_arr[start:, x_idx]
+        y_r = ret_arr[start:, y_idx]
+        if len(x_r) < 2:
+            continue
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr0 = np.corrcoef(x_r, y_r)[0, 1]
+        if pd.isna(corr0) or abs(corr0) < config.corr_prefilter:
+            continue
+        candidate_pairs.append((int(x_idx), int(y_idx), start, float(corr0)))
+
+    if not candidate_pairs:
+        return pd.DataFrame()
+
+    alpha, beta = _pairwise_hedge_ratios(log_px)
+    rows = Parallel(n_jobs=config.n_jobs, backend="loky", batch_size="auto")(
+        delayed(_pair_row)(
+            x_idx,
+            y_idx,
+            symbols,
+            log_px,
+            ret_arr,
+            start=start,
+            alpha=float(alpha[x_idx, y_idx]),
+            beta=float(beta[x_idx, y_idx]),
+            corr0=corr0,
+            max_lag=config.max_lag,
+            corr_min=config.corr_min,
+            coint_pmax=config.coint_pmax,
+            adf_pmax=config.adf_pmax,
+            require_adf=config.require_adf,
+            adf_lag=config.adf_lag,
+        )
+        for x_idx, y_idx, start, corr0 in candidate_pairs
+    )
+    rows = [row for row in rows if row is not None]
+    if not rows:
+        return pd.DataFrame()
+
+    columns = zip(*rows)
+    return pd.DataFrame({name: np.asarray(values, dtype=dtype) for (name, dtype), values in zip(_PAIR_COLUMNS, columns)})
 
 
 def run_pair_scan(config: PairScannerConfig, config_path: str = "quanticon\ivy_bt\config.yaml") -> Dict[str, object]:
@@ -230,12 +354,14 @@ def run_pair_scan(config: PairScannerConfig, config_path: str = "quanticon\ivy_b
         "include_groups": list(config.include_groups),
         "thresholds": {
             "corr_prefilter": config.corr_prefilter,
+            "prefilter_stride": config.prefilter_stride,
             "corr_min": config.corr_min,
             "coint_pmax": config.coint_pmax,
             "adf_pmax": config.adf_pmax,
             "min_coverage": config.min_coverage,
             "require_adf": config.require_adf,
             "max_lag": config.max_lag,
+            "adf_lag": config.adf_lag,
         },
         "timeframe_stats": {},
         "output_dir": run_dir,
@@ -284,30 +410,10 @@ def run_pair_scan(config: PairScannerConfig, config_path: str = "quanticon\ivy_b
             summary["timeframe_stats"][tf] = {"kept_symbols": int(close_kept.shape[1]), "pairs_tested": 0, "pairs_kept": 0}
             continue
 
-        ret_df = np.log(close_kept).diff().dropna(how="all")
-
-        rows = []
-        symbols = list(close_kept.columns)
-        for x_ticker, y_ticker in combinations(symbols, 2):
-            corr0 = ret_df[x_ticker].corr(ret_df[y_ticker])
-            if pd.isna(corr0) or abs(corr0) < config.corr_prefilter:
-                continue
-
-            row = _pair_row(
-                x_ticker=x_ticker,
-                y_ticker=y_ticker,
-                close_df=close_kept,
-                ret_df=ret_df,
-                max_lag=config.max_lag,
-                coint_pmax=config.coint_pmax,
-                adf_pmax=config.adf_pmax,
-                require_adf=config.require_adf,
-            )
-            if row is not None:
-                rows.append(row)
+        log_px = np.log(close_kept.to_numpy(dtype=np.float64))
+        pairs_df = _scan_pairs(list(close_kept.columns), log_px, config)
 
-        if rows:
-            pairs_df = pd.DataFrame(rows)
+        if not pairs_df.empty:
             pairs_df["score"] = (
                 pairs_df["best_lag_corr"].abs().fillna(0)
                 * (1 - pairs_df["coint_pvalue"].clip(lower=0, upper=1).fillna(1))
@@ -320,7 +426,6 @@ def run_pair_scan(config: PairScannerConfig, config_path: str = "quanticon\ivy_b
                 & adf_gate
             ].sort_values(["score", "best_lag_corr"], ascending=False)
         else:
-            pairs_df = pd.DataFrame()
             shortlist_df = pd.DataFrame()
 
         full_parquet = os.path.join(run_dir, f"pairs_full_{tf}.parquet")
@@ -328,12 +433,14 @@ def run_pair_scan(config: PairScannerConfig, config_path: str = "quanticon\ivy_b
         top_csv = os.path.join(run_dir, f"pairs_top_{tf}.csv")
 
         if not pairs_df.empty:
+            # Convert to Arrow once and feed the same table to the parquet and CSV writers.
+            full_table = pa.Table.from_pandas(pairs_df, preserve_index=False)
             try:
-                pairs_df.to_parquet(full_parquet, index=False)
+                pq.write_table(full_table, full_parquet)
             except Exception:
                 logging.warning("[%s] Failed parquet write, saving CSV only.", tf)
-            pairs_df.to_csv(full_csv, index=False)
-            shortlist_df.to_csv(top_csv, index=False)
+            pa_csv.write_csv(full_table, full_csv)
+            pa_csv.write_csv(pa.Table.from_pandas(shortlist_df, preserve_index=False), top_csv)
         else:
             pd.DataFrame().to_csv(full_csv, index=False)
             pd.DataFrame().to_csv(top_csv, index=False)
@@ -364,7 +471,14 @@ def main():
     parser.add_argument("--bars", type=int, default=1000)
     parser.add_argument("--timeframes", type=str, default="1d,1h,5m")
     parser.add_argument("--max-lag", type=int, default=20)
+    parser.add_argument("--adf-lag", type=int, default=1, help="Fixed lag for the cointegration/spread ADF regressions")
     parser.add_argument("--corr-prefilter", type=float, default=0.5)
+    parser.add_argument(
+        "--prefilter-stride",
+        type=int,
+        default=1,
+        help="Row stride for an approximate downsampled correlation screen; >1 is faster but can drop pairs near --corr-prefilter (default 1, exact)",
+    )
     parser.add_argument("--corr-min", type=float, default=0.7)
     parser.add_argument("--coint-pmax", type=float, default=0.05)
     parser.add_argument("--adf-pmax", type=float, default=0.05)
@@ -372,6 +486,7 @@ def main():
     parser.add_argument("--require-adf", action=argparse.BooleanOptionalAction, default=True)
     parser.add_argument("--include-groups", type=str, default="forex,crypto,etf,spy")
     parser.add_argument("--output-root", type=str, default="outputs/pair_scans")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel workers for pair scoring (-1 = all cores)")
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -380,7 +495,9 @@ def main():
         bars=args.bars,
         timeframes=_parse_tuple_arg(args.timeframes),
         max_lag=args.max_lag,
+        adf_lag=args.adf_lag,
         corr_prefilter=args.corr_prefilter,
+        prefilter_stride=args.prefilter_stride,
         corr_min=args.corr_min,
         coint_pmax=args.coint_pmax,
         adf_pmax=args.adf_pmax,
@@ -388,6 +505,7 @@ def main():
         require_adf=args.require_adf,
         include_groups=_parse_tuple_arg(args.include_groups),
         output_root=args.output_root,
+        n_jobs=args.n_jobs,
     )
 
     summary = run_pair_scan(cfg, config_path=args.config)
@@ -1,6 +1,17 @@
 from abc import ABC, abstractmethod
 import pandas as pd
 import numpy as np
+from numba import njit, guvectorize
+
+def _log_returns(close) -> np.ndarray:
+    """Log returns along axis 0 as a float64 ndarray; row 0 is NaN, as with shift(1)."""
+    close = np.asarray(close, dtype=np.float64)
+    log_ret = np.empty_like(close)
+    if close.shape[0]:
+        log_ret[0] = np.nan
+        np.divide(close[1:], close[:-1], out=log_ret[1:])
+        np.log(log_ret[1:], out=log_ret[1:])
+    return log_ret
 
 class PositionSizer(ABC):
     """
@@ -37,10 +48,13 @@ class FixedSignalSizer(PositionSizer):
         self.size_pct = size_pct
 
     def size_position(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        # Scale the binary signal by the size percentage
-        df['position_size'] = df['signal'] * self.size_pct
-        return df
+        # Scale the binary signal by the size percentage.
+        # assign() leaves the caller's frame untouched; under copy-on-write it also
+        # shares (rather than duplicates) the existing columns.
+        signal = df['signal'].to_numpy(copy=False)
+        position_size = np.empty(signal.shape, dtype=np.float64)
+        np.multiply(signal, self.size_pct, out=position_size)
+        return df.assign(position_size=position_size)
 
 class VolatilitySizer(PositionSizer):
     """
@@ -55,29 +69,48 @@ class VolatilitySizer(PositionSizer):
         self.lookback = lookback
 
     def size_position(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        
-        # Calculate Realized Volatility (Annualized)
-        # rolling std of log returns * sqrt(252)
-        log_ret = np.log(df['close'] / df['close'].shift(1))
-        realized_vol = log_ret.rolling(window=self.lookback).std() * np.sqrt(252)
+        close = df['close'].to_numpy(dtype=np.float64)
+        signal = df['signal'].to_numpy(dtype=np.float64)
+        return df.assign(position_size=self.size_position_panel(close[:, None], signal[:, None])[:, 0])
+
+    def size_position_panel(self, close_matrix: np.ndarray, signal_matrix: np.ndarray) -> np.ndarray:
+        """
+        Sizes a whole universe at once.
         
-        # Avoid division by zero
-        realized_vol = realized_vol.replace(0, np.nan)
+        Args:
+            close_matrix (np.ndarray): T x A close prices, rows aligned across assets.
+            signal_matrix (np.ndarray): T x A signals on the same grid.
+            
+        Returns:
+            np.ndarray: T x A position sizes (NaN -> 0).
+        """
+        close = np.asarray(close_matrix, dtype=np.float64)
         
-        # Calculate raw weight
-        vol_weight = self.target_vol / realized_vol
+        # Calculate Realized Volatility (Annualized)
+        # rolling std of log returns * sqrt(252), O(T) per asset regardless of lookback
+        # (see _rolling_std). Windows touching a NaN return stay NaN (as in pandas).
+        w = self.lookback
+        realized_vol = np.full(close.shape, np.nan)
+        if w > 1 and close.shape[0] > w:
+            log_ret = _log_returns(close)[1:]
+            # gufunc runs along the last axis, so feed assets as rows
+            realized_vol[1:] = _rolling_std(log_ret.T, w).T * np.sqrt(252)
+        
+        # Calculate raw weight from 1 / vol, computed only where vol > 0
+        # (zero or undefined vol -> weight 0, i.e. no position)
+        inv_vol = np.zeros_like(realized_vol)
+        np.reciprocal(realized_vol, out=inv_vol, where=realized_vol > 0)
         
         # Cap leverage (optional, e.g., max 2x)
-        vol_weight = vol_weight.clip(upper=2.0)
+        vol_weight = np.minimum(self.target_vol * inv_vol, 2.0)
         
         # Apply to signal
-        df['position_size'] = df['signal'] * vol_weight
+        position_size = np.asarray(signal_matrix, dtype=np.float64) * vol_weight
         
-        # Fill NaNs (start of series) with 0
-        df['position_size'] = df['position_size'].fillna(0)
+        # Fill NaNs (missing signals) with 0
+        position_size[np.isnan(position_size)] = 0.0
         
-        return df
+        return position_size
 
 class KellySizer(PositionSizer):
     """
@@ -92,44 +125,114 @@ class KellySizer(PositionSizer):
         self.min_periods = min_periods
 
     def size_position(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        
-        # 1. Calculate Theoretical Strategy Returns (Raw Signal)
-        # We need to know what the return WOULD have been if we traded size 1.0
-        # Position at 't' comes from signal at 't-1'
-        raw_position = df['signal'].shift(1).fillna(0)
-        log_ret = np.log(df['close'] / df['close'].shift(1)).fillna(0)
-        
-        # Strategy return (assuming size 1)
-        strat_ret = raw_position * log_ret
-        
-        # 2. Calculate Expanding Mean and Variance
-        # We use expanding window to learn from history
-        expanding_mean = strat_ret.expanding(min_periods=self.min_periods).mean()
-        expanding_var = strat_ret.expanding(min_periods=self.min_periods).var()
-        
-        # Avoid division by zero
-        expanding_var = expanding_var.replace(0, np.nan)
-        
-        # 3. Calculate Kelly Fraction
-        kelly = expanding_mean / expanding_var
-        kelly = kelly.fillna(0)
-        
-        if self.half_kelly:
-            kelly = kelly * 0.5
-            
-        # 4. Constraints
-        # - Don't trade if Expectancy (Mean) is negative (Kelly would be negative, or misleading)
-        kelly = kelly.clip(lower=0) 
-        # - Cap leverage
-        kelly = kelly.clip(upper=self.cap)
-        
-        # 5. Apply to Current Signal
-        # The calculated 'kelly' at index 'i' is based on returns up to 'i'.
-        # We use this to size the signal at 'i' (which becomes position at 'i+1').
-        df['position_size'] = df['signal'] * kelly
-        
-        # Fill NaNs
-        df['position_size'] = df['position_size'].fillna(0)
-        
-        return df
+        # 1-5. Theoretical 1-unit Strategy Returns -> Expanding Mean/Variance -> Kelly
+        # Fraction -> Constraints -> Apply to Signal, fused into one compiled pass over
+        # log returns and signal (see _kelly_expanding). Position at 't' comes from signal at
+        # 't-1'; the kelly at index 'i' is based on returns up to 'i' and sizes the
+        # signal at 'i' (which becomes position at 'i+1'). The kernel's output is the
+        # finished column, attached without any further pandas passes.
+        position_size = _kelly_expanding(
+            _log_returns(df['close'].to_numpy()),
+            df['signal'].to_numpy(dtype=np.float64),
+            self.min_periods,
+            self.half_kelly,
+            self.cap,
+        )
+        return df.assign(position_size=position_size)
+
+
+@njit(cache=True)
+def _kelly_expanding(log_ret, signal, min_periods, half_kelly, cap):
+    """
+    Expanding Kelly fraction (mean / sample variance of strategy returns) times signal.
+
+    The 1-unit strategy return at 'i' is signal[i-1] * log_ret[i], with a missing
+    previous signal or return counted as 0 (shift/fillna semantics).
+    Welford's running mean/M2 in the same pass; NaN returns are skipped, as pandas'
+    expanding() does. Until min_periods observations exist, or while the variance
+    is zero, the fraction is 0. It is halved if half_kelly and clipped to [0, cap].
+    A NaN signal sizes to 0.
+    """
+    n_obs = log_ret.shape[0]
+    out = np.zeros(n_obs)
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n_obs):
+        raw_position = 0.0
+        if i > 0 and not np.isnan(signal[i - 1]):
+            raw_position = signal[i - 1]
+        ret = log_ret[i]
+        if np.isnan(ret):
+            ret = 0.0
+        x = raw_position * ret
+        if not np.isnan(x):
+            n += 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+
+        kelly = 0.0
+        if n >= min_periods and n > 1:
+            var = m2 / (n - 1)
+            if var > 0.0:
+                kelly = mean / var
+                if half_kelly:
+                    kelly *= 0.5
+                kelly = min(max(kelly, 0.0), cap)
+
+        size = signal[i] * kelly
+        if not np.isnan(size):
+            out[i] = size
+    return out
+
+
+@guvectorize(['void(float64[:], int64, float64[:])'], '(n),()->(n)', nopython=True, cache=True)
+def _rolling_std(x, window, out):
+    """
+    Rolling sample std (ddof=1) over a fixed window, one add/remove Welford update per step.
+
+    out[i] covers x[i-window+1 : i+1] and is NaN until a full window is available or
+    while the window holds a NaN. A window of identical values gives exactly 0, like
+    pandas, rather than round-off left in the running M2.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    nan_count = 0
+    same_run = 0
+    for i in range(x.shape[0]):
+        v = x[i]
+        if np.isnan(v):
+            nan_count += 1
+            same_run = 0
+        else:
+            n += 1
+            delta = v - mean
+            mean += delta / n
+            m2 += delta * (v - mean)
+            if i > 0 and v == x[i - 1]:
+                same_run += 1
+            else:
+                same_run = 1
+
+        if i >= window:
+            old = x[i - window]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                n -= 1
+                if n == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = old - mean
+                    mean -= delta / n
+                    m2 -= delta * (old - mean)
+
+        if i < window - 1 or nan_count > 0 or window < 2:
+            out[i] = np.nan
+        elif same_run >= window:
+            out[i] = 0.0
+        else:
+            out[i] = np.sqrt(max(m2, 0.0) / (window - 1))
@@ -1,10 +1,15 @@
 import os
+import re
 import json
+import functools
 import logging
 import argparse
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import sys
+from joblib import Parallel, delayed
 
 # Add src to path to allow imports if running as script
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -17,35 +22,113 @@ import src.strategies as strategies
 # Setup basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+@functools.lru_cache(maxsize=128)
+def _load_preset_cached(preset_path, mtime):
+    """Parses a preset file; keyed on mtime so an overwritten preset is re-read."""
+    with open(preset_path, 'rb') as f:
+        return json.loads(f.read())
+
 def load_preset(preset_path):
-    """Loads the preset JSON file."""
+    """
+    Loads the preset JSON file.
+    
+    Parsed once per (path, modification time); the returned list is shared between
+    calls, so treat it as read-only.
+    """
     try:
-        with open(preset_path, 'r') as f:
-            data = json.load(f)
-        return data
+        return _load_preset_cached(preset_path, os.path.getmtime(preset_path))
     except Exception as e:
         logging.error(f"Failed to load preset {preset_path}: {e}")
         return None
 
+# {StrategyName}_{instrument_type}_...; anything after the second underscore is ignored
+_PRESET_FILENAME_RE = re.compile(r'^(?P<strategy>[^_]+)_(?P<instrument>[^_]+)_')
+
 def parse_preset_filename(filename):
     """
     Extracts strategy name and instrument type from filename.
     Expected format: {StrategyName}_{instrument_type}_Optimized_{Timestamp}_presets.json
     """
-    base = os.path.basename(filename)
-    parts = base.split('_')
+    match = _PRESET_FILENAME_RE.match(os.path.basename(filename))
     
-    if len(parts) < 3:
+    if match is None:
         logging.warning("Filename format does not match expected pattern.")
         # Fallback: Try to infer from content or just return None
         return None, None
         
-    strategy_name = parts[0]
-    instrument_type = parts[1]
+    return match.group('strategy'), match.group('instrument')
+
+def _last_value(df, column, row=-1, default=0):
+    """Value of one column at a row position, read directly instead of boxing the whole row."""
+    if column not in df.columns:
+        return default
+    return df[column].iat[row]
+
+def _last_valid_row(df):
+    """Position of the most recent bar with a valid close, or None if there is none."""
+    valid = ~np.isnan(df['close'].to_numpy(dtype=np.float64))
+    if not valid.any():
+        return None
+    return len(valid) - 1 - int(np.argmax(valid[::-1]))
+
+def _apply_panel_sizer(engine, sizer):
+    """
+    Re-sizes every ticker in engine.data with a single sizer.size_position_panel call.
     
-    return strategy_name, instrument_type
+    Tickers sharing the first ticker's index are stacked into one T x A panel (see
+    BacktestEngine.get_panel); any with a different calendar are sized on their own so
+    no rows are invented. 'position' (and 'strategy_return', if present) are refreshed
+    from the new 'position_size', and engine.results (with each frame's 'trades') are
+    recomputed so they describe the re-sized run.
+    """
+    frames = {t: engine.data[t] for t in engine.tickers if t in engine.data and not engine.data[t].empty}
+    if not frames:
+        return
+    
+    panel, panel_tickers, _ = engine.get_panel(['close', 'signal'])
+    sizes = sizer.size_position_panel(panel[:, :, 0], panel[:, :, 1])
+    panel_col = {t: j for j, t in enumerate(panel_tickers)}
+    
+    # Off-calendar tickers are independent numpy work; size them on a thread pool
+    others = [t for t in frames if t not in panel_col]
+    if others:
+        sized = Parallel(n_jobs=-1, prefer="threads")(delayed(sizer.size_position)(frames[t]) for t in others)
+        frames.update(zip(others, sized))
+    
+    for ticker, df in frames.items():
+        if ticker in panel_col:
+            df['position_size'] = sizes[:, panel_col[ticker]]
+        df['position'] = df['position_size'].shift(1).fillna(0)
+        if 'log_return' in df.columns:
+            df['strategy_return'] = df['position'] * df['log_return']
+            engine.results[ticker] = engine.calculate_metrics(df)
+        engine.data[ticker] = df
+
+# Most recent finished signal frames, keyed on the call's inputs (see _signals_cache_key);
+# least recently used entries are evicted past _SIGNALS_CACHE_SIZE
+_SIGNALS_CACHE_SIZE = 4
+_signals_cache = OrderedDict()
+
+def _signals_cache_key(preset_path, target_vol, tickers, start_date, end_date, lookback, max_leverage):
+    """
+    Cache key for a generate_signals call, or None if the preset's mtime can't be read.
+    
+    The preset's mtime invalidates the entry when it is re-optimized, and an open
+    end_date resolves to today, so the next day's call runs fresh. Nothing in the key
+    tracks intraday data, which is why generate_signals only caches when asked to.
+    """
+    try:
+        mtime = os.path.getmtime(preset_path)
+    except OSError:
+        return None
+    if not end_date:
+        end_date = datetime.today().strftime('%Y-%m-%d')
+    return (
+        os.path.abspath(preset_path), mtime, target_vol,
+        tuple(tickers) if tickers else None, start_date, end_date, lookback, max_leverage,
+    )
 
-def generate_signals(preset_path, target_vol=None, tickers=None, start_date=None, end_date=None, lookback=365, max_leverage=1.0):
+def generate_signals(preset_path, target_vol=None, tickers=None, start_date=None, end_date=None, lookback=365, max_leverage=1.0, use_cache=False):
     """
     Generates trading signals for the current day based on the preset.
     
@@ -57,11 +140,21 @@ def generate_signals(preset_path, target_vol=None, tickers=None, start_date=None
         end_date (str, optional): End date for data fetching (YYYY-MM-DD).
         lookback (int): Days of history to fetch if start_date is not provided. Default 365.
         max_leverage (float): Maximum total leverage allowed (sum of absolute weights). Default 1.0.
+        use_cache (bool): Reuse the result of an earlier call with the same preset (and mtime)
+            and inputs on the same day. Bars that arrive intraday are not picked up. Default False.
     """
     if not os.path.exists(preset_path):
         logging.error(f"Preset file not found: {preset_path}")
         return None
 
+    cache_key = None
+    if use_cache:
+        cache_key = _signals_cache_key(preset_path, target_vol, tickers, start_date, end_date, lookback, max_leverage)
+    if cache_key is not None and cache_key in _signals_cache:
+        logging.info("Preset and inputs unchanged since the last run today; returning cached signals.")
+        _signals_cache.move_to_end(cache_key)
+        return _signals_cache[cache_key].copy()
+
     # 1. Parse Metadata
     strategy_name, instrument_type = parse_preset_filename(preset_path)
     if not strategy_name:
@@ -118,62 +211,74 @@ def generate_signals(preset_path, target_vol=None, tickers=None, start_date=None
     logging.info(f"Fetching data from {start_date} to {end_date}...")
     
     engine = BacktestEngine(tickers, start_date, end_date)
-    
-    # Configure Sizer
-    if target_vol:
-        logging.info(f"Applying Volatility Targeting (Target={target_vol})")
-        engine.position_sizer = VolatilitySizer(target_vol=target_vol)
-    
     engine.fetch_data()
 
     # 6. Run Strategy
     engine.run_strategy(strategy_instance)
 
+    # Volatility targeting is applied afterwards, one panel pass for the whole universe
+    if target_vol:
+        logging.info(f"Applying Volatility Targeting (Target={target_vol})")
+        _apply_panel_sizer(engine, VolatilitySizer(target_vol=target_vol))
+
     # 7. Extract Signals
-    signals = []
-    
-    for ticker in engine.tickers:
-        if ticker in engine.data:
-            df = engine.data[ticker]
-            if df.empty:
-                continue
-                
-            last_row = df.iloc[-1]
-            
-            # 'position_size' at index T is the Target Size for T+1
-            # 'position' at index T is the Actual Holding for T (decided at T-1)
-            
-            target_size = last_row.get('position_size', 0)
-            current_holding = last_row.get('position', 0)
-            raw_signal = last_row.get('signal', 0)
-            
-            # Determine Action based on Target Size
-            # Threshold for action to avoid noise
-            action = "HOLD"
-            
-            if target_size > 0 and current_holding <= 0:
-                action = "BUY"
-            elif target_size < 0 and current_holding >= 0:
-                action = "SELL_SHORT"
-            elif target_size == 0 and current_holding != 0:
-                action = "CLOSE"
-            elif (target_size > 0 and current_holding > 0) or (target_size < 0 and current_holding < 0):
-                # We are already in position, but size might change significantly
-                # Only flag as REBALANCE if change is significant (>10%)
-                if abs(target_size - current_holding) > 0.1:
-                    action = "REBALANCE"
-            
-            signals.append({
-                'Ticker': ticker,
-                'Date': last_row.name.date(),
-                'Close': last_row['close'],
-                'Raw_Signal': raw_signal,
-                'Target_Size': round(target_size, 3),
-                'Current_Hold': round(current_holding, 3),
-                'Action': action
-            })
-
-    results_df = pd.DataFrame(signals)
+    # Typed per-column buffers, one slot per ticker with data, filled by position
+    # Each ticker is read at its most recent bar with a valid close, so a data-source gap
+    # on the final bar doesn't turn into a NaN signal row
+    data = engine.data
+    items = [(t, data[t]) for t in engine.tickers if t in data and not data[t].empty]
+    rows = [_last_valid_row(df) for _, df in items]
+    no_close = [t for (t, _), row in zip(items, rows) if row is None]
+    stale = [t for (t, df), row in zip(items, rows) if row is not None and row != len(df) - 1]
+    if no_close:
+        logging.warning(f"No valid close for {no_close}; skipping.")
+    if stale:
+        logging.warning(f"Last bar has no close for {stale}; using their most recent valid bar.")
+    items = [(t, df, row) for (t, df), row in zip(items, rows) if row is not None]
+    n = len(items)
+    ticker_arr = np.empty(n, dtype=object)
+    date_arr = np.empty(n, dtype=object)
+    close_arr = np.empty(n, dtype=np.float64)
+    signal_arr = np.empty(n, dtype=np.float64)
+    target_arr = np.empty(n, dtype=np.float64)
+    hold_arr = np.empty(n, dtype=np.float64)
+    
+    for i, (ticker, df, row) in enumerate(items):
+        # 'position_size' at index T is the Target Size for T+1
+        # 'position' at index T is the Actual Holding for T (decided at T-1)
+        
+        ticker_arr[i] = ticker
+        date_arr[i] = df.index[row].date()
+        close_arr[i] = df['close'].iat[row]
+        signal_arr[i] = _last_value(df, 'signal', row)
+        target_arr[i] = _last_value(df, 'position_size', row)
+        hold_arr[i] = _last_value(df, 'position', row)
+
+    # Determine Action based on Target Size, for all tickers at once
+    # Threshold for action to avoid noise: already in position, but only flag as
+    # REBALANCE if the size change is significant (>10%)
+    tgt, hold = target_arr, hold_arr
+    same_side = ((tgt > 0) & (hold > 0)) | ((tgt < 0) & (hold < 0))
+    action_arr = np.select(
+        [
+            (tgt > 0) & (hold <= 0),
+            (tgt < 0) & (hold >= 0),
+            (tgt == 0) & (hold != 0),
+            same_side & (np.abs(tgt - hold) > 0.1),
+        ],
+        ["BUY", "SELL_SHORT", "CLOSE", "REBALANCE"],
+        default="HOLD",
+    ).astype(object)
+
+    results_df = pd.DataFrame({
+        'Ticker': ticker_arr,
+        'Date': date_arr,
+        'Close': close_arr,
+        'Raw_Signal': signal_arr,
+        'Target_Size': np.round(target_arr, 3),
+        'Current_Hold': np.round(hold_arr, 3),
+        'Action': action_arr,
+    })
 
     # 8. Portfolio Normalization
     if not results_df.empty and max_leverage is not None:
@@ -188,6 +293,11 @@ def generate_signals(preset_path, target_vol=None, tickers=None, start_date=None
             # the new Constrained Target vs the Old Unconstrained History. 
             # This is technically correct behavior for the first day of applying constraints.
 
+    if cache_key is not None:
+        _signals_cache[cache_key] = results_df.copy()
+        while len(_signals_cache) > _SIGNALS_CACHE_SIZE:
+            _signals_cache.popitem(last=False)
+
     return results_df
 
 if __name__ == "__main__":
@@ -18,6 +18,17 @@ with existing code that imports from src.strategies.
 
 import sys
 import inspect
+import logging
+
+# Optional: unlockedpd patches pandas' rolling/ewm/expanding with numba kernels on
+# import, which speeds up the indicator code still written against pandas
+# (including pandas_ta's internals). It is a drop-in replacement; install with
+# `pip install unlockedpd`.
+try:
+    import unlockedpd  # noqa: F401
+except ImportError:
+    unlockedpd = None
+    logging.debug("unlockedpd not installed; pandas rolling/ewm run unpatched.")
 
 # Import base template
 from .base import StrategyTemplate
@@ -121,23 +132,32 @@ __all__ = [
 ]
 
 
+# Filled on the first get_all_strategies() call; the package's classes do not change
+_strategy_registry = None
+
+
 def get_all_strategies():
     """
     Returns a dictionary of all strategy classes defined in this package.
     Excludes StrategyTemplate itself.
+
+    The module is scanned once; later calls return a copy of that result.
     
     Returns:
         dict: Mapping of strategy names to strategy classes
     """
-    strategies = {}
-    
-    # Get all items from the current module
-    current_module = sys.modules[__name__]
-    
-    for name, obj in inspect.getmembers(current_module):
-        if (inspect.isclass(obj) and 
-            issubclass(obj, StrategyTemplate) and 
-            obj is not StrategyTemplate):
-            strategies[name] = obj
+    global _strategy_registry
+    if _strategy_registry is None:
+        strategies = {}
+        
+        # Get all items from the current module
+        current_module = sys.modules[__name__]
+        
+        for name, obj in inspect.getmembers(current_module):
+            if (inspect.isclass(obj) and 
+                issubclass(obj, StrategyTemplate) and 
+                obj is not StrategyTemplate):
+                strategies[name] = obj
+        _strategy_registry = strategies
             
-    return strategies
+    return dict(_strategy_registry)
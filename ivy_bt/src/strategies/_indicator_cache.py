@@ -0,0 +1,104 @@
+"""
+Memoised indicator kernels for parameter sweeps.
+
+Grid search calls ``strat_apply`` on the same cached frame once per parameter
+combination, so e.g. the same EMA length is recomputed for every value of the
+other parameters. These wrappers remember kernel results per (input buffers,
+parameters) for as long as the inputs' underlying arrays are alive. Results
+are returned read-only; inputs must not be modified in place while cached.
+"""
+
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from ._numba_kernels import atr_nb, bbands_nb, ema_nb, macd_nb, rsi_nb, true_range_nb
+
+# Bound on entries, so a long sweep over many frames cannot grow it without limit
+_MAX_ENTRIES = 512
+_cache = OrderedDict()
+
+
+def _owner(a):
+    """The ndarray that owns ``a``'s memory (``a`` itself unless it is a view)."""
+    while isinstance(a.base, np.ndarray):
+        a = a.base
+    return a
+
+
+def _cached(kernel, arrays, params):
+    owners = [_owner(a) for a in arrays]
+    key = (kernel.__name__, params) + tuple(
+        (a.__array_interface__['data'][0], a.shape, a.strides, id(o))
+        for a, o in zip(arrays, owners)
+    )
+    entry = _cache.get(key)
+    if entry is not None and all(ref() is o for ref, o in zip(entry[0], owners)):
+        _cache.move_to_end(key)
+        return entry[1]
+
+    result = kernel(*arrays, *params)
+    for r in (result if isinstance(result, tuple) else (result,)):
+        r.flags.writeable = False
+
+    # Entries die with their inputs, so a recycled id() never hits a stale result
+    def _evict(_, key=key):
+        _cache.pop(key, None)
+
+    _cache[key] = ([weakref.ref(o, _evict) for o in owners], result)
+    if len(_cache) > _MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return result
+
+
+def clear_indicator_cache():
+    """Drops every cached result."""
+    _cache.clear()
+
+
+def cached_ema(close, length):
+    """``ema_nb(close, length)``, memoised."""
+    return _cached(ema_nb, (close,), (int(length),))
+
+
+def cached_rsi(close, length):
+    """``rsi_nb(close, length)``, memoised."""
+    return _cached(rsi_nb, (close,), (int(length),))
+
+
+def cached_atr(high, low, close, length):
+    """``atr_nb(high, low, close, length)``, memoised."""
+    return _cached(atr_nb, (high, low, close), (int(length),))
+
+
+def cached_true_range(high, low, close):
+    """``true_range_nb(high, low, close)``, memoised."""
+    return _cached(true_range_nb, (high, low, close), ())
+
+
+def cached_bbands(close, length, std, ddof=0):
+    """``bbands_nb(close, length, std, ddof)``, memoised. Returns ``(lower, mid, upper)``."""
+    return _cached(bbands_nb, (close,), (int(length), float(std), int(ddof)))
+
+
+def cached_macd(close, fast, slow, signal):
+    """``macd_nb(close, fast, slow, signal)``, memoised. Returns ``(macd, signal_line)``."""
+    return _cached(macd_nb, (close,), (int(fast), int(slow), int(signal)))
+
+
+def cached_table(cached, close, params):
+    """
+    Evaluates ``cached(close, *p)`` once per distinct row ``p`` of ``params``
+    (one row per parameter set, one column per indicator argument; a 1-D array
+    for single-argument indicators), e.g. one RSI per distinct length in a batch.
+
+    Returns ``(tables, rows)``: one stacked 2-D array per output of ``cached``
+    and, for each parameter set, its row in those tables.
+    """
+    params = np.asarray(params)
+    keys, rows = np.unique(params.reshape(len(params), -1), axis=0, return_inverse=True)
+    results = [cached(close, *key) for key in keys]
+    if not isinstance(results[0], tuple):
+        results = [(r,) for r in results]
+    return tuple(np.stack(parts) for parts in zip(*results)), rows.reshape(-1).astype(np.int64)
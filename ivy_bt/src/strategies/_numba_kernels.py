@@ -0,0 +1,1197 @@
+"""Numba kernels for the stateful per-bar loops in the strategy modules."""
+
+import numpy as np
+from numba import njit, prange
+
+
+# Machine epsilon, as pandas_ta adds to zero-width bar ranges
+_EPS = np.finfo(np.float64).eps
+
+
+@njit(cache=True)
+def chandelier_loop(close, long_stop, short_stop):
+    """
+    Trails Chandelier long/short stops and tracks the resulting direction.
+
+    ``long_stop``/``short_stop`` are the raw stops (NaN already filled) and are
+    trailed in place: the long stop only ratchets up while the previous close is
+    above it, the short stop only down while the previous close is below it.
+    Direction flips to 1 on a close above the prior short stop and to -1 on a
+    close below the prior long stop. Returns ``(long_stop, short_stop, directions)``;
+    ``directions`` is int8 and ``directions[0]`` is 0.
+    """
+    n = close.shape[0]
+    directions = np.zeros(n, dtype=np.int8)
+    curr_dir = 1
+    for i in range(1, n):
+        # Trailing Long Stop logic
+        if close[i - 1] > long_stop[i - 1]:
+            long_stop[i] = max(long_stop[i], long_stop[i - 1])
+
+        # Trailing Short Stop logic
+        if close[i - 1] < short_stop[i - 1]:
+            short_stop[i] = min(short_stop[i], short_stop[i - 1])
+
+        # Direction switch
+        if close[i] > short_stop[i - 1]:
+            curr_dir = 1
+        elif close[i] < long_stop[i - 1]:
+            curr_dir = -1
+        directions[i] = curr_dir
+    return long_stop, short_stop, directions
+
+
+@njit(cache=True)
+def _deque_push(x, i, window, sign, dq, state):
+    """
+    Adds bar ``i`` to a rolling max (``sign`` 1.0) or min (``sign`` -1.0) window
+    kept as a monotonic ring buffer of indices ``dq`` (values decreasing in
+    ``sign * x`` front to back; ``state`` holds its head and size), dropping the
+    bar that left the window. Returns the extreme of the window ending at ``i``.
+    Each bar is pushed and popped at most once, so a pass is O(n) whatever the
+    window.
+    """
+    head = state[0]
+    size = state[1]
+    if size and dq[head] <= i - window:
+        head = (head + 1) % window
+        size -= 1
+    v = x[i]
+    while size and sign * x[dq[(head + size - 1) % window]] <= sign * v:
+        size -= 1
+    dq[(head + size) % window] = i
+    size += 1
+    state[0] = head
+    state[1] = size
+    return x[dq[head]]
+
+
+@njit(cache=True)
+def _rolling_extreme(x, window, sign, lag):
+    """
+    Rolling max (``sign`` 1.0) or min (``sign`` -1.0) over a monotonic deque
+    (see ``_deque_push``), written ``lag`` bars later. NaN until a full window
+    is available and wherever the window holds a NaN, as pandas' default
+    ``min_periods=window`` gives.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if window < 1:
+        return out
+    dq = np.empty(window, dtype=np.int64)
+    state = np.zeros(2, dtype=np.int64)
+    last_nan = -1
+    for i in range(n - lag):
+        if np.isnan(x[i]):
+            # No window containing this bar has a value; start over after it
+            last_nan = i
+            state[1] = 0
+            continue
+        v = _deque_push(x, i, window, sign, dq, state)
+        start = i - window + 1
+        if start >= 0 and last_nan < start:
+            out[i + lag] = v
+    return out
+
+
+@njit(cache=True)
+def rolling_max(x, window, lag=0):
+    """
+    ``x.shift(lag).rolling(window).max()`` in O(n), without a shifted copy; see
+    ``_rolling_extreme``.
+    """
+    return _rolling_extreme(x, window, 1.0, lag)
+
+
+@njit(cache=True)
+def rolling_min(x, window, lag=0):
+    """
+    ``x.shift(lag).rolling(window).min()`` in O(n), without a shifted copy; see
+    ``_rolling_extreme``.
+    """
+    return _rolling_extreme(x, window, -1.0, lag)
+
+
+@njit(cache=True)
+def rolling_extrema(x, window):
+    """
+    ``x.rolling(window).max()`` and ``.min()``. Returns ``(rolling_max, rolling_min)``.
+    """
+    return rolling_max(x, window), rolling_min(x, window)
+
+
+@njit(cache=True)
+def donchian_channels(high, low, entry_window, exit_window):
+    """
+    TurtleTradingSystem's Donchian channels of the previous bars in one pass:
+    the highest ``high`` / lowest ``low`` over the ``entry_window`` and
+    ``exit_window`` bars before each bar (``high.shift(1).rolling(w).max()``
+    etc.), with four deques (see ``_deque_push``) and no shifted copies.
+    Returns ``(entry_high, entry_low, exit_high, exit_low)``, NaN where the
+    pandas equivalents are.
+    """
+    n = high.shape[0]
+    entry_high = np.full(n, np.nan)
+    entry_low = np.full(n, np.nan)
+    exit_high = np.full(n, np.nan)
+    exit_low = np.full(n, np.nan)
+    if entry_window < 1 or exit_window < 1:
+        return entry_high, entry_low, exit_high, exit_low
+    dq_entry_high = np.empty(entry_window, dtype=np.int64)
+    dq_entry_low = np.empty(entry_window, dtype=np.int64)
+    dq_exit_high = np.empty(exit_window, dtype=np.int64)
+    dq_exit_low = np.empty(exit_window, dtype=np.int64)
+    st_entry_high = np.zeros(2, dtype=np.int64)
+    st_entry_low = np.zeros(2, dtype=np.int64)
+    st_exit_high = np.zeros(2, dtype=np.int64)
+    st_exit_low = np.zeros(2, dtype=np.int64)
+    last_nan_high = -1
+    last_nan_low = -1
+    # Bar j's values enter the channels of bar j + 1
+    for j in range(n - 1):
+        if np.isnan(high[j]):
+            last_nan_high = j
+            st_entry_high[1] = 0
+            st_exit_high[1] = 0
+        else:
+            v = _deque_push(high, j, entry_window, 1.0, dq_entry_high, st_entry_high)
+            if last_nan_high < j - entry_window + 1 and j >= entry_window - 1:
+                entry_high[j + 1] = v
+            v = _deque_push(high, j, exit_window, 1.0, dq_exit_high, st_exit_high)
+            if last_nan_high < j - exit_window + 1 and j >= exit_window - 1:
+                exit_high[j + 1] = v
+        if np.isnan(low[j]):
+            last_nan_low = j
+            st_entry_low[1] = 0
+            st_exit_low[1] = 0
+        else:
+            v = _deque_push(low, j, entry_window, -1.0, dq_entry_low, st_entry_low)
+            if last_nan_low < j - entry_window + 1 and j >= entry_window - 1:
+                entry_low[j + 1] = v
+            v = _deque_push(low, j, exit_window, -1.0, dq_exit_low, st_exit_low)
+            if last_nan_low < j - exit_window + 1 and j >= exit_window - 1:
+                exit_low[j + 1] = v
+    return entry_high, entry_low, exit_high, exit_low
+
+
+@njit(cache=True)
+def bbkc_squeeze_signal(close, bb_lower, bb_basis, bb_upper, k_ma, k_range_ma, k_mult, side, out=None):
+    """
+    BBKCSqueezeBreakout in one pass over its precomputed bands: while the
+    Bollinger Bands sit inside the Keltner Channel (``k_ma`` +/- ``k_mult``
+    ``k_range_ma``), a close above / below the bands enters ``side`` / ``-side``
+    (the downside break wins a tie, as np.select's order did). A held long
+    (short) is flattened on bars where close crosses down (up) through the BB
+    basis; the entry resumes on the next bar. The signal is int8 unless written
+    into a given ``out``.
+    """
+    n = close.shape[0]
+    if out is None:
+        out = np.empty(n, dtype=np.int8)
+    held = 0.0
+    for i in range(n):
+        c = close[i]
+        k_upper = k_ma[i] + (k_range_ma[i] * k_mult)
+        k_lower = k_ma[i] - (k_range_ma[i] * k_mult)
+        if bb_upper[i] <= k_upper and bb_lower[i] >= k_lower:
+            if c < bb_lower[i]:
+                held = -side
+            elif c > bb_upper[i]:
+                held = side
+        flat = False
+        if i > 0:
+            if held == 1:
+                flat = close[i - 1] > bb_basis[i - 1] and c <= bb_basis[i]
+            elif held == -1:
+                flat = close[i - 1] < bb_basis[i - 1] and c >= bb_basis[i]
+        out[i] = 0.0 if flat else held
+    return out
+
+
+@njit(cache=True)
+def _midprice(high, low, length):
+    """``ta.midprice``: mean of the rolling lowest low and highest high."""
+    return 0.5 * (rolling_min(low, length) + rolling_max(high, length))
+
+
+@njit(cache=True)
+def _ichimoku_cloud(tenkan_mid, kijun_mid, senkou_mid, lag, displacement, m):
+    """
+    ``(top, bottom)`` of the cloud IchimokuCloudBreakout compares bar ``m`` with:
+    the spans plotted ``displacement`` bars earlier. NaN when either span is.
+    """
+    k = m - displacement - lag
+    if m < displacement or k < 0:
+        return np.nan, np.nan
+    span_a = 0.5 * (tenkan_mid[k] + kijun_mid[k])
+    span_b = senkou_mid[k]
+    if np.isnan(span_a) or np.isnan(span_b):
+        return np.nan, np.nan
+    return max(span_a, span_b), min(span_a, span_b)
+
+
+@njit(cache=True)
+def ichimoku_signal(high, low, close, tenkan, kijun, senkou, displacement, out=None):
+    """
+    IchimokuCloudBreakout in one pass over the Ichimoku lines as ``ta.ichimoku``
+    builds them (Span A/B projected ``kijun - 1`` bars forward, the lagging span
+    ``close`` that many bars back).
+
+    Long when close is above the cloud ``displacement`` bars back, the lagging
+    span is above the cloud ``displacement`` bars before that, and the current
+    Span A is above Span B; short mirrors it. A close inside the cloud goes
+    flat and takes priority; the position is held otherwise. The signal is
+    int8 unless written into a given ``out``.
+    """
+    n = close.shape[0]
+    if out is None:
+        out = np.empty(n, dtype=np.int8)
+    tenkan_mid = _midprice(high, low, tenkan)
+    kijun_mid = _midprice(high, low, kijun)
+    senkou_mid = _midprice(high, low, senkou)
+    lag = kijun - 1
+    d = min(displacement, n)
+    last = 0.0
+    for i in range(n):
+        c = close[i]
+        top, bottom = _ichimoku_cloud(tenkan_mid, kijun_mid, senkou_mid, lag, d, i)
+        past_top, past_bottom = np.nan, np.nan
+        if i >= d:
+            past_top, past_bottom = _ichimoku_cloud(tenkan_mid, kijun_mid, senkou_mid, lag, d, i - d)
+        span_a, span_b = np.nan, np.nan
+        if i >= lag:
+            span_a = 0.5 * (tenkan_mid[i - lag] + kijun_mid[i - lag])
+            span_b = senkou_mid[i - lag]
+        lagging = close[i + lag] if i + lag < n else np.nan
+
+        if c <= top and c >= bottom:
+            last = 0.0
+        elif c < bottom and lagging < past_bottom and span_a < span_b:
+            last = -1.0
+        elif c > top and lagging > past_top and span_a > span_b:
+            last = 1.0
+        out[i] = last
+    return out
+
+
+@njit(cache=True)
+def newsom_entries(close, open_, high, low, ema, directions, expansion, vol_active, out=None):
+    """
+    Newsom10 entry signal in one pass: 1 / -1 on bars meeting every long / short
+    condition, NaN elsewhere.
+
+    Long: close and ohlc4 above the EMA after a down bar (previous close below
+    previous open), Chandelier direction 1, band expansion and the volatility
+    filter active. Short mirrors it. ohlc4 is formed per bar rather than stored.
+    Bar 0 has no previous bar and never enters. Written into ``out`` when given.
+    """
+    n = close.shape[0]
+    if out is None:
+        out = np.empty(n)
+    out[:] = np.nan
+    for i in range(1, n):
+        if not (expansion[i] and vol_active[i]):
+            continue
+        c = close[i]
+        e = ema[i]
+        ohlc4 = (open_[i] + high[i] + low[i] + c) / 4
+        if (c < e and close[i - 1] > open_[i - 1] and ohlc4 < e
+                and directions[i] == -1):
+            out[i] = -1.0
+        elif (c > e and close[i - 1] < open_[i - 1] and ohlc4 > e
+                and directions[i] == 1):
+            out[i] = 1.0
+    return out
+
+@njit(cache=True)
+def _span_com(length):
+    """Center of mass pandas derives from ``ewm(span=length)``."""
+    return (length - 1) / 2.0
+
+
+@njit(cache=True)
+def _rma_com(length):
+    """
+    Center of mass for Wilder's smoothing. pandas-ta passes ``alpha=1/length``;
+    pandas turns that into a center of mass and back, so do the same to land on
+    the identical alpha.
+    """
+    return 1.0 / (1.0 / length) - 1.0
+
+
+@njit(cache=True)
+def _ewm_mean(x, com):
+    """
+    ``Series.ewm(com=com, adjust=False).mean()`` on an ndarray.
+
+    Same recursion as pandas: output stays NaN until the first observation, a
+    NaN input repeats the previous value and still decays its weight
+    (``ignore_na=False``).
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    weighted = x[0]
+    old_wt = 1.0
+    out[0] = weighted
+    for i in range(1, n):
+        cur = x[i]
+        is_observation = not np.isnan(cur)
+        if not np.isnan(weighted):
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = old_wt * weighted + alpha * cur
+                    weighted /= old_wt + alpha
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True)
+def ema_nb(close, length):
+    """
+    EMA as ``ta.ema(close, length)`` computes it: seeded with the SMA of the first
+    ``length`` values (NaNs skipped), NaN before the seed, then
+    ``ewm(span=length, adjust=False)``. All NaN when there are fewer than
+    ``length`` values.
+    """
+    n = close.shape[0]
+    if n < length:
+        return np.full(n, np.nan)
+    total = 0.0
+    count = 0
+    for i in range(length):
+        if not np.isnan(close[i]):
+            total += close[i]
+            count += 1
+    seeded = close.astype(np.float64)
+    seeded[:length - 1] = np.nan
+    seeded[length - 1] = total / count if count else np.nan
+    return _ewm_mean(seeded, _span_com(length))
+
+
+@njit(cache=True)
+def vol_filter_nb(close, atr, length, ema_out=None, out=None):
+    """
+    Newsom10 volatility filter, ``ratio > ema_nb(ratio, length)`` with
+    ``ratio = atr / close * 100``, fused into one pass: the ratio is streamed
+    bar by bar, never stored. Returns ``(ema, active)``; ``active`` is False
+    while either side is NaN. Written into ``ema_out`` / ``out`` when given.
+    """
+    n = close.shape[0]
+    if ema_out is None:
+        ema_out = np.empty(n)
+    if out is None:
+        out = np.empty(n, dtype=np.bool_)
+    if n < length:
+        ema_out[:] = np.nan
+        out[:] = False
+        return ema_out, out
+    # SMA seed over the first window, NaNs skipped (as ema_nb)
+    total = 0.0
+    count = 0
+    for i in range(length):
+        r = (atr[i] / close[i]) * 100
+        if not np.isnan(r):
+            total += r
+            count += 1
+    seed = total / count if count else np.nan
+
+    # _ewm_mean's recursion on the seeded ratio, inline
+    alpha = 1.0 / (1.0 + _span_com(length))
+    old_wt_factor = 1.0 - alpha
+    weighted = np.nan
+    old_wt = 1.0
+    for i in range(n):
+        r = (atr[i] / close[i]) * 100
+        if i < length - 1:
+            cur = np.nan
+        elif i == length - 1:
+            cur = seed
+        else:
+            cur = r
+        is_observation = not np.isnan(cur)
+        if not np.isnan(weighted):
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = old_wt * weighted + alpha * cur
+                    weighted /= old_wt + alpha
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        ema_out[i] = weighted
+        out[i] = r > weighted
+    return ema_out, out
+
+
+@njit(cache=True)
+def rsi_nb(close, length):
+    """
+    RSI as ``ta.rsi(close, length)`` computes it: Wilder (RMA) averages of the
+    up and down moves, ``100 * up / (up + |down|)``; NaN where both are 0. All
+    NaN when there are fewer than ``length + 1`` values.
+    """
+    n = close.shape[0]
+    if n < length + 1:
+        return np.full(n, np.nan)
+    positive = np.empty(n)
+    negative = np.empty(n)
+    positive[0] = np.nan
+    negative[0] = np.nan
+    for i in range(1, n):
+        d = close[i] - close[i - 1]
+        positive[i] = 0.0 if d < 0 else d
+        negative[i] = 0.0 if d > 0 else d
+    com = _rma_com(length)
+    positive_avg = _ewm_mean(positive, com)
+    negative_avg = _ewm_mean(negative, com)
+    out = np.empty(n)
+    for i in range(n):
+        denom = positive_avg[i] + abs(negative_avg[i])
+        out[i] = np.nan if denom == 0.0 else 100.0 * positive_avg[i] / denom
+    return out
+
+
+@njit(cache=True)
+def true_range_nb(high, low, close):
+    """
+    True range as ``ta.true_range(high, low, close)`` computes it: the largest of
+    ``|high - low|``, ``|high - prev close|`` and ``|prev close - low|``, NaN
+    terms skipped. As in ta, every high-low range is nudged by machine epsilon
+    when any bar has a zero range.
+    """
+    n = close.shape[0]
+    eps = 0.0
+    for i in range(n):
+        if high[i] - low[i] == 0.0:
+            eps = _EPS
+            break
+    out = np.empty(n)
+    for i in range(n):
+        tr = abs(high[i] - low[i] + eps)
+        if i > 0:
+            prev_close = close[i - 1]
+            for term in (abs(high[i] - prev_close), abs(prev_close - low[i])):
+                if np.isnan(tr) or term > tr:
+                    tr = term
+        out[i] = tr
+    return out
+
+
+@njit(cache=True)
+def atr_nb(high, low, close, length):
+    """
+    ATR as ``ta.atr(high, low, close, length)`` computes it: true range (NaN
+    terms skipped), seeded with its SMA over the first ``length`` bars, then
+    Wilder (RMA) smoothed. All NaN when there are fewer than ``length + 1`` values.
+    """
+    n = close.shape[0]
+    if n < length + 1:
+        return np.full(n, np.nan)
+    true_range = np.empty(n)
+    for i in range(n):
+        tr = abs(high[i] - low[i])
+        if i > 0:
+            prev_close = close[i - 1]
+            for term in (abs(high[i] - prev_close), abs(prev_close - low[i])):
+                if np.isnan(tr) or term > tr:
+                    tr = term
+        true_range[i] = tr
+    total = 0.0
+    count = 0
+    for i in range(length):
+        if not np.isnan(true_range[i]):
+            total += true_range[i]
+            count += 1
+    true_range[:length - 1] = np.nan
+    true_range[length - 1] = total / count if count else np.nan
+    return _ewm_mean(true_range, _rma_com(length))
+
+
+@njit(cache=True)
+def bbands_nb(close, length, std, ddof):
+    """
+    Bollinger Bands over a ``length`` window: SMA midline +/- ``std`` rolling
+    standard deviations (divisor ``length - ddof``). Returns
+    ``(lower, mid, upper)``, NaN wherever the window is short or holds a NaN.
+    """
+    n = close.shape[0]
+    lower = np.full(n, np.nan)
+    mid = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+    for i in range(length - 1, n):
+        start = i - length + 1
+        total = 0.0
+        has_nan = False
+        for j in range(start, i + 1):
+            if np.isnan(close[j]):
+                has_nan = True
+                break
+            total += close[j]
+        if has_nan:
+            continue
+        mean = total / length
+        ss = 0.0
+        for j in range(start, i + 1):
+            d = close[j] - mean
+            ss += d * d
+        deviation = std * np.sqrt(ss / (length - ddof))
+        mid[i] = mean
+        lower[i] = mean - deviation
+        upper[i] = mean + deviation
+    return lower, mid, upper
+
+
+@njit(cache=True)
+def macd_nb(close, fast, slow, signal):
+    """
+    MACD as ``ta.macd(close, fast, slow, signal)`` computes it. Returns
+    ``(macd, signal_line)``; the signal EMA starts at the MACD line's first
+    valid value. ``fast``/``slow`` are swapped if given in the wrong order.
+    """
+    if slow < fast:
+        fast, slow = slow, fast
+    macd = ema_nb(close, fast) - ema_nb(close, slow)
+    signal_line = np.full(macd.shape[0], np.nan)
+    for k in range(macd.shape[0]):
+        if not np.isnan(macd[k]):
+            signal_line[k:] = ema_nb(macd[k:], signal)
+            break
+    return macd, signal_line
+
+
+@njit(cache=True)
+def pairs_zscore(x, y, window):
+    """
+    PairsTrading's rolling hedge ratio and spread z-score in one pass. ``beta``
+    is the rolling cov(y, x) / var(x) and ``z_score`` the spread
+    ``y - beta * x`` standardised by its own rolling mean and sample std, both
+    over ``window`` bars with add / remove Welford updates. Returns
+    ``(beta, z_score)``, NaN until each window is full, while it holds a NaN or
+    where the variance it divides by is zero.
+    """
+    n = x.shape[0]
+    beta = np.full(n, np.nan)
+    spread = np.full(n, np.nan)
+    z_score = np.full(n, np.nan)
+    # (x, y) window: count, means, co-moment and x's M2; bars with a NaN in either
+    # series are only counted in n_bad
+    count = 0
+    mean_x = 0.0
+    mean_y = 0.0
+    c_xy = 0.0
+    m2_x = 0.0
+    n_bad = 0
+    # Spread window
+    s_count = 0
+    s_mean = 0.0
+    s_m2 = 0.0
+    s_bad = 0
+    for i in range(n):
+        xi = x[i]
+        yi = y[i]
+        if np.isnan(xi) or np.isnan(yi):
+            n_bad += 1
+        else:
+            count += 1
+            dx = xi - mean_x
+            mean_x += dx / count
+            mean_y += (yi - mean_y) / count
+            c_xy += dx * (yi - mean_y)
+            m2_x += dx * (xi - mean_x)
+        if i >= window:
+            xo = x[i - window]
+            yo = y[i - window]
+            if np.isnan(xo) or np.isnan(yo):
+                n_bad -= 1
+            else:
+                count -= 1
+                if count == 0:
+                    mean_x = 0.0
+                    mean_y = 0.0
+                    c_xy = 0.0
+                    m2_x = 0.0
+                else:
+                    dx = xo - mean_x
+                    mean_x -= dx / count
+                    mean_y -= (yo - mean_y) / count
+                    c_xy -= dx * (yo - mean_y)
+                    m2_x -= dx * (xo - mean_x)
+        if i >= window - 1 and n_bad == 0 and m2_x > 0.0:
+            b = c_xy / m2_x
+            beta[i] = b
+            spread[i] = yi - b * xi
+
+        s = spread[i]
+        if np.isnan(s):
+            s_bad += 1
+        else:
+            s_count += 1
+            d = s - s_mean
+            s_mean += d / s_count
+            s_m2 += d * (s - s_mean)
+        if i >= window:
+            so = spread[i - window]
+            if np.isnan(so):
+                s_bad -= 1
+            else:
+                s_count -= 1
+                if s_count == 0:
+                    s_mean = 0.0
+                    s_m2 = 0.0
+                else:
+                    d = so - s_mean
+                    s_mean -= d / s_count
+                    s_m2 -= d * (so - s_mean)
+        if i >= window - 1 and s_bad == 0 and s_m2 > 0.0:
+            z_score[i] = (s - s_mean) / np.sqrt(s_m2 / (window - 1))
+    return beta, z_score
+
+
+@njit(cache=True)
+def heikin_ashi_trend(open_, high, low, close, ema_len, ema_offset):
+    """
+    TradingMadeSimpleTDIHeikinAshi's Heikin Ashi candles and their position
+    against the EMA of HA close shifted ``ema_offset`` bars. HA high / low are
+    formed per bar rather than stored. Returns ``(ha_open, ha_close, all_above,
+    all_below)``: whether every HA value of the bar is at or above / at or below
+    the shifted EMA, False where any of them is NaN.
+    """
+    n = close.shape[0]
+    ha_open = np.empty(n)
+    ha_close = np.empty(n)
+    for i in range(n):
+        ha_close[i] = (open_[i] + high[i] + low[i] + close[i]) / 4.0
+        ha_open[i] = (open_[i] + close[i]) / 2.0
+    ema = ema_nb(ha_close, ema_len)
+    all_above = np.zeros(n, dtype=np.bool_)
+    all_below = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        j = i - ema_offset
+        if j < 0 or j >= n:
+            continue
+        e = ema[j]
+        ho = ha_open[i]
+        hc = ha_close[i]
+        if np.isnan(e) or np.isnan(ho) or np.isnan(hc) or np.isnan(high[i]) or np.isnan(low[i]):
+            continue
+        ha_high = max(high[i], ho, hc)
+        ha_low = min(low[i], ho, hc)
+        all_above[i] = ha_low >= e
+        all_below[i] = ha_high <= e
+    return ha_open, ha_close, all_above, all_below
+
+
+@njit(cache=True)
+def tdi_ha_signal(ha_open, ha_close, all_above, all_below, tdi_green, tdi_red, slope_strong, slope_flat,
+                  out=None):
+    """
+    TradingMadeSimpleTDIHeikinAshi's signal in one pass over its Heikin Ashi
+    candles (see ``heikin_ashi_trend``) and TDI lines. Bar t reads the lines at
+    t-1 and t-2: a green/red cross between them, the green slope
+    ``green[t-1] - green[t-2]`` against ``slope_strong`` / ``slope_flat`` and
+    an HA colour change over the same two bars, with the cross allowed on
+    candle #1 or #2 of the move. Entries are held (the short wins a tie) and
+    flattened by a flat slope, a hook against the position or the opposite
+    cross, as ``assemble_signal`` does. NaNs never satisfy a condition. The
+    signal is int8 unless written into a given ``out``.
+    """
+    n = ha_close.shape[0]
+    if out is None:
+        out = np.empty(n, dtype=np.int8)
+    last = 0.0
+    prev_up = False
+    prev_dn = False
+    for i in range(n):
+        cross_up = False
+        cross_dn = False
+        slope = np.nan
+        color_bull = False
+        color_bear = False
+        if i >= 2:
+            g1 = tdi_green[i - 1]
+            g2 = tdi_green[i - 2]
+            r1 = tdi_red[i - 1]
+            r2 = tdi_red[i - 2]
+            cross_up = g2 < r2 and g1 >= r1
+            cross_dn = g2 > r2 and g1 <= r1
+            slope = g1 - g2
+            bull_1 = ha_close[i - 1] > ha_open[i - 1]
+            bear_1 = ha_close[i - 1] < ha_open[i - 1]
+            bull_2 = ha_close[i - 2] > ha_open[i - 2]
+            bear_2 = ha_close[i - 2] < ha_open[i - 2]
+            color_bull = bull_1 and bear_2
+            color_bear = bear_1 and bull_2
+        abs_slope = abs(slope)
+        weak_zone = abs_slope >= slope_flat and abs_slope < slope_strong
+
+        long_entry = ((cross_up or prev_up) and slope >= slope_strong and not weak_zone
+                      and color_bull and all_above[i])
+        short_entry = ((cross_dn or prev_dn) and slope <= -slope_strong and not weak_zone
+                       and color_bear and all_below[i])
+        if short_entry:
+            last = -1.0
+        elif long_entry:
+            last = 1.0
+
+        flat_now = abs_slope <= slope_flat
+        long_exit = flat_now or slope <= -slope_strong or cross_dn
+        short_exit = flat_now or slope >= slope_strong or cross_up
+        flat = (last == 1 and long_exit) or (last == -1 and short_exit)
+        out[i] = 0.0 if flat else last
+        prev_up = cross_up
+        prev_dn = cross_dn
+    return out
+
+
+
+@njit(cache=True)
+def shift1(x, out=None):
+    """
+    ``x`` lagged by one bar (``Series.shift(1)``): NaN first, then ``x[:-1]``.
+    Written into ``out`` when given.
+    """
+    if out is None:
+        out = np.empty(x.shape[0])
+    if x.shape[0]:
+        out[0] = np.nan
+        out[1:] = x[:-1]
+    return out
+
+
+@njit(cache=True)
+def sign_change(x, out=None):
+    """
+    True where ``x`` flips strictly between positive and negative from the
+    previous bar (``x * x.shift(1) < 0``), without a shifted copy or a multiply.
+    Zeros and NaNs never count as a flip; bar 0 is False. Written into ``out``
+    when given.
+    """
+    n = x.shape[0]
+    if out is None:
+        out = np.empty(n, dtype=np.bool_)
+    if n:
+        out[0] = False
+    for i in range(1, n):
+        out[i] = (x[i] > 0 and x[i - 1] < 0) or (x[i] < 0 and x[i - 1] > 0)
+    return out
+
+
+@njit(cache=True)
+def _crossed(prev, cur, level):
+    """Whether ``prev -> cur`` reaches ``level`` from strictly below or above."""
+    return (prev < level and cur >= level) or (prev > level and cur <= level)
+
+
+@njit(cache=True)
+def crosses(x, level, out=None):
+    """
+    True where ``x`` crosses ``level`` from either side since the previous bar:
+    ``(prev < level & x >= level) | (prev > level & x <= level)`` in one pass.
+    NaNs never count as a cross; bar 0 is False. Written into ``out`` when given.
+    """
+    n = x.shape[0]
+    if out is None:
+        out = np.empty(n, dtype=np.bool_)
+    if n:
+        out[0] = False
+    for i in range(1, n):
+        out[i] = _crossed(x[i - 1], x[i], level)
+    return out
+
+
+@njit(cache=True)
+def crosses_series(a, b, direction, out=None):
+    """
+    True where ``a`` crosses ``b`` since the previous bar: from below
+    (``a_prev < b_prev & a >= b``) for ``direction > 0``, from above for
+    ``direction < 0``, either way for 0. NaNs never count as a cross; bar 0
+    is False. Written into ``out`` when given.
+    """
+    n = a.shape[0]
+    if out is None:
+        out = np.empty(n, dtype=np.bool_)
+    if n:
+        out[0] = False
+    for i in range(1, n):
+        up = a[i - 1] < b[i - 1] and a[i] >= b[i]
+        down = a[i - 1] > b[i - 1] and a[i] <= b[i]
+        if direction > 0:
+            out[i] = up
+        elif direction < 0:
+            out[i] = down
+        else:
+            out[i] = up or down
+    return out
+
+@njit(cache=True)
+def ffill_signal(signal, out=None):
+    """
+    Forward-fills NaNs in a -1/1 entry signal, 0 before the first entry
+    (``signal.ffill().fillna(0)`` in one pass). NaN only marks "no entry" on
+    the way in; the result is int8 unless written into a given ``out``.
+    """
+    if out is None:
+        out = np.empty(signal.shape[0], dtype=np.int8)
+    last = 0.0
+    for i in range(signal.shape[0]):
+        if not np.isnan(signal[i]):
+            last = signal[i]
+        out[i] = last
+    return out
+
+
+@njit(cache=True)
+def apply_time_exit(signal, max_bars, out=None):
+    """
+    ``ffill_signal(signal)`` flattened once a position has been held ``max_bars``
+    bars, in one pass.
+
+    A bar is an entry when it carries a value different from the bar before
+    (repeated same-side triggers do not restart the clock); the bar count since
+    the last entry is 0 on the entry bar. Int8 result unless written into a
+    given ``out``.
+    """
+    if out is None:
+        out = np.empty(signal.shape[0], dtype=np.int8)
+    last = 0.0
+    held = 0
+    prev = np.nan
+    for i in range(signal.shape[0]):
+        v = signal[i]
+        if not np.isnan(v) and (np.isnan(prev) or v != prev):
+            held = 0
+        else:
+            held += 1
+        if not np.isnan(v):
+            last = v
+        prev = v
+        out[i] = last if held < max_bars else 0
+    return out
+
+
+@njit(cache=True)
+def apply_exit(signal, flatten, out=None):
+    """
+    ``ffill_signal(signal)`` with bars where ``flatten`` is True set to 0, in one pass.
+
+    Matches ``ffill().fillna(0)`` followed by ``mask(flatten, 0)``: the exit only
+    flattens the bars it marks, the held entry is not cleared by it. Int8
+    result unless written into a given ``out``.
+    """
+    if out is None:
+        out = np.empty(signal.shape[0], dtype=np.int8)
+    last = 0.0
+    for i in range(signal.shape[0]):
+        if not np.isnan(signal[i]):
+            last = signal[i]
+        out[i] = 0.0 if flatten[i] else last
+    return out
+
+
+@njit(cache=True)
+def apply_side_exits(signal, long_exit, short_exit, flatten, out=None):
+    """
+    ``apply_exit`` with side-dependent exits, in one pass: a bar is flattened
+    when the held entry is long and ``long_exit`` is True, short and
+    ``short_exit`` is True, or ``flatten`` is True. Any of the three may be
+    None. The held entry resumes on the next bar. Int8 result unless written
+    into a given ``out``.
+    """
+    n = signal.shape[0]
+    if out is None:
+        out = np.empty(n, dtype=np.int8)
+    last = 0.0
+    for i in range(n):
+        if not np.isnan(signal[i]):
+            last = signal[i]
+        flat = False
+        if long_exit is not None:
+            flat = last == 1 and long_exit[i]
+        if short_exit is not None:
+            flat = flat or (last == -1 and short_exit[i])
+        if flatten is not None:
+            flat = flat or flatten[i]
+        out[i] = 0.0 if flat else last
+    return out
+
+
+# Grid-search batch kernels: one call evaluates a strategy for many parameter
+# sets on the same close array, parallel over the parameter sets. Outputs are
+# (n_params, n_bars) so each parameter set's series is a contiguous row. Signals
+# are int8 as in strat_apply, except EMACross's, which marks dropped rows with NaN.
+
+
+@njit(parallel=True, cache=True)
+def ema_cross_batch(emas, fast_rows, slow_rows):
+    """
+    EMACross's signal for each parameter set, from a table of precomputed EMAs:
+    ``emas[fast_rows[k]]`` / ``emas[slow_rows[k]]`` are set k's fast / slow EMA.
+    ``signal`` is NaN on the EMA warm-up rows EMACross drops.
+    """
+    n_params = fast_rows.shape[0]
+    n = emas.shape[1]
+    signal = np.empty((n_params, n))
+    for k in prange(n_params):
+        ema_fast = emas[fast_rows[k]]
+        ema_slow = emas[slow_rows[k]]
+        last = 0.0
+        for i in range(n):
+            f = ema_fast[i]
+            s = ema_slow[i]
+            if np.isnan(f) or np.isnan(s):
+                signal[k, i] = np.nan
+                continue
+            if f < s:
+                last = -1.0
+            elif f > s:
+                last = 1.0
+            signal[k, i] = last
+    return signal
+
+
+@njit(cache=True)
+def bollinger_reversion_signal(close, length, std, out=None):
+    """
+    BollingerReversion's signal in one pass: each bar's SMA / population-std
+    bands are computed as ``bbands_nb`` does and fed straight into the entry /
+    midline-exit state machine, without materialising the bands. Warm-up bands
+    count as 0, as with ``ta.bbands(..., fillna=0.0)``. Int8 result unless
+    written into a given ``out``.
+    """
+    n = close.shape[0]
+    if out is None:
+        out = np.empty(n, dtype=np.int8)
+    last = 0.0
+    diff_prev = np.nan
+    for i in range(n):
+        lo = 0.0
+        mid = 0.0
+        up = 0.0
+        if i >= length - 1:
+            start = i - length + 1
+            total = 0.0
+            has_nan = False
+            for j in range(start, i + 1):
+                if np.isnan(close[j]):
+                    has_nan = True
+                    break
+                total += close[j]
+            if not has_nan:
+                mean = total / length
+                ss = 0.0
+                for j in range(start, i + 1):
+                    d = close[j] - mean
+                    ss += d * d
+                deviation = std * np.sqrt(ss / length)
+                mid = mean
+                lo = mean - deviation
+                up = mean + deviation
+        c = close[i]
+        if c > up:
+            last = -1.0
+        elif c < lo:
+            last = 1.0
+        diff = c - mid
+        cross_midline = (diff > 0 and diff_prev < 0) or (diff < 0 and diff_prev > 0) or diff == 0
+        out[i] = 0.0 if cross_midline else last
+        diff_prev = diff
+    return out
+
+
+@njit(cache=True)
+def rsi_reversal_signal(rsi, lower, upper, midline, out=None):
+    """
+    RSIReversal in one pass over a precomputed RSI: short above ``upper``, long
+    below ``lower``, held and flattened on bars where the RSI crosses
+    ``midline``. The signal is int8 unless written into a given ``out``.
+    """
+    n = rsi.shape[0]
+    if out is None:
+        out = np.empty(n, dtype=np.int8)
+    last = 0.0
+    for i in range(n):
+        r = rsi[i]
+        if r > upper:
+            last = -1.0
+        elif r < lower:
+            last = 1.0
+        cross_midline = i > 0 and _crossed(rsi[i - 1], r, midline)
+        out[i] = 0.0 if cross_midline else last
+    return out
+
+
+@njit(parallel=True, cache=True)
+def bollinger_reversion_batch(close, lengths, stds):
+    """BollingerReversion's signal for each ``(lengths[k], stds[k])``."""
+    n_params = lengths.shape[0]
+    signal = np.empty((n_params, close.shape[0]), dtype=np.int8)
+    for k in prange(n_params):
+        bollinger_reversion_signal(close, lengths[k], stds[k], signal[k])
+    return signal
+
+
+@njit(parallel=True, cache=True)
+def rsi_reversal_batch(rsis, rows, lowers, uppers, midlines):
+    """RSIReversal's signal for each parameter set; set k reads the RSI ``rsis[rows[k]]``."""
+    n_params = rows.shape[0]
+    signal = np.empty((n_params, rsis.shape[1]), dtype=np.int8)
+    for k in prange(n_params):
+        rsi_reversal_signal(rsis[rows[k]], lowers[k], uppers[k], midlines[k], signal[k])
+    return signal
+
+
+@njit(parallel=True, cache=True)
+def macd_reversal_batch(macds, signal_lines, rows, zero_lines):
+    """
+    MACDReversal's signal for each parameter set; set k reads the MACD and signal
+    lines ``macds[rows[k]]`` / ``signal_lines[rows[k]]``.
+    """
+    n_params = rows.shape[0]
+    n = macds.shape[1]
+    signal = np.empty((n_params, n), dtype=np.int8)
+    for k in prange(n_params):
+        macd_line = macds[rows[k]]
+        signal_line = signal_lines[rows[k]]
+        zero_line = zero_lines[k]
+        last = 0.0
+        for i in range(n):
+            m = macd_line[i]
+            if m < signal_line[i]:
+                last = -1.0
+            elif m > signal_line[i]:
+                last = 1.0
+            cross_zero = i > 0 and _crossed(macd_line[i - 1], m, zero_line)
+            signal[k, i] = 0.0 if cross_zero else last
+    return signal
+
+
+@njit(parallel=True, cache=True)
+def donchian_table(high, low, windows):
+    """
+    Previous-bar Donchian channels for each window: row k of ``(highs, lows)``
+    is ``rolling_max(high, windows[k], 1)`` / ``rolling_min(low, windows[k], 1)``.
+    """
+    n_windows = windows.shape[0]
+    n = high.shape[0]
+    highs = np.empty((n_windows, n))
+    lows = np.empty((n_windows, n))
+    for k in prange(n_windows):
+        highs[k] = rolling_max(high, windows[k], 1)
+        lows[k] = rolling_min(low, windows[k], 1)
+    return highs, lows
+
+
+@njit(parallel=True, cache=True)
+def turtle_batch(close, highs, lows, entry_rows, exit_rows):
+    """
+    TurtleTradingSystem's signal for each parameter set, from a ``donchian_table``:
+    set k enters on breaks of channel row ``entry_rows[k]`` (the downside break
+    wins a tie) and flattens a held long (short) on bars where close breaks the
+    low (high) of row ``exit_rows[k]``, as ``assemble_signal`` does.
+    """
+    n_params = entry_rows.shape[0]
+    n = close.shape[0]
+    signal = np.empty((n_params, n), dtype=np.int8)
+    for k in prange(n_params):
+        entry_high = highs[entry_rows[k]]
+        entry_low = lows[entry_rows[k]]
+        exit_high = highs[exit_rows[k]]
+        exit_low = lows[exit_rows[k]]
+        last = 0.0
+        for i in range(n):
+            c = close[i]
+            if c < entry_low[i]:
+                last = -1.0
+            elif c > entry_high[i]:
+                last = 1.0
+            flat = (last == 1 and c < exit_low[i]) or (last == -1 and c > exit_high[i])
+            signal[k, i] = 0.0 if flat else last
+    return signal
+
+
+@njit(parallel=True, cache=True)
+def bbkc_squeeze_batch(close, bb_lowers, bb_bases, bb_uppers, bb_rows, k_mas, k_range_mas, k_rows, k_mults, sides):
+    """
+    BBKCSqueezeBreakout's signal for each parameter set; set k reads the bands
+    ``bb_*[bb_rows[k]]`` and the Keltner lines ``k_mas[k_rows[k]]`` /
+    ``k_range_mas[k_rows[k]]``.
+    """
+    n_params = bb_rows.shape[0]
+    signal = np.empty((n_params, close.shape[0]), dtype=np.int8)
+    for k in prange(n_params):
+        b = bb_rows[k]
+        kc = k_rows[k]
+        bbkc_squeeze_signal(
+            close, bb_lowers[b], bb_bases[b], bb_uppers[b], k_mas[kc], k_range_mas[kc],
+            k_mults[k], sides[k], signal[k],
+        )
+    return signal
+
+
+def warm_kernels():
+    """
+    Compiles (or loads from the on-disk cache) every kernel with the argument
+    types the strategies pass, so the first backtest or grid-search batch does
+    not pay the JIT cost. Not run at import; the Docker build calls it to fill
+    NUMBA_CACHE_DIR, and kernels not warmed here compile on first use.
+    """
+    warm = 100.0 + np.sin(np.arange(40.0))
+    n = warm.shape[0]
+    _, _, dirs = chandelier_loop(warm, warm - 1.0, warm + 1.0)
+    rolling_extrema(warm, 5)
+    rolling_max(warm, 5)
+    rolling_min(warm, 5)
+    rolling_max(warm, 5, 1)
+    rolling_min(warm, 5, 1)
+    donchian_channels(warm, warm, 5, 3)
+    ichimoku_signal(warm + 1.0, warm - 1.0, warm, 3, 5, 8, 5)
+    flags = warm > ema_nb(warm, 5)
+    newsom_entries(warm, warm, warm, warm, warm, dirs, flags, flags)
+    newsom_entries(warm, warm, warm, warm, warm, dirs, flags, flags, np.empty(n))
+    vol_filter_nb(warm, warm / 100.0, 5)
+    vol_filter_nb(warm, warm / 100.0, 5, np.empty(n), np.empty(n, dtype=np.bool_))
+    rsi_nb(warm, 5)
+    atr_nb(warm + 1.0, warm - 1.0, warm, 5)
+    true_range_nb(warm + 1.0, warm - 1.0, warm)
+    bbkc_squeeze_signal(warm, warm - 1.0, warm, warm + 1.0, warm, warm / 100.0, 1.5, 1.0)
+    bbands_nb(warm, 5, 2.0, 0)
+    macd_nb(warm, 3, 6, 2)
+    ha_open, ha_close, above, below = heikin_ashi_trend(warm, warm + 1.0, warm - 1.0, warm, 5, 2)
+    tdi_ha_signal(ha_open, ha_close, above, below, warm, warm[::-1].copy(), 1.0, 0.2)
+    pairs_zscore(np.log(warm), np.log(warm[::-1].copy()), 5)
+    shift1(warm)
+    shift1(warm, np.empty(n))
+    shift1(dirs, np.empty(n))
+    sign_change(warm)
+    sign_change(warm, np.empty(n, dtype=np.bool_))
+    crosses(warm, 100.0)
+    crosses(warm, 0.0)
+    crosses_series(warm, warm[::-1].copy(), 1)
+    ffill_signal(warm)
+    apply_exit(warm, flags)
+    apply_exit(warm, flags, np.empty(n, dtype=np.int8))
+    apply_time_exit(warm, 5.0)
+    apply_side_exits(warm, flags, flags, None)
+    apply_side_exits(warm, flags, None, None)
+    apply_side_exits(warm, None, None, flags)
+    ints = np.array([3, 5], dtype=np.int64)
+    floats = np.array([1.5, 2.0])
+    table = np.vstack((warm, warm))
+    rows = np.array([0, 1], dtype=np.int64)
+    ema_cross_batch(table, rows, rows[::-1].copy())
+    bollinger_reversion_signal(warm, 5, 2.0)
+    rsi_reversal_signal(warm, 30.0, 70.0, 50.0)
+    bollinger_reversion_batch(warm, ints, floats)
+    rsi_reversal_batch(table, rows, floats * 20.0, floats * 40.0, floats * 25.0)
+    macd_reversal_batch(table, table, rows, floats)
+    highs, lows = donchian_table(warm + 1.0, warm - 1.0, ints)
+    turtle_batch(warm, highs, lows, rows, rows[::-1].copy())
+    bbkc_squeeze_batch(warm, table, table, table, rows, table, table, rows, floats, floats)
@@ -11,9 +11,16 @@ analysis capabilities.
 import pandas as pd
 import numpy as np
 
+from ._numba_kernels import apply_side_exits, ffill_signal
+
 
 class StrategyTemplate:
     """Base class to allow dynamic parameter passing for Grid Search."""
+
+    # Whether strat_apply may write into the frame it is given. Strategies that
+    # only read it and return a new frame (e.g. via df.assign) set this to False,
+    # letting the optimizer pass its cached data without a defensive copy.
+    mutates_input = True
     
     def __init__(self, **params):
         self.params = params
@@ -27,6 +34,69 @@ class StrategyTemplate:
     def strat_apply(self, df):
         raise NotImplementedError("Each strategy must implement strat_apply().")
 
+    @staticmethod
+    def scratch(buffers, name, n, dtype=np.float64):
+        """
+        Returns a length-n working array for strat_apply.
+
+        Strategies whose strat_apply takes a ``buffers`` dict keep their working
+        arrays there, so repeated calls on the same data (e.g. grid search) reuse
+        them instead of reallocating. Contents are left as-is; callers overwrite
+        them. Without a dict a fresh array is returned.
+
+        :param buffers: Dict shared across calls on the same data, or None.
+        :param name: Key of the working array.
+        :param n: Required length.
+        :param dtype: Array dtype.
+        :return: np.ndarray of shape (n,).
+        """
+        if buffers is None:
+            return np.empty(n, dtype=dtype)
+        arr = buffers.get(name)
+        if arr is None or arr.shape != (n,) or arr.dtype != dtype:
+            arr = buffers[name] = np.empty(n, dtype=dtype)
+        return arr
+
+    @staticmethod
+    def as_f64(values):
+        """
+        Returns a Series or array as a C-contiguous float64 ndarray for the
+        compiled kernels, without copying when it already is one.
+
+        Columns of a frame built from a 2-D array are strided views; these are
+        copied once here rather than handed to Numba as non-contiguous arrays.
+        """
+        return np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+
+    @staticmethod
+    def assemble_signal(conditions, values, long_exit=None, short_exit=None, exit_condition=None):
+        """
+        Builds a held position signal from entry conditions in one pass.
+
+        Entries come from ``np.select(conditions, values)``, so where several
+        conditions hold the first one listed wins. The entries are forward filled
+        (flat before the first one). ``long_exit`` / ``short_exit`` flatten bars
+        where the held position is long / short, ``exit_condition`` flattens any
+        bar; the held entry resumes on the next bar, as with
+        ``ffill().fillna(0)`` -> ``mask(exit, 0)`` -> ``ffill()``.
+
+        :param conditions: List of boolean arrays/Series aligned with the data.
+        :param values: Signal value (1, -1 or 0) for each condition.
+        :param long_exit: Optional boolean array; exits held longs.
+        :param short_exit: Optional boolean array; exits held shorts.
+        :param exit_condition: Optional boolean array; exits any held position.
+        :return: np.ndarray of int8 signals.
+        """
+        entries = np.select(conditions, values, default=np.nan).astype(np.float64)
+        if long_exit is None and short_exit is None and exit_condition is None:
+            return ffill_signal(entries)
+
+        # Holding, the side-dependent exits and the flattening in one compiled pass
+        def as_mask(condition):
+            return None if condition is None else np.ascontiguousarray(condition, dtype=np.bool_)
+
+        return apply_side_exits(entries, as_mask(long_exit), as_mask(short_exit), as_mask(exit_condition))
+
     def get_resampled_data(self, df: pd.DataFrame, rule: str) -> pd.DataFrame:
         """
         Resamples the input DataFrame to a higher timeframe.
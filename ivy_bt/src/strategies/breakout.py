@@ -9,10 +9,14 @@ typically use price extremes, channels, or volatility to detect breakouts.
 
 import pandas as pd
 import numpy as np
-import pandas_ta as ta
 import logging
 
 from .base import StrategyTemplate
+from ._numba_kernels import (
+    bbkc_squeeze_batch, bbkc_squeeze_signal, donchian_channels, donchian_table, ffill_signal,
+    ichimoku_signal, rolling_max, rolling_min, shift1, turtle_batch,
+)
+from ._indicator_cache import cached_bbands, cached_ema, cached_table, cached_true_range
 
 
 class TurtleTradingSystem(StrategyTemplate):
@@ -23,6 +27,7 @@ class TurtleTradingSystem(StrategyTemplate):
     Enters short when price breaks below the lowest low of N periods.
     Exits on the opposite extreme of a shorter period.
     """
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -31,6 +36,25 @@ class TurtleTradingSystem(StrategyTemplate):
             'exit_window': np.arange(5, 50, 2)
         }
 
+    @classmethod
+    def batch_apply(cls, df, param_sets):
+        """
+        Equivalent of ``[cls(**p).strat_apply(df.copy()) for p in param_sets]``
+        with every parameter set evaluated in one parallel kernel call.
+        """
+        entry_windows = np.array([int(p.get('entry_window', 20)) for p in param_sets], dtype=np.int64)
+        exit_windows = np.array([int(p.get('exit_window', 10)) for p in param_sets], dtype=np.int64)
+
+        # Channels depend on a single window, so each distinct entry / exit window
+        # is computed once and shared by every parameter set that uses it
+        windows = np.unique(np.concatenate([entry_windows, exit_windows]))
+        highs, lows = donchian_table(cls.as_f64(df['high']), cls.as_f64(df['low']), windows)
+        signal = turtle_batch(
+            cls.as_f64(df['close']), highs, lows,
+            np.searchsorted(windows, entry_windows), np.searchsorted(windows, exit_windows),
+        )
+        return [df.assign(signal=signal[k]) for k in range(len(param_sets))]
+
     def strat_apply(self, df):
         # 1. Parameter Extraction
         # System 1 defaults: Entry 20, Exit 10
@@ -39,44 +63,32 @@ class TurtleTradingSystem(StrategyTemplate):
         exit_window = self.params.get('exit_window', 10)
 
         # 2. Indicator Calculation (Donchian Channels)
-        # Shift(1) is critical to ensure we are trading the breakout of the PREVIOUS windows
-        df['entry_high'] = df['high'].shift(1).rolling(window=entry_window).max()
-        df['entry_low'] = df['low'].shift(1).rolling(window=entry_window).min()
-        
-        df['exit_high'] = df['high'].shift(1).rolling(window=exit_window).max()
-        df['exit_low'] = df['low'].shift(1).rolling(window=exit_window).min()
-
-        # 3. Signal Logic Initialization
-        df['signal'] = np.nan
+        # Channels cover the PREVIOUS bars (shift(1) before the rolling window), so we
+        # trade the breakout of the prior range; all four come from one compiled pass
+        entry_high, entry_low, exit_high, exit_low = donchian_channels(
+            self.as_f64(df['high']), self.as_f64(df['low']), int(entry_window), int(exit_window)
+        )
 
+        # 3. Signal Logic
         # 4. Entry Conditions (Breakouts)
-        long_entry = df['close'] > df['entry_high']
-        short_entry = df['close'] < df['entry_low']
-
-        df.loc[long_entry, 'signal'] = 1
-        df.loc[short_entry, 'signal'] = -1
-
-        # Initial forward fill to carry the directional bias
-        df['signal'] = df['signal'].ffill().fillna(0)
+        close = self.as_f64(df['close'])
+        long_entry = close > entry_high
+        short_entry = close < entry_low
 
         # 5. Exit Logic (Vectorized)
         # Long Exit: Price penetrates the low of the shorter exit window
-        long_exit = (df['signal'] == 1) & (df['close'] < df['exit_low'])
+        long_exit = close < exit_low
         # Short Exit: Price penetrates the high of the shorter exit window
-        short_exit = (df['signal'] == -1) & (df['close'] > df['exit_high'])
+        short_exit = close > exit_high
 
-        # Apply exits by masking current signals to 0 (Cash)
-        df['signal'] = df['signal'].mask(long_exit | short_exit, 0)
-
-        # 6. Final Persistence
-        # Ensure the exit state (0) persists until the next 20 or 55-day breakout
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        # Cleanup temporary columns to keep the DataFrame lean
-        df.drop(columns=['entry_high', 'entry_low', 'exit_low', 'exit_high'], 
-                inplace=True, errors='ignore')
+        # 6. Persistence
+        # Carry the directional bias, moving to Cash (0) on exit bars of the held side.
+        # The channels stay local, so only the signal is attached to a new frame.
+        signal = self.assemble_signal(
+            [short_entry, long_entry], [-1, 1], long_exit=long_exit, short_exit=short_exit
+        )
 
-        return df
+        return df.assign(signal=signal)
 
 
 class IchimokuCloudBreakout(StrategyTemplate):
@@ -86,6 +98,7 @@ class IchimokuCloudBreakout(StrategyTemplate):
     Trades based on price position relative to the Ichimoku Cloud,
     lagging span confirmation, and cloud color (bullish/bearish).
     """
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -96,83 +109,27 @@ class IchimokuCloudBreakout(StrategyTemplate):
             'displacement': np.arange(20, 31, 1)
         }
 
-    def strat_apply(self, df):
+    def strat_apply(self, df, buffers=None):
         # 1. Parameter Extraction
         tenkan = self.params.get('tenkan', 9)
         kijun = self.params.get('kijun', 26)
         senkou_b = self.params.get('senkou_b', 52)
         displacement = self.params.get('displacement', 26)
 
-        # 2. Indicator Calculation
-        # pandas_ta returns a tuple: (DataFrame with components, series)
-        # Components naming: ISA_9, ISB_26, ITS_9, IKS_26, ICS_26
-        ichi = ta.ichimoku(
-            df['high'], 
-            df['low'], 
-            df['close'], 
-            tenkan=tenkan, 
-            kijun=kijun, 
-            senkou_b=senkou_b, 
-            displacement=displacement
-        )[0]
-
-        # Mapping components based on pandas_ta dynamic naming
-        span_a = ichi[f'ISA_{tenkan}']
-        span_b = ichi[f'ISB_{kijun}']
-        lagging_span = ichi[f'ICS_{kijun}']
-
-        # The Cloud at the current price position
-        # ISA and ISB are projected forward by 'displacement'. We shift back to align with current price.
-        cloud_at_price_a = span_a.shift(displacement)
-        cloud_at_price_b = span_b.shift(displacement)
-        
-        cloud_top = np.maximum(cloud_at_price_a, cloud_at_price_b)
-        cloud_bottom = np.minimum(cloud_at_price_a, cloud_at_price_b)
-
-        # 3. Define Conditions
-        # Price relation to cloud
-        price_above_cloud = df['close'] > cloud_top
-        price_below_cloud = df['close'] < cloud_bottom
-
-        # Lagging span relation to cloud at its historical position
-        # We compare the lagging span (shifted back) to the cloud that existed back then
-        lagging_above_cloud = lagging_span > cloud_top.shift(displacement)
-        lagging_below_cloud = lagging_span < cloud_bottom.shift(displacement)
-
-        # Future cloud (the projected span currently being plotted)
-        future_cloud_bullish = span_a > span_b
-        future_cloud_bearish = span_a < span_b
-
-        # 4. Signal Logic
-        df['signal'] = np.nan
-
-        long_condition = (
-            price_above_cloud & 
-            lagging_above_cloud & 
-            future_cloud_bullish
-        )
-        
-        short_condition = (
-            price_below_cloud & 
-            lagging_below_cloud & 
-            future_cloud_bearish
+        # 2-4. Tenkan/Kijun/Senkou midprices, the projected cloud, the price and
+        # lagging span conditions and the held signal in one compiled pass (see
+        # ichimoku_signal; the lines are built as ta.ichimoku builds them)
+        signal = ichimoku_signal(
+            self.as_f64(df['high']), self.as_f64(df['low']), self.as_f64(df['close']),
+            int(tenkan), int(kijun), int(senkou_b), int(displacement),
+            self.scratch(buffers, 'signal', len(df), np.int8),
         )
 
-        # Exit condition: price returns inside the cloud boundaries
-        exit_condition = (df['close'] <= cloud_top) & (df['close'] >= cloud_bottom)
-
-        # Apply logic
-        df.loc[long_condition, 'signal'] = 1
-        df.loc[short_condition, 'signal'] = -1
-        df.loc[exit_condition, 'signal'] = 0
-
-        # 5. Final Persistence
-        # Ensure the strategy holds positions until a counter-signal or exit occurs
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        return df
+        return df.assign(signal=signal)
     
 class DailyHighLowBreakout(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -186,53 +143,51 @@ class DailyHighLowBreakout(StrategyTemplate):
         hold_days = self.params.get('hold_days', 5)
 
         # 2. Indicator Calculation (Daily Levels)
+        # Kept as local arrays; only the signal is attached to the returned frame
         daily = df.resample('D').agg({'high': 'max', 'low': 'min'}).shift(1)
         # FIX: Reindex method deprecation
-        df['prev_day_high'] = daily['high'].reindex(df.index).ffill()
-        df['prev_day_low'] = daily['low'].reindex(df.index).ffill()
+        prev_day_high = self.as_f64(daily['high'].reindex(df.index).ffill())
+        prev_day_low = self.as_f64(daily['low'].reindex(df.index).ffill())
 
         # 3. Entry Signal Generation
-        df['entry_sig'] = np.nan
-        
-        long_trigger = (df['close'] > df['prev_day_high']) & (df['close'].shift(1) <= df['prev_day_high'].shift(1))
-        short_trigger = (df['close'] < df['prev_day_low']) & (df['close'].shift(1) >= df['prev_day_low'].shift(1))
+        close = self.as_f64(df['close'])
+        close_prev = shift1(close)
+        long_trigger = (close > prev_day_high) & (close_prev <= shift1(prev_day_high))
+        short_trigger = (close < prev_day_low) & (close_prev >= shift1(prev_day_low))
 
+        entry_sig = np.full(len(df), np.nan)
         if not reversal:
-            df.loc[long_trigger, 'entry_sig'] = 1
-            df.loc[short_trigger, 'entry_sig'] = -1
+            entry_sig[long_trigger] = 1
+            entry_sig[short_trigger] = -1
         else:
-            df.loc[long_trigger, 'entry_sig'] = -1
-            df.loc[short_trigger, 'entry_sig'] = 1
+            entry_sig[long_trigger] = -1
+            entry_sig[short_trigger] = 1
 
         # 4. Handle Persistence and Time-Based Exit
-        # We need to know WHEN the entry happened to calculate the hold duration
-        df['signal'] = df['entry_sig'].ffill().fillna(0)
-        
-        # Identify the start of a new position (where signal changes and is non-zero)
-        df['new_pos'] = (df['signal'] != df['signal'].shift(1)) & (df['signal'] != 0)
-        
-        # Record the timestamp of the last entry
-        df['entry_time'] = df.index
-        df['entry_time'] = df['entry_time'].where(df['new_pos']).ffill()
-        
-        # Calculate time elapsed since entry
-        # If the difference between current index and entry_time >= hold_days, exit (set to 0)
-        hold_duration = (df.index - df['entry_time']).days
-        exit_condition = hold_duration >= hold_days
-        
-        # Apply the exit: mask the signal to 0 if we've held long enough
-        df['signal'] = df['signal'].mask(exit_condition, 0)
-
-        # Final ffill to maintain the "0" state after an exit until a new trigger occurs
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        # 5. Cleanup
-        drop_cols = ['prev_day_high', 'prev_day_low', 'entry_sig', 'new_pos', 'entry_time']
-        df.drop(columns=drop_cols, inplace=True, errors='ignore')
-
-        return df
+        # Hold the entry, then exit once it has been held for hold_days worth of bars.
+        # Bars per day come from the first session, so the hold is resolution agnostic.
+        signal = ffill_signal(entry_sig)
+        n = len(signal)
+        bars_per_day = int((df.index.date == df.index.date[0]).sum()) if n else 1
+        hold_bars = int(hold_days * bars_per_day)
+
+        # Bar index of the start of the current position (where the signal changes
+        # to a non-zero value), carried forward; -1 before the first entry
+        bar = np.arange(n, dtype=np.int64)
+        new_pos = signal != 0
+        new_pos[1:] &= signal[1:] != signal[:-1]
+        entry_bar = np.maximum.accumulate(np.where(new_pos, bar, -1))
+
+        # Apply the exit: flatten the signal once we've held long enough. The
+        # forward-filled signal has no gaps left, so the "0" state after an exit
+        # already holds until a new trigger occurs.
+        signal[(entry_bar >= 0) & (bar - entry_bar >= hold_bars)] = 0
+
+        return df.assign(signal=signal)
     
 class BBKCSqueezeBreakout(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -242,6 +197,32 @@ class BBKCSqueezeBreakout(StrategyTemplate):
             "trade_with_breakout": [True, False],
         }
 
+    @classmethod
+    def batch_apply(cls, df, param_sets):
+        """
+        Equivalent of ``[cls(**p).strat_apply(df.copy()) for p in param_sets]``
+        with every parameter set evaluated in one parallel kernel call.
+        """
+        def column(name, default, dtype):
+            return np.array([p.get(name, default) for p in param_sets], dtype=dtype)
+
+        # Bands per distinct (length, bb_mult) and Keltner lines per distinct
+        # length, each computed once (and cached across batches)
+        close = cls.as_f64(df['close'])
+        lengths = column('length', 20, np.int64)
+        bands, bb_rows = cached_table(
+            cached_bbands, close, np.column_stack([lengths, column('bb_mult', 2.0, np.float64)])
+        )
+        (k_mas,), k_rows = cached_table(cached_ema, close, lengths)
+        true_range = cached_true_range(cls.as_f64(df['high']), cls.as_f64(df['low']), close)
+        (k_range_mas,), _ = cached_table(cached_ema, true_range, lengths)
+
+        sides = np.where(column('trade_with_breakout', False, np.bool_), 1.0, -1.0)
+        signal = bbkc_squeeze_batch(
+            close, *bands, bb_rows, k_mas, k_range_mas, k_rows, column('k_mult', 1.5, np.float64), sides,
+        )
+        return [df.assign(signal=signal[k]) for k in range(len(param_sets))]
+
     def strat_apply(self, df):
         # 1. Parameter Extraction
         length = self.params.get('length', 20)
@@ -250,64 +231,25 @@ class BBKCSqueezeBreakout(StrategyTemplate):
         trade_with_breakout = self.params.get('trade_with_breakout', False)
 
         # 2. Indicator Calculation
-        # Bollinger Bands: [lower, mid, upper, bandwidth, percent]
-        bb = ta.bbands(df['close'], length=length, std=bb_mult)
-        df['bb_lower'] = bb.iloc[:, 0]
-        df['bb_basis'] = bb.iloc[:, 1]
-        df['bb_upper'] = bb.iloc[:, 2]
-
-        # Keltner Channels
-        k_ma = ta.ema(df['close'], length=length)
-        k_tr = ta.true_range(df['high'], df['low'], df['close'])
-        k_range_ma = ta.ema(k_tr, length=length)
-        
-        df['k_upper'] = k_ma + (k_range_ma * k_mult)
-        df['k_lower'] = k_ma - (k_range_ma * k_mult)
-
-        # Squeeze Condition
-        df['is_squeeze'] = (df['bb_upper'] <= df['k_upper']) & (df['bb_lower'] >= df['k_lower'])
-
-        # 3. Signal Logic
-        df['signal'] = np.nan
-
-        # Entry Conditions: Squeeze + Price Breakout
-        upside_break = (df['is_squeeze']) & (df['close'] > df['bb_upper'])
-        dnside_break = (df['is_squeeze']) & (df['close'] < df['bb_lower'])
-
-        # Apply Entries
-        if trade_with_breakout:
-            df.loc[upside_break, 'signal'] = 1
-            df.loc[dnside_break, 'signal'] = -1
-        else:
-            df.loc[upside_break, 'signal'] = -1
-            df.loc[dnside_break, 'signal'] = 1
-
-        # Initial Forward Fill to establish current position state for exit evaluation
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        # 4. Exit Logic (Vectorized Mean Reversion)
-        # Shifted values for crossover detection
-        close_shifted = df['close'].shift(1)
-        basis_shifted = df['bb_basis'].shift(1)
-
-        # Exit when price crosses back over the BB Basis (Mean Reversion)
-        long_exit = (df['signal'] == 1) & (close_shifted > basis_shifted) & (df['close'] <= df['bb_basis'])
-        short_exit = (df['signal'] == -1) & (close_shifted < basis_shifted) & (df['close'] >= df['bb_basis'])
-
-        # Apply Exits
-        df['signal'] = df['signal'].mask(long_exit | short_exit, 0)
-
-        # 5. Final Persistence
-        # Ensure the strategy holds the signal (or the flat state) until the next trigger
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        # Cleanup
-        cols_to_drop = ['bb_lower', 'bb_basis', 'bb_upper', 'k_upper', 'k_lower', 'is_squeeze']
-        df.drop(columns=[c for c in cols_to_drop if c in df.columns], inplace=True)
-
-        return df
+        # Bollinger Bands (population std) and the Keltner Channel's EMA and EMA of
+        # the true range, each cached across a sweep: only 'length' (and bb_mult
+        # for the bands) changes them, not k_mult or the trade direction
+        close = self.as_f64(df['close'])
+        bb_lower, bb_basis, bb_upper = cached_bbands(close, length, bb_mult)
+        k_ma = cached_ema(close, length)
+        true_range = cached_true_range(self.as_f64(df['high']), self.as_f64(df['low']), close)
+        k_range_ma = cached_ema(true_range, length)
+
+        # 3-5. Squeeze breakouts traded with or against the break, the basis-cross
+        # exit and the held signal in one compiled pass (see bbkc_squeeze_signal)
+        side = 1.0 if trade_with_breakout else -1.0
+        signal = bbkc_squeeze_signal(close, bb_lower, bb_basis, bb_upper, k_ma, k_range_ma, float(k_mult), side)
+
+        return df.assign(signal=signal)
     
 class ChannelBreakoutStrategy(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -325,46 +267,38 @@ class ChannelBreakoutStrategy(StrategyTemplate):
         m_short_exit = self.params.get('m_short_exit', 10)
 
         # 2. Indicator Calculation (Donchian Channels)
-        # Using shifted rolling windows to avoid look-ahead bias
-        df['long_entry_thresh'] = df['high'].shift(1).rolling(window=y_long_entry).max()
-        df['long_exit_thresh'] = df['low'].shift(1).rolling(window=x_long_exit).min()
+        # Windows end at the previous bar (lag 1, no shifted copy) to avoid look-ahead bias
+        high = self.as_f64(df['high'])
+        low = self.as_f64(df['low'])
+        long_entry_thresh = rolling_max(high, int(y_long_entry), 1)
+        long_exit_thresh = rolling_min(low, int(x_long_exit), 1)
         
-        df['short_entry_thresh'] = df['low'].shift(1).rolling(window=n_short_entry).min()
-        df['short_exit_thresh'] = df['high'].shift(1).rolling(window=m_short_exit).max()
+        short_entry_thresh = rolling_min(low, int(n_short_entry), 1)
+        short_exit_thresh = rolling_max(high, int(m_short_exit), 1)
 
         # 3. Signal Logic: Entries
-        df['signal'] = np.nan
-
-        long_entry_cond = df['high'] >= df['long_entry_thresh']
-        short_entry_cond = df['low'] <= df['short_entry_thresh']
-
-        df.loc[long_entry_cond, 'signal'] = 1
-        df.loc[short_entry_cond, 'signal'] = -1
-
-        # Forward fill to establish the state for exit logic
-        df['signal'] = df['signal'].ffill().fillna(0)
+        long_entry_cond = high >= long_entry_thresh
+        short_entry_cond = low <= short_entry_thresh
 
         # 4. Signal Logic: Exits
         # Long Exit: Price hits the lower channel boundary while in a Long position
-        long_exit_cond = (df['signal'] == 1) & (df['low'] <= df['long_exit_thresh'])
+        long_exit_cond = low <= long_exit_thresh
         
         # Short Exit: Price hits the upper channel boundary while in a Short position
-        short_exit_cond = (df['signal'] == -1) & (df['high'] >= df['short_exit_thresh'])
-
-        # Apply Exit (Move to Cash)
-        df.loc[long_exit_cond | short_exit_cond, 'signal'] = 0
+        short_exit_cond = high >= short_exit_thresh
 
-        # 5. Final Persistence
-        # Re-apply ffill to ensure the '0' (Cash) state is held until the next breakout
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # 5. Persistence
+        # Hold entries, moving to Cash (0) on exits until the next breakout
+        signal = self.assemble_signal(
+            [short_entry_cond, long_entry_cond], [-1, 1],
+            long_exit=long_exit_cond, short_exit=short_exit_cond,
+        )
 
-        # Cleanup
-        drop_cols = ['long_entry_thresh', 'long_exit_thresh', 'short_entry_thresh', 'short_exit_thresh']
-        df.drop(columns=[c for c in drop_cols if c in df.columns], inplace=True)
-
-        return df
+        return df.assign(signal=signal)
 
 class NR7RangeBreakout(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -377,45 +311,33 @@ class NR7RangeBreakout(StrategyTemplate):
 
         # 2. Strategy Calculation (NR7 Identification)
         # Ensure standardized column names are used (high, low, close)
-        df['bar_range'] = df['high'] - df['low']
+        bar_range = self.as_f64(df['high']) - self.as_f64(df['low'])
         
         # Identify if current bar range is the minimum over the lookback window
-        df['is_nr7'] = df['bar_range'] == df['bar_range'].rolling(window=nr_window).min()
+        # (compiled O(n) rolling min, see rolling_min)
+        is_nr7 = bar_range == rolling_min(bar_range, int(nr_window))
         
         # Define Breakout Levels based on the NR7 bar
         # We use ffill() to maintain the levels until the next NR7 bar appears
-        df['nr7_high'] = df['high'].where(df['is_nr7']).ffill()
-        df['nr7_low'] = df['low'].where(df['is_nr7']).ffill()
+        nr7_high = df['high'].where(is_nr7).ffill().to_numpy()
+        nr7_low = df['low'].where(is_nr7).ffill().to_numpy()
         
         # 3. Vectorized Signal Logic
-        df['signal'] = np.nan
+        close = self.as_f64(df['close'])
+        close_prev = shift1(close)
 
         # Long: Current Close crosses above the High of the NR7 bar
-        long_condition = (
-            (df['close'] > df['nr7_high']) & 
-            (df['close'].shift(1) <= df['nr7_high'].shift(1))
-        )
+        long_condition = (close > nr7_high) & (close_prev <= shift1(nr7_high))
         
         # Short: Current Close crosses below the Low of the NR7 bar
-        short_condition = (
-            (df['close'] < df['nr7_low']) & 
-            (df['close'].shift(1) >= df['nr7_low'].shift(1))
-        )
+        short_condition = (close < nr7_low) & (close_prev >= shift1(nr7_low))
         
-        # Apply entry signals
-        df.loc[long_condition, 'signal'] = 1
-        df.loc[short_condition, 'signal'] = -1
-        
-        # 4. Final Persistence
-        # Apply .ffill() to ensure the strategy holds positions until a counter-signal
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        # 5. Cleanup
-        # Dropping temporary columns to keep the DataFrame clean for the engine
-        cols_to_drop = ['bar_range', 'is_nr7', 'nr7_high', 'nr7_low']
-        df.drop(columns=[c for c in cols_to_drop if c in df.columns], inplace=True)
+        # 4. Entry signals with persistence
+        # Hold positions until a counter-signal. The levels stay local, so only
+        # the signal is attached to a new frame.
+        signal = self.assemble_signal([short_condition, long_condition], [-1, 1])
 
-        return df
+        return df.assign(signal=signal)
     
 
 
@@ -473,8 +395,6 @@ class NewsNukeBreakout(StrategyTemplate):
         if not isinstance(df.index, pd.DatetimeIndex):
             df.index = pd.to_datetime(df.index)
 
-        df["signal"] = 0.0
-
         times = df.index
         opens = df["open"].to_numpy(dtype=float)
         highs = df["high"].to_numpy(dtype=float)
@@ -494,7 +414,7 @@ class NewsNukeBreakout(StrategyTemplate):
         # ----------------------------
         # 3) Pine-state variables
         # ----------------------------
-        sig = np.zeros(len(df), dtype=float)
+        sig = np.zeros(len(df), dtype=np.int8)
 
         # Pine vars: entryHigh/entryLow/isGreen/lastTradeDay (dayofmonth)
         entry_high = np.nan
@@ -623,5 +543,5 @@ class NewsNukeBreakout(StrategyTemplate):
 
             sig[i] = pos
 
-        df["signal"] = pd.Series(sig, index=df.index).fillna(0.0)
+        df["signal"] = sig
         return df
@@ -9,9 +9,10 @@ traditional trend/reversal/breakout categories.
 
 import pandas as pd
 import numpy as np
-import pandas_ta as ta
 
 from .base import StrategyTemplate
+from ._numba_kernels import heikin_ashi_trend, tdi_ha_signal
+from ._indicator_cache import cached_ema, cached_rsi
 
 
 class TradingMadeSimpleTDIHeikinAshi(StrategyTemplate):
@@ -22,6 +23,7 @@ class TradingMadeSimpleTDIHeikinAshi(StrategyTemplate):
     and momentum slope analysis for precise entry timing. Requires alignment
     of price action, TDI crossovers, and momentum strength.
     """
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -39,8 +41,7 @@ class TradingMadeSimpleTDIHeikinAshi(StrategyTemplate):
         # --- Required columns check (BacktestEngine standard: lowercase) ---
         req = {"open", "high", "low", "close"}
         if not req.issubset(set(map(str.lower, df.columns))):
-            df["signal"] = 0
-            return df
+            return df.assign(signal=0)
 
         # --- Parameter extraction ---
         ema_len = self.params.get("ema_len", 5)
@@ -59,93 +60,27 @@ class TradingMadeSimpleTDIHeikinAshi(StrategyTemplate):
         l = df["low"]
         c = df["close"]
 
-        # --- Initialize signal ---
-        df["signal"] = np.nan
-
         # --- Heikin Ashi candles (vectorized approximation for open) ---
-        ha_close = (o + h + l + c) / 4.0
-        ha_open = (o + c) / 2.0
-        ha_high = np.maximum.reduce([h, ha_open, ha_close])
-        ha_low = np.minimum.reduce([l, ha_open, ha_close])
-
-        ema = ta.ema(ha_close, ema_len)
-        ema_offset = ema.shift(ema_offset)
-
-        vola_vals = [ha_open, ha_close, ha_high, ha_low, ema_offset]
-
-        all_above_ema = np.minimum.reduce(vola_vals) == ema_offset
-        all_below_ema = np.maximum.reduce(vola_vals) == ema_offset
-
-        ha_bull = (ha_close > ha_open) 
-        ha_bear = (ha_close < ha_open) 
-
-        trend_set = (all_above_ema) | (all_below_ema)
-
-        # --- TDI (green/red lines only) ---
-        rsi = ta.rsi(c, length=tdi_rsi_len)
-        tdi_green = ta.ema(rsi, length=tdi_green_smooth)
-        tdi_red = ta.ema(tdi_green, length=tdi_red_smooth)
-
-        df["tdi_green"] = tdi_green
-        df["tdi_red"] = tdi_red
-
-        green_prev = tdi_green.shift(1)
-        red_prev = tdi_red.shift(1)
-
-        cross_up = (green_prev.shift(1) < red_prev.shift(1)) & (green_prev >= red_prev)
-        cross_dn = (green_prev.shift(1) > red_prev.shift(1)) & (green_prev <= red_prev)
-
-        # --- Momentum / "angle" proxy ---
-        green_slope = green_prev - tdi_green.shift(2)  # signal-setting bar proxy (t-1)
-        strong_up = green_slope >= slope_strong
-        strong_dn = green_slope <= -slope_strong
-        weak_zone = green_slope.abs().between(slope_flat, slope_strong, inclusive="left")
-
-        ha_body = (ha_close - ha_open).abs()
-
-        # --- HA color change in trade direction (signal-setting bar t-1) ---
-        ha_color_change_bull = ha_bull.shift(1) & ha_bear.shift(2)
-        ha_color_change_bear = ha_bear.shift(1) & ha_bull.shift(2)
-
-        # --- Entry timing: only candle #1 or #2 of the move ---
-        allow_long = cross_up | cross_up.shift(1)
-        allow_short = cross_dn | cross_dn.shift(1)
-
-        long_entry = (
-            allow_long
-            & strong_up
-            & (~weak_zone)
-            & ha_color_change_bull
-            & all_above_ema
+        # Candles, the EMA of HA close and whether each candle sits wholly above /
+        # below that EMA shifted by ema_offset, in one compiled pass (see
+        # heikin_ashi_trend) rather than reducing over lists of arrays
+        ha_open, ha_close, all_above_ema, all_below_ema = heikin_ashi_trend(
+            self.as_f64(o), self.as_f64(h), self.as_f64(l), self.as_f64(c), int(ema_len), int(ema_offset)
         )
 
-        short_entry = (
-            allow_short
-            & strong_dn
-            & (~weak_zone)
-            & ha_color_change_bear
-            & all_below_ema
+        # --- TDI (green/red lines only) ---
+        # RSI and its two smoothings only depend on their lengths; cached across a sweep
+        rsi = cached_rsi(self.as_f64(c), tdi_rsi_len)
+        tdi_green = cached_ema(rsi, tdi_green_smooth)
+        tdi_red = cached_ema(tdi_green, tdi_red_smooth)
+
+        # --- Entries, exits and holding in one compiled pass (see tdi_ha_signal) ---
+        # Entry (signal-setting bar t-1): TDI cross on candle #1 or #2 of the move,
+        # a strong green slope outside the weak zone, an HA colour change in the
+        # trade direction and the candle wholly beyond the shifted EMA.
+        # Exit: a flat slope, a hook against the position or the opposite cross.
+        signal = tdi_ha_signal(
+            ha_open, ha_close, all_above_ema, all_below_ema, tdi_green, tdi_red, slope_strong, slope_flat
         )
 
-        df.loc[long_entry, "signal"] = 1
-        df.loc[short_entry, "signal"] = -1
-
-        # --- Hold positions until exit / counter-signal ---
-        df["signal"] = df["signal"].ffill().fillna(0)
-
-        # --- Exit rules ---
-        green_slope_now = tdi_green.shift(1) - tdi_green.shift(2)
-
-        flat_now = green_slope_now.abs() <= slope_flat
-        hook_against_long = green_slope_now <= slope_strong * -1
-        hook_against_short = green_slope_now >= slope_strong
-
-        long_exit = (df["signal"] == 1) & (flat_now | hook_against_long | cross_dn)
-        short_exit = (df["signal"] == -1) & (flat_now | hook_against_short | cross_up)
-
-        df["signal"] = df["signal"].mask(long_exit | short_exit, 0)
-
-        # --- Final persistence ---
-        df["signal"] = df["signal"].ffill().fillna(0)
-
-        return df
\ No newline at end of file
+        return df.assign(tdi_green=tdi_green, tdi_red=tdi_red, signal=signal)
\ No newline at end of file
@@ -15,6 +15,7 @@ import logging
 import networkx as nx
 
 from .base import StrategyTemplate
+from ._numba_kernels import ffill_signal, pairs_zscore, shift1
 
 
 class PairsTrading(StrategyTemplate):
@@ -73,27 +74,16 @@ class PairsTrading(StrategyTemplate):
         z_exit = self.params.get('z_exit', 0.0)
         
         # 3. Pivot to Wide Format (Close Prices)
-        # Reset index to allow pivoting
-        df_reset = df.reset_index()
-        closes = df_reset.pivot(index='timestamp', columns='ticker', values='close')
+        # Unstacking the ticker level pivots without a reset_index copy of the frame
+        closes = df['close'].unstack(level='ticker')
         
         y = np.log(closes[ticker_y])
         x = np.log(closes[ticker_x])
         
-        # 4. Rolling Beta Calculation (Hedge Ratio)
-        # Beta = Cov(x, y) / Var(x)
-        rolling_cov = y.rolling(window=window).cov(x)
-        rolling_var = x.rolling(window=window).var()
-        beta = rolling_cov / rolling_var
-        
-        # 5. Spread Calculation
-        # Spread = Y - Beta * X
-        spread = y - (beta * x)
-        
-        # 6. Z-Score of Spread
-        spread_mean = spread.rolling(window=window).mean()
-        spread_std = spread.rolling(window=window).std()
-        z_score = (spread - spread_mean) / spread_std
+        # 4-6. Rolling Beta (Hedge Ratio) = Cov(x, y) / Var(x), Spread = Y - Beta * X
+        # and the spread's rolling Z-Score, in one compiled pass (see pairs_zscore)
+        beta, z_score = pairs_zscore(self.as_f64(x), self.as_f64(y), window)
+        z_score = pd.Series(z_score, index=closes.index)
         
         # 7. Signal Logic (Mean Reversion of Spread)
         # Long Spread (Buy Y, Sell X) when Z < -Entry
@@ -105,14 +95,14 @@ class PairsTrading(StrategyTemplate):
         exit_cond = abs(z_score) < z_exit
         
         # Initialize Signal Series for Spread
-        spread_signal = pd.Series(np.nan, index=spread.index)
+        spread_signal = pd.Series(np.nan, index=closes.index)
         
         spread_signal[long_spread] = 1
         spread_signal[short_spread] = -1
         spread_signal[exit_cond] = 0
         
-        # Forward fill signals
-        spread_signal = spread_signal.ffill().fillna(0)
+        # Forward fill signals (int8, one compiled pass)
+        spread_signal = pd.Series(ffill_signal(self.as_f64(spread_signal)), index=closes.index)
         
         # 8. Map Signals back to Individual Assets
         # If Spread Signal is 1 (Long Spread): Long Y (1), Short X (-1 * Beta? Or just -1?)
@@ -128,31 +118,20 @@ class PairsTrading(StrategyTemplate):
         # To strictly implement hedge ratio, we might need a 'hedge_ratio' column used by a custom Sizer.
         # For now, we will just use direction 1/-1.
         
-        # Initialize signal column in original DF
-        df['signal'] = 0.0
-        
-        # Create Series aligned with df index
-        # We need to map spread_signal (timestamp index) to df (Ticker, Timestamp)
-        
-        # Signal for Y
-        sig_y = spread_signal
-        # Signal for X (Opposite)
-        sig_x = -spread_signal
-        
-        # Update df
-        # We can use loc with MultiIndex slicing
-        idx = pd.IndexSlice
-        
         # Ensure sorting
         df = df.sort_index()
         
-        # Assign Y signals
-        # We map sig_y to the rows where ticker is ticker_y
-        # sig_y index is timestamp. 
-        df.loc[idx[ticker_y, :], 'signal'] = sig_y.values
-        
-        # Assign X signals
-        df.loc[idx[ticker_x, :], 'signal'] = sig_x.values
+        # Map spread_signal (timestamp index) to df (Ticker, Timestamp) by looking up
+        # each row's timestamp, then fill the whole column in one assignment:
+        # Y takes the spread signal, X the opposite, any other ticker stays 0
+        tickers_col = df.index.get_level_values('ticker')
+        spread_sig = spread_signal.reindex(df.index.get_level_values('timestamp')).to_numpy()
+        signal = np.zeros(len(df), dtype=np.int8)
+        mask_y = tickers_col == ticker_y
+        mask_x = tickers_col == ticker_x
+        signal[mask_y] = spread_sig[mask_y]
+        signal[mask_x] = -spread_sig[mask_x]
+        df['signal'] = signal
         
         # Optional: Store Hedge Ratio for advanced sizing
         # df.loc[idx[ticker_x, :], 'hedge_ratio'] = beta.values
@@ -173,6 +152,7 @@ class MarketRegimeSentimentFollower(StrategyTemplate):
     """
     # Flag to tell BacktestEngine to pass the full MultiIndex DataFrame
     is_portfolio_strategy = True
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -194,107 +174,112 @@ class MarketRegimeSentimentFollower(StrategyTemplate):
         z_threshold = self.params.get('z_threshold', 2.0)
 
         # 2. Extract SPY Regime (External Reference)
-        try:
-            # Assuming MultiIndex [ticker, timestamp] (standard from pandas.concat(keys=tickers))
-            # But in engine we created: [ticker, timestamp]
-            # df.xs('SPY', level='ticker') works.
-            
-            spy_data = df.xs('SPY', level='ticker')
-            # Standardize to lowercase 'open'/'close'
-            spy_prev_green = (spy_data['close'].shift(1) > spy_data['open'].shift(1))
-            spy_prev_red = (spy_data['close'].shift(1) < spy_data['open'].shift(1))
-            
-            # Map SPY sentiment back to the main dataframe
-            # We align on 'timestamp' which is the index of spy_data and level 1 of df
-            # Note: df index is (Ticker, Timestamp)
-            
-            # Reindexing spy series to match full index is tricky without resetting index
-            # Let's reset index for easy merging
-            df_reset = df.reset_index()
-            spy_green_mapped = spy_prev_green.reindex(df_reset['timestamp']).values
-            spy_red_mapped = spy_prev_red.reindex(df_reset['timestamp']).values
-            
-            df_reset['spy_green'] = spy_green_mapped
-            df_reset['spy_red'] = spy_red_mapped
-            
-            # Restore MultiIndex
-            df = df_reset.set_index(['ticker', 'timestamp'])
-            
-        except KeyError:
+        # Assuming MultiIndex [ticker, timestamp] (standard from pandas.concat(keys=tickers))
+        # SPY's rows are picked out of the open/close arrays with a ticker mask rather
+        # than df.xs, which would build a new DataFrame on every grid-search trial.
+        # Intermediate results stay in local arrays; only the signal is attached to
+        # the returned frame.
+        timestamps = df.index.get_level_values('timestamp')
+        tickers = df.index.get_level_values('ticker')
+        is_spy = tickers == 'SPY'
+        if not is_spy.any():
             logging.warning("SPY not found in universe. MarketRegimeSentimentFollower requires SPY.")
-            df['signal'] = 0
-            return df
+            return df.assign(signal=np.int8(0))
+
+        # Previous SPY bar's colour, per SPY timestamp
+        spy_open = shift1(df['open'].to_numpy(dtype=np.float64)[is_spy])
+        spy_close = shift1(df['close'].to_numpy(dtype=np.float64)[is_spy])
+        spy_times = timestamps[is_spy]
+        spy_prev_green = pd.Series(spy_close > spy_open, index=spy_times)
+        spy_prev_red = pd.Series(spy_close < spy_open, index=spy_times)
+
+        # Map SPY sentiment back to the main dataframe
+        # We align on 'timestamp' which is the index of the SPY series and level 1 of df.
+        # Reindexing against the timestamp level maps it row by row, with no
+        # reset_index / set_index round trip of the whole frame
+        spy_green = spy_prev_green.reindex(timestamps, fill_value=False).to_numpy(dtype=np.bool_)
+        spy_red = spy_prev_red.reindex(timestamps, fill_value=False).to_numpy(dtype=np.bool_)
 
         # 3. Indicator Calculation (Cross-Sectional Returns)
-        # Using vectorized pct_change within groups
+        # Previous bar's pct_change within each ticker, on ndarrays rather than a
+        # Python callable per group: rows are stably ordered by ticker, returns are
+        # taken over the whole column and each ticker's first one or two rows
+        # (which would straddle the previous ticker) are blanked.
         # Note: df is MultiIndex (Ticker, Timestamp)
-        df['prev_day_ret'] = df.groupby(level='ticker')['close'].transform(lambda x: x.pct_change().shift(1))
+        codes, _ = pd.factorize(tickers)
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        close = df['close'].to_numpy(dtype=np.float64)[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+
+        ret = np.empty_like(close)
+        ret[1:] = close[1:] / close[:-1] - 1
+        ret[starts] = np.nan
+        prev_day_ret = np.empty_like(ret)
+        prev_day_ret[1:] = ret[:-1]
+        prev_day_ret[starts] = np.nan
+        # Back to the frame's row order
+        unsorted = np.empty_like(prev_day_ret)
+        unsorted[order] = prev_day_ret
+        prev_day_ret = unsorted
 
         # 4. Dynamic Entry Time Detection
-        df_times = df.index.get_level_values('timestamp')
-        available_times = df_times.strftime('%H:%M').unique()
+        # Times of day as integer minutes, so no bar is formatted to a string
+        minute_of_day = timestamps.hour.to_numpy() * 60 + timestamps.minute.to_numpy()
+        available_times = pd.unique(minute_of_day)  # in order of first appearance
         
-        actual_entry_time = entry_time_str if entry_time_str in available_times else available_times[0]
-        is_entry_time = df_times.strftime('%H:%M') == actual_entry_time
+        try:
+            hours, minutes = entry_time_str.split(':')
+            entry_minute = int(hours) * 60 + int(minutes)
+        except ValueError:
+            entry_minute = None
+        actual_entry_time = entry_minute if entry_minute in available_times else available_times[0]
+        is_entry_time = minute_of_day == actual_entry_time
 
         # 5. Signal Logic - Selection
-        df['signal'] = np.nan
+        # Ranks / z-scores exist only for entry-time rows, so they are computed on
+        # those rows and written into full-length masks by position (no label
+        # alignment against the MultiIndex)
+        entry_rets = pd.Series(prev_day_ret[is_entry_time], index=df.index[is_entry_time])
+        by_time = entry_rets.groupby(level='timestamp')
+        full_long_mask = np.zeros(len(df), dtype=np.bool_)
+        full_short_mask = np.zeros(len(df), dtype=np.bool_)
         
         if selection_mode == 'fixed':
-            df['rank_high'] = df[is_entry_time].groupby(level='timestamp')['prev_day_ret'].rank(ascending=False)
-            df['rank_low'] = df[is_entry_time].groupby(level='timestamp')['prev_day_ret'].rank(ascending=True)
-            long_eligible = df['rank_high'] <= top_n
-            short_eligible = df['rank_low'] <= top_n
+            full_long_mask[is_entry_time] = by_time.rank(ascending=False).to_numpy() <= top_n
+            full_short_mask[is_entry_time] = by_time.rank(ascending=True).to_numpy() <= top_n
         else:
             # Statistical Significance (Z-Score)
-            z_score_func = lambda x: (x - x.mean()) / x.std() if len(x) > 1 else 0
-            df['z_score'] = df[is_entry_time].groupby(level='timestamp')['prev_day_ret'].transform(z_score_func)
-            long_eligible = df['z_score'] >= z_threshold
-            short_eligible = df['z_score'] <= -z_threshold
+            # Cross-sectional z-score per timestamp from the built-in group reducers,
+            # not a Python callable per group; a lone ticker scores 0
+            z_score = (entry_rets - by_time.transform('mean')) / by_time.transform('std')
+            z_score = z_score.where(by_time.transform('size') > 1, 0).to_numpy()
+            full_long_mask[is_entry_time] = z_score >= z_threshold
+            full_short_mask[is_entry_time] = z_score <= -z_threshold
 
         # 6. Signal Assignment (Trend Following vs Counter-Trend)
-        # Fill boolean columns for alignment
-        # We need to ensure long_eligible aligns with the full DF, but it only exists for entry_times
-        # We can create a mask on the full DF
-        
-        # Initialize masks
-        full_long_mask = pd.Series(False, index=df.index)
-        full_short_mask = pd.Series(False, index=df.index)
-        
-        # Assign True where conditions met (only at is_entry_time rows)
-        full_long_mask.loc[long_eligible.index] = long_eligible
-        full_short_mask.loc[short_eligible.index] = short_eligible
-
         if trade_with_spy:
             # SPY Green -> Long Leaders; SPY Red -> Short Laggards
-            long_cond = (is_entry_time) & (df['spy_green'] == True) & full_long_mask
-            short_cond = (is_entry_time) & (df['spy_red'] == True) & full_short_mask
+            long_cond = is_entry_time & spy_green & full_long_mask
+            short_cond = is_entry_time & spy_red & full_short_mask
         else:
             # Counter-trend logic
-            short_cond = (is_entry_time) & (df['spy_green'] == True) & full_long_mask
-            long_cond = (is_entry_time) & (df['spy_red'] == True) & full_short_mask
+            short_cond = is_entry_time & spy_green & full_long_mask
+            long_cond = is_entry_time & spy_red & full_short_mask
 
-        df.loc[long_cond, 'signal'] = 1
-        df.loc[short_cond, 'signal'] = -1
+        signal = pd.Series(np.select([short_cond, long_cond], [-1, 1], default=np.nan), index=df.index)
 
         # 7. Persistence Logic (Resolution Agnostic Holding Period)
         # Identify bars per day using the first ticker in the index
-        sample_ticker = df.index.get_level_values('ticker')[0]
-        ticker_df = df.xs(sample_ticker, level='ticker')
-        bars_per_day = len(ticker_df[ticker_df.index.date == ticker_df.index.date[0]])
+        sample_dates = timestamps[tickers == tickers[0]].date
+        bars_per_day = int((sample_dates == sample_dates[0]).sum())
         total_hold_bars = int(holding_period * bars_per_day)
 
         # Forward fill to hold position for the specific duration
-        df['signal'] = df.groupby(level='ticker')['signal'].ffill(limit=total_hold_bars - 1)
+        signal = signal.groupby(level='ticker').ffill(limit=total_hold_bars - 1)
         
         # Final cleanup and persistence
-        df['signal'] = df['signal'].fillna(0)
-        
-        # Remove temporary calculation columns
-        drop_cols = ['prev_day_ret', 'rank_high', 'rank_low', 'z_score', 'spy_green', 'spy_red']
-        df = df.drop(columns=[c for c in drop_cols if c in df.columns], errors='ignore')
-
-        return df
+        return df.assign(signal=signal.fillna(0).astype(np.int8))
 
 
 class ClusterMeanReversion(StrategyTemplate):
@@ -334,9 +319,8 @@ class ClusterMeanReversion(StrategyTemplate):
 
         # 2. Pivot to Wide Format (Close Prices)
         # Note: df is MultiIndex (Ticker, Timestamp)
-        df_reset = df.reset_index()
-        # Pivot: Index=Timestamp, Columns=Ticker
-        closes = df_reset.pivot(index='timestamp', columns='ticker', values='close')
+        # Unstack: Index=Timestamp, Columns=Ticker
+        closes = df['close'].unstack(level='ticker')
 
         # 3. Correlation & Clustering (Perform once on the full dataset or rolling?)
         # The user snippet implies a static cluster based on the whole period correlation.
@@ -441,8 +425,10 @@ class ClusterMeanReversion(StrategyTemplate):
         raw_sig[short_cond] = -1
         raw_sig[exit_cond] = 0
         
-        # 2. Forward fill to propagate the state
-        cluster_signals = raw_sig.ffill().fillna(0)
+        # 2. Forward fill to propagate the state (int8, one compiled pass per ticker)
+        cluster_signals = pd.DataFrame(
+            {t: ffill_signal(self.as_f64(raw_sig[t])) for t in cluster_tickers}, index=raw_sig.index
+        )
         
         # Map back to full universe signals
         signals[cluster_tickers] = cluster_signals
@@ -472,6 +458,6 @@ class ClusterMeanReversion(StrategyTemplate):
         df['z_score'] = z_scores_stacked
         
         # Fill NaN signals with 0
-        df['signal'] = df['signal'].fillna(0)
+        df['signal'] = df['signal'].fillna(0).astype(np.int8)
         
         return df
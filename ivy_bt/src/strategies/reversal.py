@@ -12,6 +12,11 @@ import numpy as np
 import pandas_ta as ta
 
 from .base import StrategyTemplate
+from ._numba_kernels import (
+    apply_exit, bbands_nb, bollinger_reversion_batch, bollinger_reversion_signal, crosses, ema_nb,
+    macd_reversal_batch, rsi_nb, rsi_reversal_batch, rsi_reversal_signal,
+)
+from ._indicator_cache import cached_macd, cached_rsi, cached_table
 
 
 class BollingerReversion(StrategyTemplate):
@@ -21,6 +26,7 @@ class BollingerReversion(StrategyTemplate):
     Goes long when price touches the lower band and exits at the midline.
     Goes short when price touches the upper band and exits at the midline.
     """
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -29,52 +35,28 @@ class BollingerReversion(StrategyTemplate):
             'std': np.linspace(1.5, 3.5, 21)
         }
 
+    @classmethod
+    def batch_apply(cls, df, param_sets):
+        """
+        Equivalent of ``[cls(**p).strat_apply(df.copy()) for p in param_sets]``
+        with every parameter set evaluated in one parallel kernel call.
+        """
+        lengths = np.array([int(p.get('length', 20)) for p in param_sets], dtype=np.int64)
+        stds = np.array([float(p.get('std', 2.0)) for p in param_sets], dtype=np.float64)
+        signal = bollinger_reversion_batch(cls.as_f64(df['close']), lengths, stds)
+        return [df.assign(signal=signal[k]) for k in range(len(param_sets))]
+
     def strat_apply(self, df):
         # 1. Parameter Extraction
         length = self.params.get('length', 20)
         std = self.params.get('std', 2.0)
 
-        # 2. Indicator Calculation
-        # ta.bbands returns a DataFrame with BBL, BBM, BBU, BBB, and BBP columns
-        bbands = ta.bbands(df['close']
-                           , length=length
-                           , lower_std=std
-                           , upper_std=std
-                           , fillna=0.0)
-        
-        # Accessing columns dynamically based on pandas-ta naming convention
-        # Robustly find columns by prefix to handle naming variations
-        lower_band = bbands[[c for c in bbands.columns if c.startswith('BBL')][0]]
-        upper_band = bbands[[c for c in bbands.columns if c.startswith('BBU')][0]]
-        mid_band = bbands[[c for c in bbands.columns if c.startswith('BBM')][0]]
-
-        # 3. Signal Logic
-        df['signal'] = np.nan
-
-        # Entry Logic
-        df.loc[df['close'] < lower_band, 'signal'] = 1   # Long when below lower band
-        df.loc[df['close'] > upper_band, 'signal'] = -1  # Short when above upper band
-
-        # 4. Persistence (Holding positions)
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # 2-5. Bands (SMA midline, population std, as ta.bbands, warm-up bars
+        # zero-filled), band-touch entries and the midline-cross exit, fused into
+        # one compiled pass (see bollinger_reversion_signal)
+        signal = bollinger_reversion_signal(self.as_f64(df['close']), int(length), float(std))
 
-        # 5. Exit Logic (Flatten at Midline)
-        # Vectorized crossover check: sign change in the difference
-        diff = df['close'] - mid_band
-        cross_midline = (diff * diff.shift(1) < 0) | (diff == 0)
-
-        flatten_condition = (
-            (df['signal'] != 0) &
-            (cross_midline)
-        )
-
-        # Apply the exit condition to return to Cash (0)
-        df['signal'] = df['signal'].mask(flatten_condition, 0)
-
-        # Final forward fill to ensure the exit carries through until the next entry
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        return df
+        return df.assign(signal=signal)
 
 
 class RSIReversal(StrategyTemplate):
@@ -84,6 +66,7 @@ class RSIReversal(StrategyTemplate):
     Goes long when RSI is oversold and exits when RSI crosses back above midline.
     Goes short when RSI is overbought and exits when RSI crosses below midline.
     """
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -94,6 +77,26 @@ class RSIReversal(StrategyTemplate):
             'midline': np.arange(40, 60, 1),
         }
 
+    @classmethod
+    def batch_apply(cls, df, param_sets):
+        """
+        Equivalent of ``[cls(**p).strat_apply(df.copy()) for p in param_sets]``
+        with every parameter set evaluated in one parallel kernel call.
+        """
+        def column(name, default, dtype):
+            return np.array([p.get(name, default) for p in param_sets], dtype=dtype)
+
+        # One RSI per distinct length (cached across batches), shared by the
+        # threshold / midline combinations that use it
+        (rsis,), rows = cached_table(cached_rsi, cls.as_f64(df['close']), column('length', 14, np.int64))
+        signal = rsi_reversal_batch(
+            rsis, rows,
+            column('lower', 30, np.float64),
+            column('upper', 70, np.float64),
+            column('midline', 50, np.float64),
+        )
+        return [df.assign(rsi=rsis[rows[k]], signal=signal[k]) for k in range(len(param_sets))]
+
     def strat_apply(self, df):
         # 1. Parameter Extraction
         length = self.params.get('length', 14)
@@ -102,40 +105,14 @@ class RSIReversal(StrategyTemplate):
         midline = self.params.get('midline', 50)
 
         # 2. Indicator Calculation
-        # Standardizing to lowercase 'rsi' and using the ta library syntax
-        df['rsi'] = ta.rsi(df['close'], length=length)
+        # Compiled equivalent of ta.rsi, cached per length across a sweep
+        rsi = cached_rsi(self.as_f64(df['close']), length)
 
-        # 3. Signal Logic
-        df['signal'] = np.nan
-
-        # Entry Conditions
-        df.loc[df['rsi'] < lower_threshold, 'signal'] = 1   # Long when oversold
-        df.loc[df['rsi'] > upper_threshold, 'signal'] = -1  # Short when overbought
-
-        # Initial Forward Fill to establish the directional bias
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        # 4. Exit Logic (Vectorized Crossover)
-        # Check for when RSI crosses the midline (50) from either direction
-        rsi_shifted = df['rsi'].shift(1)
-        cross_midline = (
-            ((rsi_shifted < midline) & (df['rsi'] >= midline)) | # Crossover
-            ((rsi_shifted > midline) & (df['rsi'] <= midline))   # Crossunder
-        )
-
-        flatten_condition = (
-            (df['signal'] != 0) &
-            (cross_midline)
-        )
-
-        # Apply Exit
-        df['signal'] = df['signal'].mask(flatten_condition, 0)
-
-        # 5. Final Persistence
-        # Re-apply ffill to ensure the '0' (Cash) state is held until a new entry trigger
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # 3-5. Overbought / oversold entries and the midline-cross exit in one
+        # compiled pass (see rsi_reversal_signal)
+        signal = rsi_reversal_signal(rsi, float(lower_threshold), float(upper_threshold), float(midline))
 
-        return df
+        return df.assign(rsi=rsi, signal=signal)
 
 
 class MACDReversal(StrategyTemplate):
@@ -145,6 +122,7 @@ class MACDReversal(StrategyTemplate):
     Trades MACD crossovers and exits when MACD crosses back through zero.
     Suitable for range-bound markets.
     """
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -154,6 +132,23 @@ class MACDReversal(StrategyTemplate):
             'signal': np.arange(5, 20, 1)
         }
 
+    @classmethod
+    def batch_apply(cls, df, param_sets):
+        """
+        Equivalent of ``[cls(**p).strat_apply(df.copy()) for p in param_sets]``
+        with every parameter set evaluated in one parallel kernel call.
+        """
+        def column(name, default, dtype):
+            return np.array([p.get(name, default) for p in param_sets], dtype=dtype)
+
+        # One MACD per distinct (fast, slow, signal), cached across batches
+        params = np.column_stack([
+            column('fast', 12, np.int64), column('slow', 26, np.int64), column('signal', 9, np.int64),
+        ])
+        (macds, signal_lines), rows = cached_table(cached_macd, cls.as_f64(df['close']), params)
+        signal = macd_reversal_batch(macds, signal_lines, rows, column('midline', 0, np.float64))
+        return [df.assign(signal=signal[k]) for k in range(len(param_sets))]
+
     def strat_apply(self, df):
         # 1. Parameter Extraction
         fast = self.params.get('fast', 12)
@@ -162,47 +157,29 @@ class MACDReversal(StrategyTemplate):
         zero_line = self.params.get('midline', 0)
 
         # 2. Indicator Calculation
-        # Using pandas_ta syntax as requested; extracting resulting components
-        macd_df = ta.macd(df['close'], fast=fast, slow=slow, signal=signal_period)
-        
-        # Standardizing column naming from the returned DataFrame
-        # Typically returns: MACD_12_26_9, MACDh_12_26_9, MACDs_12_26_9
-        macd_col = macd_df.iloc[:, 0]  # MACD Line
-        signal_col = macd_df.iloc[:, 2] # Signal Line
+        # Compiled equivalent of ta.macd: MACD line and its signal line, cached
+        # per (fast, slow, signal) across a sweep
+        macd_line, signal_line = cached_macd(self.as_f64(df['close']), fast, slow, signal_period)
 
         # 3. Signal Logic
-        df['signal'] = np.nan
-
         # Entry Conditions: Bullish/Bearish Crossovers
-        df.loc[macd_col > signal_col, 'signal'] = 1   # Long
-        df.loc[macd_col < signal_col, 'signal'] = -1  # Short
-
-        # Initial Forward Fill to establish the directional bias
-        df['signal'] = df['signal'].ffill().fillna(0)
+        signal = np.where(macd_line < signal_line, -1.0,                  # Short
+                          np.where(macd_line > signal_line, 1.0, np.nan))  # Long
 
         # 4. Exit Logic (Vectorized Zero-Cross)
         # Check for when MACD crosses the Zero Midline from either direction
-        macd_shifted = macd_col.shift(1)
-        cross_zero = (
-            ((macd_shifted < zero_line) & (macd_col >= zero_line)) | # Crossover
-            ((macd_shifted > zero_line) & (macd_col <= zero_line))   # Crossunder
-        )
-
-        flatten_condition = (
-            (df['signal'] != 0) &
-            (cross_zero)
-        )
+        cross_zero = crosses(macd_line, float(zero_line))
 
-        # Apply Exit (Flatten to 0)
-        df['signal'] = df['signal'].mask(flatten_condition, 0)
+        # 5. Persistence
+        # Forward fill the directional bias, flattening (0) on zero crosses
+        signal = apply_exit(signal, cross_zero)
 
-        # 5. Final Persistence
-        # Re-apply ffill to ensure the '0' (Cash) state is held until a new entry trigger
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        return df
+        return df.assign(signal=signal)
     
+
 class ReversalGridTrading(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -214,8 +191,7 @@ class ReversalGridTrading(StrategyTemplate):
     def strat_apply(self, df):
         # 1. Parameter Extraction
         if df.empty:
-            df['signal'] = 0
-            return df
+            return df.assign(signal=0)
 
         first_price = df['close'].iloc[0]
         
@@ -235,7 +211,6 @@ class ReversalGridTrading(StrategyTemplate):
         prev_close = df['close'].shift(1)
 
         # 4. Signal Logic (Vectorized)
-        df['signal'] = np.nan
         
         long_condition = pd.Series(False, index=df.index)
         short_condition = pd.Series(False, index=df.index)
@@ -247,17 +222,15 @@ class ReversalGridTrading(StrategyTemplate):
             # Crossover level -> Sell/Short (Mean Reversion / Grid Exit)
             short_condition |= (prev_close < level) & (close >= level)
 
-        # Apply signals: Long is 1, Short is -1
-        df.loc[long_condition, 'signal'] = 1
-        df.loc[short_condition, 'signal'] = -1
-
-        # 5. Persistence Logic
-        # Ffill ensures the strategy "holds" positions until a counter-signal occurs.
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # 5. Apply signals (Long is 1, Short is -1) with persistence:
+        # positions are held until a counter-signal occurs
+        signal = self.assemble_signal([short_condition, long_condition], [-1, 1])
 
-        return df
+        return df.assign(signal=signal)
 
 class RebalancingPremiumStrategy(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -272,23 +245,17 @@ class RebalancingPremiumStrategy(StrategyTemplate):
         bb_std = self.params.get("bb_std", 2.0)
         trend_trade = self.params.get("trend_trade", False)
 
-        # --- 2) Initialize / Column Standardization ---
-        df["signal"] = np.nan
-
+        # --- 2) Column Standardization ---
         if "close" not in df.columns:
-            df["signal"] = 0
-            return df
-
-        # --- 3) Indicator Calculation (pandas_ta) ---
-        bb = ta.bbands(df["close"], length=bb_length, std=bb_std)
-        
-        if bb is None or bb.empty:
-            df["signal"] = 0
-            return df
-
-        bb_up = bb[[c for c in bb.columns if c.startswith('BBU')][0]]
-        bb_low = bb[[c for c in bb.columns if c.startswith('BBL')][0]]
-        bb_mid = bb[[c for c in bb.columns if c.startswith('BBM')][0]]
+            return df.assign(signal=0)
+
+        # --- 3) Indicator Calculation ---
+        # Bands as positional arrays (lower, mid, upper); all NaN when the history
+        # is shorter than bb_length, which leaves the signal flat
+        bb_low, bb_mid, bb_up = (
+            pd.Series(band, index=df.index)
+            for band in bbands_nb(self.as_f64(df["close"]), int(bb_length), float(bb_std), 0)
+        )
 
         # --- 4) Signal Logic (Vectorized) ---
         if trend_trade:
@@ -312,16 +279,14 @@ class RebalancingPremiumStrategy(StrategyTemplate):
                 ((close_prev > mid_prev) & (df["close"] <= bb_mid))
             )
 
-        df.loc[long_entry, "signal"] = 1
-        df.loc[short_entry, "signal"] = -1
-        df.loc[exit_to_mean, "signal"] = 0
-
         # --- 5) Persistence (Hold until exit or counter-signal) ---
-        df["signal"] = df["signal"].ffill().fillna(0)
+        signal = self.assemble_signal([exit_to_mean, short_entry, long_entry], [0, -1, 1])
 
-        return df
+        return df.assign(signal=signal)
 
 class BouncyBallReversion(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -341,49 +306,41 @@ class BouncyBallReversion(StrategyTemplate):
         zone_threshold = self.params.get('zone_threshold', 0.005)
 
         # 2. Indicator Calculation
-        # Using pandas_ta (ta) as per requirements
-        df['ema_support'] = ta.ema(df['close'], length=ema_long_len)
-        df['ema_fast'] = ta.ema(df['close'], length=ema_fast_len)
-        df['rsi'] = ta.rsi(df['close'], length=rsi_len)
+        # Compiled equivalents of ta.ema / ta.rsi
+        close = self.as_f64(df['close'])
+        ema_support = ema_nb(close, int(ema_long_len))
+        ema_fast = ema_nb(close, int(ema_fast_len))
+        rsi = rsi_nb(close, int(rsi_len))
         
         # Pre-calculate distance to support
-        df['dist_to_support'] = (df['close'] - df['ema_support']) / df['ema_support']
+        dist_to_support = (close - ema_support) / ema_support
 
         # 3. Signal Logic
-        df['signal'] = np.nan
 
         # Entry Conditions
         # 1. Price is within the Buy Zone (0% to 0.5% above EMA)
-        in_buy_zone = (df['dist_to_support'] >= 0) & (df['dist_to_support'] <= zone_threshold)
+        in_buy_zone = (dist_to_support >= 0) & (dist_to_support <= zone_threshold)
         # 2. RSI is oversold
-        is_oversold = df['rsi'] < rsi_threshold
+        is_oversold = rsi < rsi_threshold
         # 3. Reversal Candle (Bullish close)
-        is_reversal = df['close'] > df['open']
+        is_reversal = close > self.as_f64(df['open'])
         
         long_entry = in_buy_zone & is_oversold & is_reversal
-        df.loc[long_entry, 'signal'] = 1
-
-        # Initial Forward Fill to establish the directional bias
-        df['signal'] = df['signal'].ffill().fillna(0)
 
         # 4. Exit Logic
         # Exit when price recovers to the fast EMA (relief rally goal)
-        exit_relief = (df['signal'] == 1) & (df['close'] >= df['ema_fast'])
-        
-        # Apply Exit using mask
-        df['signal'] = df['signal'].mask(exit_relief, 0)
+        exit_relief = close >= ema_fast
 
-        # 5. Final Persistence
-        # Ensure the '0' state is held until the next long_entry trigger
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # 5. Persistence
+        # Hold the long, keeping the '0' state after an exit until the next long_entry trigger.
+        # The indicators stay local, so only the signal is attached to a new frame.
+        signal = self.assemble_signal([long_entry], [1], long_exit=exit_relief)
 
-        # Cleanup temporary indicator columns to keep df clean for the engine
-        cols_to_drop = ['ema_support', 'ema_fast', 'rsi', 'dist_to_support']
-        df.drop(columns=[c for c in cols_to_drop if c in df.columns], inplace=True)
-
-        return df
+        return df.assign(signal=signal)
     
 class SwingPointReversal(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -429,32 +386,26 @@ class SwingPointReversal(StrategyTemplate):
         sell_trigger_level = np.where(c < o, o, c)
 
         # 6. Signal Generation
-        df['signal'] = np.nan
-
         # Entry Conditions: Swing point confirmed + Trend Context + Price Level Validation
         long_condition = (is_swing_low) & (trending_down) & (c.shift(2) > buy_trigger_level)
         short_condition = (is_swing_high) & (trending_up) & (c.shift(2) < sell_trigger_level)
 
-        df.loc[long_condition, 'signal'] = 1
-        df.loc[short_condition, 'signal'] = -1
-
-        # Initial forward fill to check current position state for exit logic
-        df['signal'] = df['signal'].ffill().fillna(0)
-
         # 7. Exit Logic (Support/Resistance Violation)
         # Exit if the current close breaks back through the trigger level
-        exit_long = (df['signal'] == 1) & (c < buy_trigger_level)
-        exit_short = (df['signal'] == -1) & (c > sell_trigger_level)
-        
-        df.loc[exit_long | exit_short, 'signal'] = 0
+        exit_long = c < buy_trigger_level
+        exit_short = c > sell_trigger_level
 
-        # 8. Final Persistence
-        # Ensure the '0' (Cash) or directional state is held until a new trigger
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # 8. Persistence
+        # Hold the directional state, or '0' (Cash) after an exit, until a new trigger
+        signal = self.assemble_signal(
+            [short_condition, long_condition], [-1, 1], long_exit=exit_long, short_exit=exit_short
+        )
 
-        return df
+        return df.assign(signal=signal)
 
 class WasherMeanReversion(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -482,31 +433,25 @@ class WasherMeanReversion(StrategyTemplate):
         # Calculate Z-Score
         # Z = (Current Return - Average Return) / Volatility of Return
         # Handle division by zero/nan by replacing 0 in std with NaN
-        df['return_z_score'] = (period_return - rolling_mean) / rolling_std.replace(0, np.nan)
+        return_z_score = (period_return - rolling_mean) / rolling_std.replace(0, np.nan)
 
         # 3. Vectorized Signal Logic
-        df['signal'] = np.nan
 
         # Define Conditions
-        long_cond = df['return_z_score'] < -entry_z   # Oversold/Loser
-        short_cond = df['return_z_score'] > entry_z   # Overbought/Winner
-        flat_cond = df['return_z_score'].abs() < exit_z # Reverted to Mean
-
-        # Apply Signals
-        # Note: We apply signals to specific rows based on conditions.
-        # Everything else remains NaN to be filled by the previous state.
-        df.loc[long_cond, 'signal'] = 1
-        df.loc[short_cond, 'signal'] = -1
-        df.loc[flat_cond, 'signal'] = 0
-
-        # 4. Final Persistence
-        # Forward fill to ensure the strategy holds the position (1, -1) 
-        # or the neutral state (0) until a new condition is met.
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        return df
+        long_cond = return_z_score < -entry_z   # Oversold/Loser
+        short_cond = return_z_score > entry_z   # Overbought/Winner
+        flat_cond = return_z_score.abs() < exit_z # Reverted to Mean
+
+        # Apply Signals with persistence
+        # Rows matching no condition hold the previous state: the position (1, -1)
+        # or the neutral state (0) is kept until a new condition is met.
+        signal = self.assemble_signal([flat_cond, short_cond, long_cond], [0, -1, 1])
+
+        return df.assign(return_z_score=return_z_score, signal=signal)
     
 class IntermarketZScoreArb(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -527,39 +472,21 @@ class IntermarketZScoreArb(StrategyTemplate):
         # Handle potential division by zero
         stdev = stdev.replace(0, np.nan)
         
-        df['z_score'] = (df['close'] - sma) / stdev
+        z_score = (df['close'] - sma) / stdev
 
         # 3. Signal Logic
-        df['signal'] = np.nan
-
         # Entry Conditions
         # Long when Z-Score is statistically cheap (< -threshold)
-        df.loc[df['z_score'] < -threshold, 'signal'] = 1
+        long_entry = z_score < -threshold
         # Short when Z-Score is statistically expensive (> threshold)
-        df.loc[df['z_score'] > threshold, 'signal'] = -1
-
-        # Initial Forward Fill to establish the directional bias
-        df['signal'] = df['signal'].ffill().fillna(0)
+        short_entry = z_score > threshold
 
         # 4. Exit Logic (Mean Reversion)
         # Exit when Z-Score crosses zero (reverts to mean)
-        z_prev = df['z_score'].shift(1)
-        
-        cross_zero = (
-            ((z_prev < 0) & (df['z_score'] >= 0)) | # Crossed from below
-            ((z_prev > 0) & (df['z_score'] <= 0))   # Crossed from above
-        )
-
-        flatten_condition = (
-            (df['signal'] != 0) &
-            (cross_zero)
-        )
-
-        # Apply Exit
-        df['signal'] = df['signal'].mask(flatten_condition, 0)
+        cross_zero = crosses(self.as_f64(z_score), 0.0)
 
-        # 5. Final Persistence
-        # Re-apply ffill to ensure the '0' (Cash) state is held until a new entry trigger
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # 5. Persistence
+        # Hold the directional bias; the '0' (Cash) state after an exit is held until a new entry trigger
+        signal = self.assemble_signal([short_entry, long_entry], [-1, 1], exit_condition=cross_zero)
 
-        return df
\ No newline at end of file
+        return df.assign(z_score=z_score, signal=signal)
\ No newline at end of file
@@ -12,6 +12,11 @@ import numpy as np
 import pandas_ta as ta
 
 from .base import StrategyTemplate
+from ._numba_kernels import (
+    apply_exit, apply_time_exit, bbands_nb, chandelier_loop, ema_cross_batch, ffill_signal,
+    newsom_entries, rolling_extrema, shift1, sign_change, vol_filter_nb,
+)
+from ._indicator_cache import cached_atr, cached_bbands, cached_ema, cached_macd, cached_table
 
 class EMACross(StrategyTemplate):
     """
@@ -20,6 +25,7 @@ class EMACross(StrategyTemplate):
     Generates long signals when fast EMA crosses above slow EMA,
     and short signals when fast EMA crosses below slow EMA.
     """
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -28,29 +34,48 @@ class EMACross(StrategyTemplate):
             'slow': np.arange(50, 200, 2)
         }
 
+    @classmethod
+    def batch_apply(cls, df, param_sets):
+        """
+        Equivalent of ``[cls(**p).strat_apply(df.copy()) for p in param_sets]``
+        with every parameter set evaluated in one parallel kernel call. Each
+        distinct EMA length is computed once (and cached across batches).
+        """
+        fasts = [int(p.get('fast', 10)) for p in param_sets]
+        slows = [int(p.get('slow', 50)) for p in param_sets]
+        (emas,), rows = cached_table(cached_ema, cls.as_f64(df['close']), fasts + slows)
+        fast_rows, slow_rows = rows[:len(fasts)], rows[len(fasts):]
+        signal = ema_cross_batch(emas, fast_rows, slow_rows)
+
+        frames = []
+        for k in range(len(param_sets)):
+            valid = ~np.isnan(signal[k])
+            frames.append(df[valid].assign(
+                ema_fast=emas[fast_rows[k], valid], ema_slow=emas[slow_rows[k], valid],
+                signal=signal[k, valid].astype(np.int8),
+            ))
+        return frames
+
     def strat_apply(self, df):
         # Access parameters from the params dictionary
         fast = int(self.params.get('fast', 10))
         slow = int(self.params.get('slow', 50))
 
-        df['ema_fast'] = ta.ema(df['close'], length=fast)
-        df['ema_slow'] = ta.ema(df['close'], length=slow)
+        # Grid sweeps revisit each length many times; cached per input frame
+        close = self.as_f64(df['close'])
+        ema_fast = cached_ema(close, fast)
+        ema_slow = cached_ema(close, slow)
         
-        # Drop NaN values generated by EMA warmup to avoid comparison errors
-        df.dropna(subset=['ema_fast', 'ema_slow'], inplace=True)
+        # Drop rows in the EMA warmup to avoid comparison errors
+        valid = ~(np.isnan(ema_fast) | np.isnan(ema_slow))
+        ema_fast = ema_fast[valid]
+        ema_slow = ema_slow[valid]
 
-        df['signal'] = np.nan
-        long_condition = (
-          df['ema_fast'] > df['ema_slow']
-        )
-        df.loc[long_condition, 'signal'] = 1
-        short_condition = (
-          df['ema_fast'] < df['ema_slow']
-        )
-        df.loc[short_condition, 'signal'] = -1
-        df['signal'] = df['signal'].ffill().fillna(0)
+        long_condition = ema_fast > ema_slow
+        short_condition = ema_fast < ema_slow
+        signal = ffill_signal(np.where(short_condition, -1.0, np.where(long_condition, 1.0, np.nan)))
 
-        return df
+        return df[valid].assign(ema_fast=ema_fast, ema_slow=ema_slow, signal=signal)
 
 
 class MACDTrend(StrategyTemplate):
@@ -60,6 +85,7 @@ class MACDTrend(StrategyTemplate):
     Trades in the direction of the MACD trend (above/below zero)
     when MACD line crosses the signal line.
     """
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -69,54 +95,48 @@ class MACDTrend(StrategyTemplate):
             'signal_period': np.arange(5, 20, 1)
         }
 
-    def strat_apply(self, df):
+    def strat_apply(self, df, buffers=None):
         # 1. Parameter Extraction
         fast = self.params.get('fast', 12)
         slow = self.params.get('slow', 26)
         signal = self.params.get('signal_period', 9)
 
         # 2. Indicator Calculation
-        # Using pandas_ta (ta) to calculate MACD components
-        macd_df = ta.macd(df['close'], fast=fast, slow=slow, signal=signal)
-        
-        # Standardizing column names based on pandas_ta output format
-        macd_col = f'MACD_{fast}_{slow}_{signal}'
-        signal_col = f'MACDs_{fast}_{slow}_{signal}'
-        
-        df['macd_line'] = macd_df[macd_col]
-        df['signal_line'] = macd_df[signal_col]
+        # Cached per (fast, slow, signal), so a sweep over the other axes reuses it
+        macd_line, signal_line = cached_macd(self.as_f64(df['close']), fast, slow, signal)
 
         # 3. Define Regimes and Crossovers
-        bullish_regime = df['macd_line'] > 0
-        bearish_regime = df['macd_line'] < 0
-        
-        macd_shifted = df['macd_line'].shift(1)
-        sig_shifted = df['signal_line'].shift(1)
-
-        # MACD line crossing above/below the Signal line
-        bull_cross = (df['macd_line'] > df['signal_line']) & (macd_shifted <= sig_shifted)
-        bear_cross = (df['macd_line'] < df['signal_line']) & (macd_shifted >= sig_shifted)
+        # Previous bar's lines are shifted once and reused by both crossovers;
+        # each condition is built in place in one mask with one scratch mask.
+        n = len(df)
+        macd_shifted = shift1(macd_line, self.scratch(buffers, 'macd_shifted', n))
+        sig_shifted = shift1(signal_line, self.scratch(buffers, 'sig_shifted', n))
+        cond = self.scratch(buffers, 'cond', n, np.bool_)
+        tmp = self.scratch(buffers, 'tmp', n, np.bool_)
 
         # 4. Signal Logic
-        df['signal'] = np.nan
+        # Entry Conditions: MACD line crossing above/below the Signal line, aligned
+        # with the MACD regime (above/below zero)
+        entries = self.scratch(buffers, 'entries', n)
+        entries.fill(np.nan)
 
-        # Entry Conditions: Signals must align with the MACD regime (above/below zero)
-        df.loc[bullish_regime & bull_cross, 'signal'] = 1   # Long
-        df.loc[bearish_regime & bear_cross, 'signal'] = -1  # Short
+        np.greater(macd_line, signal_line, out=cond)
+        np.logical_and(cond, np.less_equal(macd_shifted, sig_shifted, out=tmp), out=cond)
+        np.logical_and(cond, np.greater(macd_line, 0, out=tmp), out=cond)
+        entries[cond] = 1.0   # Long
 
-        # Initial forward fill to hold position
-        df['signal'] = df['signal'].ffill().fillna(0)
+        np.less(macd_line, signal_line, out=cond)
+        np.logical_and(cond, np.greater_equal(macd_shifted, sig_shifted, out=tmp), out=cond)
+        np.logical_and(cond, np.less(macd_line, 0, out=tmp), out=cond)
+        entries[cond] = -1.0  # Short
 
         # 5. Exit Logic: Regime Change
-        # If the MACD line crosses the zero bound, the trend is considered broken
-        regime_change = (df['macd_line'] * macd_shifted < 0)
-        df['signal'] = df['signal'].mask(regime_change, 0)
-
-        # 6. Final Persistence
-        # Ensure the '0' (Cash) state is held until a new entry trigger occurs
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # If the MACD line crosses the zero bound, the trend is considered broken.
+        # Forward fill to hold position and flatten on those bars in one pass.
+        regime_change = sign_change(macd_line, self.scratch(buffers, 'regime_change', n, np.bool_))
+        signal_arr = apply_exit(entries, regime_change, self.scratch(buffers, 'signal', n, np.int8))
 
-        return df
+        return df.assign(macd_line=macd_line, signal_line=signal_line, signal=signal_arr)
 
 
 class Newsom10Strategy(StrategyTemplate):
@@ -126,6 +146,7 @@ class Newsom10Strategy(StrategyTemplate):
     Combines ATR-based Chandelier Exits, EMA filters, Bollinger Band expansion,
     and volatility filters for high-confidence trend entries.
     """
+    mutates_input = False
     
     @classmethod
     def get_default_grid(cls):
@@ -138,7 +159,7 @@ class Newsom10Strategy(StrategyTemplate):
             'vol_ema_length': np.arange(5, 51, 2),
         }
 
-    def strat_apply(self, df):
+    def strat_apply(self, df, buffers=None):
         # 1. Parameter Extraction
         atr_period = self.params.get('atr_period', 22)
         atr_mult = self.params.get('atr_mult', 3.0)
@@ -148,94 +169,70 @@ class Newsom10Strategy(StrategyTemplate):
         vol_ema_len = self.params.get('vol_ema_len', 20)
 
         # 2. Indicator Calculation
-        df['atr'] = ta.atr(df['high'], df['low'], df['close'], length=atr_period)
-        df['ema_10'] = ta.ema(df['close'], length=ema_length)
-        df['ohlc4'] = (df['open'] + df['high'] + df['low'] + df['close']) / 4
-
-        # Volatility Filter
-        df['atr_ratio'] = (df['atr'] / df['close']) * 100
-        df['vol_filter_ema'] = ta.ema(df['atr_ratio'], length=vol_ema_len)
-        df['vol_filter_active'] = df['atr_ratio'] > df['vol_filter_ema']
-
-        # Bollinger Bands Expansion
-        bbands = ta.bbands(df['close'], length=bb_length, std=bb_mult)
-        df['bb_upper'] = bbands.iloc[:, 2]
-        df['bb_lower'] = bbands.iloc[:, 0]
-        df['band_dist'] = df['bb_upper'] - df['bb_lower']
-        df['expansion'] = df['band_dist'] > df['band_dist'].shift(1)
-
-        # 3. Chandelier Exit (Trailing Stop Logic)
-        high_length = df['close'].rolling(window=atr_period).max()
-        low_length = df['close'].rolling(window=atr_period).min()
-
-        long_stop_raw = high_length - (df['atr'] * atr_mult)
-        short_stop_raw = low_length + (df['atr'] * atr_mult)
-
-        close_arr = df['close'].values
-        ls_arr = long_stop_raw.fillna(0).values.copy()
-        ss_arr = short_stop_raw.fillna(0).values.copy()
-        directions = np.zeros(len(df))
+        close = self.as_f64(df['close'])
+        open_ = self.as_f64(df['open'])
+        high = self.as_f64(df['high'])
+        low = self.as_f64(df['low'])
+        # ATR, EMA and bands each depend on one grid axis; cached across a sweep
+        atr = cached_atr(high, low, close, atr_period)
+        ema_10 = cached_ema(close, ema_length)
+        n = len(df)
+
+        # Volatility Filter: ATR as % of close above its own EMA, in one fused pass
+        vol_filter_ema, vol_filter_active = vol_filter_nb(
+            close, atr, int(vol_ema_len),
+            self.scratch(buffers, 'vol_filter_ema', len(df)),
+            self.scratch(buffers, 'vol_filter', len(df), np.bool_),
+        )
 
-        curr_dir = 1
-        for i in range(1, len(df)):
-            # Trailing Long Stop logic
-            if close_arr[i-1] > ls_arr[i-1]:
-                ls_arr[i] = max(ls_arr[i], ls_arr[i-1])
+        # Bollinger Bands Expansion (population std, as ta.bbands)
+        bb_lower, _, bb_upper = cached_bbands(close, bb_length, bb_mult)
+        band_dist = np.subtract(bb_upper, bb_lower, out=self.scratch(buffers, 'band_dist', n))
+        expansion = np.greater(
+            band_dist, shift1(band_dist, self.scratch(buffers, 'band_dist_prev', n)),
+            out=self.scratch(buffers, 'expansion', n, np.bool_),
+        )
 
-            # Trailing Short Stop logic
-            if close_arr[i-1] < ss_arr[i-1]:
-                ss_arr[i] = min(ss_arr[i], ss_arr[i-1])
+        # 3. Chandelier Exit (Trailing Stop Logic)
+        high_length, low_length = rolling_extrema(close, int(atr_period))
 
-            # Direction switch
-            if close_arr[i] > ss_arr[i-1]:
-                curr_dir = 1
-            elif close_arr[i] < ls_arr[i-1]:
-                curr_dir = -1
-            directions[i] = curr_dir
+        # Raw stops built in place (chandelier_loop then trails them in place too)
+        atr_offset = np.multiply(atr, atr_mult, out=self.scratch(buffers, 'atr_offset', n))
+        long_stop_raw = np.subtract(high_length, atr_offset, out=self.scratch(buffers, 'long_stop', n))
+        short_stop_raw = np.add(low_length, atr_offset, out=self.scratch(buffers, 'short_stop', n))
+        np.nan_to_num(long_stop_raw, copy=False, nan=0.0)
+        np.nan_to_num(short_stop_raw, copy=False, nan=0.0)
 
-        df['dir'] = directions
+        _, _, directions = chandelier_loop(close, long_stop_raw, short_stop_raw)
 
         # 4. Signal Logic
-        df['signal'] = np.nan
-
-        long_condition = (
-            (df['close'] > df['ema_10']) &
-            (df['close'].shift(1) < df['open'].shift(1)) &
-            (df['ohlc4'] > df['ema_10']) &
-            (df['dir'] == 1) &
-            (df['expansion']) &
-            (df['vol_filter_active'])
-        )
-
-        short_condition = (
-            (df['close'] < df['ema_10']) &
-            (df['close'].shift(1) > df['open'].shift(1)) &
-            (df['ohlc4'] < df['ema_10']) &
-            (df['dir'] == -1) &
-            (df['expansion']) &
-            (df['vol_filter_active'])
-        )
-
-        df.loc[long_condition, 'signal'] = 1
-        df.loc[short_condition, 'signal'] = -1
+        # All six long/short entry conditions are checked bar by bar in one
+        # compiled pass, which also forms ohlc4 per bar (see newsom_entries)
+        entries = newsom_entries(close, open_, high, low, ema_10, directions, expansion,
+                                 vol_filter_active, self.scratch(buffers, 'entries', n))
 
         # 5. Persistence and Exit
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        # Flatten when Chandelier Direction changes
-        flatten_condition = (
-            (df['dir'] != df['dir'].shift(1)) &
-            (df['signal'] != 0)
+        # Hold positions, flattening when the Chandelier Direction changes
+        flatten_condition = np.not_equal(
+            directions, shift1(directions, self.scratch(buffers, 'dir_shifted', n)),
+            out=self.scratch(buffers, 'flatten', n, np.bool_),
+        )
+        signal = apply_exit(entries, flatten_condition, self.scratch(buffers, 'signal', n, np.int8))
+
+        return df.assign(
+            atr=atr,
+            ema_10=ema_10,
+            vol_filter_ema=vol_filter_ema,
+            vol_filter_active=vol_filter_active,
+            band_dist=band_dist,
+            expansion=expansion,
+            dir=directions,
+            signal=signal,
         )
-
-        df['signal'] = df['signal'].mask(flatten_condition, 0)
-
-        # Ensure position stays flat after mask until next entry signal
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        return df
     
 class MarkovChainTrendProbability(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -254,11 +251,11 @@ class MarkovChainTrendProbability(StrategyTemplate):
 
         # 2. Indicator Calculation
         # Ensure column names are standardized to lowercase as per BacktestEngine requirements
-        df['atr'] = ta.atr(df['high'], df['low'], df['close'], length=atr_length)
+        atr = ta.atr(df['high'], df['low'], df['close'], length=atr_length)
         
         # Calculate ATR-normalized price change
         price_change = df['close'] - df['close'].shift(lookback_period)
-        atr_normalized_change = price_change / df['atr']
+        atr_normalized_change = price_change / atr
 
         # 3. State Identification
         # Logic: if change > threshold -> Up (1), if < -threshold -> Down (-1), else NaN for ffill
@@ -278,22 +275,19 @@ class MarkovChainTrendProbability(StrategyTemplate):
         prob_downtrend = is_down.rolling(window=history_length).mean()
 
         # 5. Signal Generation Logic
-        df['signal'] = np.nan
-        
         # Entry Conditions based on decision boundaries
         long_condition = (prob_uptrend > prob_downtrend) & (prob_uptrend > 0.5)
         short_condition = (prob_downtrend > prob_uptrend) & (prob_downtrend > 0.5)
 
-        df.loc[long_condition, 'signal'] = 1
-        df.loc[short_condition, 'signal'] = -1
-
         # 6. Persistence
-        # Final forward fill ensures the strategy holds positions until a counter-signal occurs
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # The strategy holds positions until a counter-signal occurs
+        signal = self.assemble_signal([short_condition, long_condition], [-1, 1])
 
-        return df
+        return df.assign(atr=atr, signal=signal)
 
 class TrendGridTrading(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -305,8 +299,7 @@ class TrendGridTrading(StrategyTemplate):
     def strat_apply(self, df):
         # 1. Parameter Extraction
         if df.empty:
-            df['signal'] = 0
-            return df
+            return df.assign(signal=0)
 
         # Use the first price as the anchor for the static grid
         first_price = df['close'].iloc[0]
@@ -326,8 +319,6 @@ class TrendGridTrading(StrategyTemplate):
         prev_close = df['close'].shift(1)
 
         # 4. Vectorized Signal Logic (Trend Following)
-        # Initialize signal as NaN to allow for effective forward filling
-        df['signal'] = np.nan
         
         long_condition = pd.Series(False, index=df.index)
         short_condition = pd.Series(False, index=df.index)
@@ -341,18 +332,16 @@ class TrendGridTrading(StrategyTemplate):
             # Crossunder level -> Sell/Short (Breakdown)
             short_condition |= (prev_close > level) & (close <= level)
 
-        # Apply signals: Long is 1, Short is -1
-        df.loc[long_condition, 'signal'] = 1
-        df.loc[short_condition, 'signal'] = -1
-
-        # 5. Final Persistence
-        # Ensure the directional bias is held until the price hits another grid level
+        # 5. Apply signals (Long is 1, Short is -1) with persistence:
+        # the directional bias is held until the price hits another grid level
         # in the opposite direction.
-        df['signal'] = df['signal'].ffill().fillna(0)
+        signal = self.assemble_signal([short_condition, long_condition], [-1, 1])
 
-        return df
+        return df.assign(signal=signal)
 
 class TDIV5TimeExit(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -383,9 +372,10 @@ class TDIV5TimeExit(StrategyTemplate):
         slow_ma = ta.sma(rsi_val, length=slow_ma_len)
         
         # BB and ATR
-        bbands = ta.bbands(df['close'], length=bb_len, std=bb_std)
-        bb_up = bbands[[c for c in bbands.columns if c.startswith('BBU')][0]]
-        bb_low = bbands[[c for c in bbands.columns if c.startswith('BBL')][0]]
+        bb_low, _, bb_up = (
+            pd.Series(band, index=df.index)
+            for band in bbands_nb(self.as_f64(df['close']), int(bb_len), float(bb_std), 0)
+        )
         atr_val = ta.atr(df['high'], df['low'], df['close'], length=atr_len)
 
         # 3. Intermediate Logic (Vectorized)
@@ -400,7 +390,8 @@ class TDIV5TimeExit(StrategyTemplate):
         tdi_cross = (tdi_crossover | tdi_crossunder) & non_flat
 
         # BB Expansion and ATR Trend
-        bb_expanding = (bb_up - bb_low) > (bb_up.shift(1) - bb_low.shift(1))
+        band_width = bb_up - bb_low
+        bb_expanding = band_width > band_width.shift(1)
         atr_rising = atr_val > atr_val.shift(1)
 
         # 4. Entry Triggers
@@ -411,31 +402,17 @@ class TDIV5TimeExit(StrategyTemplate):
                         (tdi_cross & (fast_ma < slow_ma) & (atr_rising | bb_expanding))
 
         # 5. Signal Generation & Time-Based Exit
-        df['signal'] = np.nan
-        df.loc[long_trigger, 'signal'] = 1
-        df.loc[short_trigger, 'signal'] = -1
-        
-        # Identify valid entry events (ignoring consecutive redundant triggers)
-        is_entry = df['signal'].notna() & (df['signal'] != df['signal'].shift(1))
-        
-        # Forward fill to establish the initial trade direction
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        # Calculate bars held since the last entry event
-        entry_ids = is_entry.cumsum()
-        bars_held = df.groupby(entry_ids).cumcount()
+        # Hold each entry, moving to Cash (0) once it has been held exit_after_n bars
+        # (bars counted from 0 on the entry bar; repeated same-side triggers do not
+        # restart the count). See apply_time_exit.
+        entries = np.select([short_trigger, long_trigger], [-1, 1], default=np.nan)
+        signal = apply_time_exit(entries, float(exit_after_n))
 
-        # Apply Time Exit: Force signal to 0 if holding period is reached
-        # Note: cumcount is 0-indexed, so bars_held == exit_after_n is the nth bar
-        exit_mask = (bars_held >= exit_after_n)
-        df['signal'] = df['signal'].mask(exit_mask, 0)
-        
-        # Final Persistence: ffill to ensure Cash (0) is held until next trigger
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        return df
+        return df.assign(signal=signal)
     
 class DblMarkovTrend(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -506,7 +483,6 @@ class DblMarkovTrend(StrategyTemplate):
         ev_slope = ev_per_step.rolling(window=regression_window).mean()
 
         # 4. Signal Generation
-        df['signal'] = np.nan
 
         # Long: Oscillator Bullish AND EV Slope Positive
         long_cond = (prob_uptrend > prob_downtrend) & (ev_slope > 0)
@@ -514,16 +490,15 @@ class DblMarkovTrend(StrategyTemplate):
         # Short: Oscillator Bearish AND EV Slope Negative
         short_cond = (prob_downtrend > prob_uptrend) & (ev_slope < 0)
 
-        df.loc[long_cond, 'signal'] = 1
-        df.loc[short_cond, 'signal'] = -1
-        
-        # 5. Final Persistence
-        # Apply forward fill to ensure position is held until a counter-signal
-        df['signal'] = df['signal'].ffill().fillna(0)
+        # 5. Persistence
+        # Position is held until a counter-signal
+        signal = self.assemble_signal([short_cond, long_cond], [-1, 1])
 
-        return df
+        return df.assign(signal=signal)
     
 class MarkovChainTrendStrategy(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -544,58 +519,48 @@ class MarkovChainTrendStrategy(StrategyTemplate):
 
         # 2. Indicator Calculation
         # Ensure column names are standardized to lowercase 'high', 'low', 'close'
-        df['atr'] = ta.atr(df['high'], df['low'], df['close'], length=atr_length)
+        atr = ta.atr(df['high'], df['low'], df['close'], length=atr_length)
         
         # Calculate normalized price change: (Close - Close[n]) / ATR
-        df['price_change'] = df['close'] - df['close'].shift(lookback_period)
-        df['atr_normalized_change'] = df['price_change'] / df['atr']
+        price_change = df['close'] - df['close'].shift(lookback_period)
+        atr_normalized_change = price_change / atr
 
         # 3. State Identification Logic
-        # Define States: 1 for Uptrend, -1 for Downtrend
-        df['raw_state'] = np.nan
-        df.loc[df['atr_normalized_change'] > atr_threshold, 'raw_state'] = 1
-        df.loc[df['atr_normalized_change'] < -atr_threshold, 'raw_state'] = -1
+        # Define States: 1 for Uptrend, -1 for Downtrend (a downtrend breach wins a tie)
+        raw_state = np.where(
+            atr_normalized_change < -atr_threshold, -1,
+            np.where(atr_normalized_change > atr_threshold, 1, np.nan)
+        )
         
         # current_state persists until a threshold is breached in the opposite direction
-        df['current_state'] = df['raw_state'].ffill().fillna(1)
+        current_state = pd.Series(raw_state, index=df.index).ffill().fillna(1)
 
         # 4. Probability Calculations (Rolling Window)
-        df['is_uptrend'] = (df['current_state'] == 1).astype(int)
-        df['is_downtrend'] = (df['current_state'] == -1).astype(int)
+        is_uptrend = (current_state == 1).astype(int)
+        is_downtrend = (current_state == -1).astype(int)
         
-        df['prob_uptrend'] = df['is_uptrend'].rolling(window=history_length).sum() / history_length
-        df['prob_downtrend'] = df['is_downtrend'].rolling(window=history_length).sum() / history_length
+        prob_uptrend = is_uptrend.rolling(window=history_length).sum() / history_length
+        prob_downtrend = is_downtrend.rolling(window=history_length).sum() / history_length
 
         # 5. Signal Generation (Crossover Logic)
-        df['p_up_prev'] = df['prob_uptrend'].shift(1)
-        df['p_down_prev'] = df['prob_downtrend'].shift(1)
+        p_up_prev = prob_uptrend.shift(1)
+        p_down_prev = prob_downtrend.shift(1)
         
-        long_condition = (df['prob_uptrend'] > df['prob_downtrend']) & (df['p_up_prev'] <= df['p_down_prev'])
-        short_condition = (df['prob_downtrend'] > df['prob_uptrend']) & (df['p_down_prev'] <= df['p_up_prev'])
+        long_condition = (prob_uptrend > prob_downtrend) & (p_up_prev <= p_down_prev)
+        short_condition = (prob_downtrend > prob_uptrend) & (p_down_prev <= p_up_prev)
 
         # 6. Vectorized Execution & Persistence
-        df['signal'] = np.nan
-        
-        if take_longs:
-            df.loc[long_condition, 'signal'] = 1
-            
-        if take_shorts:
-            df.loc[short_condition, 'signal'] = -1
-
-        # Final Persistence: Apply .ffill() to hold positions until a counter-signal occurs
-        df['signal'] = df['signal'].ffill().fillna(0)
-
-        # 7. Cleanup
-        cols_to_drop = [
-            'atr', 'price_change', 'atr_normalized_change', 'raw_state', 
-            'current_state', 'is_uptrend', 'is_downtrend', 'prob_uptrend', 
-            'prob_downtrend', 'p_up_prev', 'p_down_prev'
-        ]
-        df.drop(columns=[c for c in cols_to_drop if c in df.columns], inplace=True)
-
-        return df
+        # Positions are held until a counter-signal occurs. The intermediates stay
+        # local, so only the signal is attached to a new frame.
+        signal = self.assemble_signal(
+            [short_condition & bool(take_shorts), long_condition & bool(take_longs)], [-1, 1]
+        )
+
+        return df.assign(signal=signal)
     
 class SupertrendDirectionChange(StrategyTemplate):
+    mutates_input = False
+
     @classmethod
     def get_default_grid(cls):
         return {
@@ -611,8 +576,7 @@ class SupertrendDirectionChange(StrategyTemplate):
         # 2) Required columns check
         required = {"high", "low", "close"}
         if df.empty or not required.issubset(df.columns):
-            df["signal"] = 0
-            return df
+            return df.assign(signal=0)
 
         high = df["high"].astype(float)
         low = df["low"].astype(float)
@@ -642,8 +606,7 @@ class SupertrendDirectionChange(StrategyTemplate):
 
         first_valid_idx = atr.first_valid_index()
         if first_valid_idx is None:
-            df["signal"] = 0
-            return df
+            return df.assign(signal=0)
 
         start = df.index.get_loc(first_valid_idx)
         final_upper.iloc[start] = basic_upper.iloc[start]
@@ -684,11 +647,7 @@ class SupertrendDirectionChange(StrategyTemplate):
         long_flip = (direction == 1.0) & (prev_direction == -1.0)
         short_flip = (direction == -1.0) & (prev_direction == 1.0)
 
-        df["signal"] = np.nan
-        df.loc[long_flip, "signal"] = 1
-        df.loc[short_flip, "signal"] = -1
-
         # Hold until next counter-flip
-        df["signal"] = df["signal"].ffill().fillna(0)
+        signal = self.assemble_signal([short_flip, long_flip], [-1, 1])
 
-        return df
\ No newline at end of file
+        return df.assign(signal=signal)
\ No newline at end of file
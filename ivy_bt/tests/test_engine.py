@@ -11,6 +11,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.engine import BacktestEngine
 from src.strategies import StrategyTemplate
 from src.utils import apply_stop_loss
+from src.reporting import monthly_returns_grid
 
 class MockStrategy(StrategyTemplate):
     def __init__(self, param1=10):
@@ -159,6 +160,26 @@ class TestBacktestEngine(unittest.TestCase):
         self.assertIn('Sharpe', res_df.columns)
         self.assertEqual(len(res_df), 2) # 2 combinations
 
+    def test_run_grid_search_parallel_matches_sequential(self):
+        # More combinations than one chunk, so n_jobs=2 actually fans out
+        param_grid = {'param1': list(range(70))}
+
+        sequential = self.engine.run_grid_search(MockStrategy, param_grid)
+        parallel = self.engine.run_grid_search(MockStrategy, param_grid, n_jobs=2)
+
+        pd.testing.assert_frame_equal(parallel, sequential)
+
+    def test_run_coarse_to_fine_search(self):
+        param_grid = {'param1': list(range(20))}
+
+        res_df = self.engine.run_coarse_to_fine_search(MockStrategy, param_grid, stride=5, topk=1, refine_radius=1)
+
+        # MockStrategy ignores param1, so every score ties and the first coarse
+        # point wins: 4 coarse points (0, 5, 10, 15) plus its unseen neighbour 1
+        self.assertEqual(len(res_df), 5)
+        self.assertIn(1, res_df['param1'].values)
+        self.assertFalse(res_df['param1'].duplicated().any())
+
     def test_renko_config_validation(self):
         with self.assertRaises(ValueError):
             BacktestEngine(
@@ -192,5 +213,21 @@ class TestBacktestEngine(unittest.TestCase):
         self.assertIsNotNone(engine.benchmark_data)
         self.assertFalse(engine.benchmark_data.empty)
 
+    def test_monthly_returns_grid_matches_resample(self):
+        # Mid-year start, and April 2023 has no bars at all
+        idx = pd.date_range('2022-06-15', '2023-08-10', freq='D')
+        idx = idx[~((idx.year == 2023) & (idx.month == 4))]
+        log_returns = pd.Series(np.random.default_rng(1).normal(0, 0.01, len(idx)), index=idx)
+
+        monthly = log_returns.resample('ME').apply(lambda x: np.exp(x.sum()) - 1)
+        expected = pd.DataFrame({'ret': monthly, 'Year': monthly.index.year, 'Month': monthly.index.month})
+        expected = expected.pivot(index='Year', columns='Month', values='ret').reindex(columns=range(1, 13))
+
+        grid = monthly_returns_grid(log_returns)
+        self.assertEqual(list(grid.columns), list(range(1, 13)))
+        self.assertEqual(grid.loc[2023, 4], 0.0)
+        self.assertTrue(np.isnan(grid.loc[2022, 1]) and np.isnan(grid.loc[2023, 12]))
+        np.testing.assert_allclose(grid.to_numpy(), expected.to_numpy())
+
 if __name__ == '__main__':
     unittest.main()
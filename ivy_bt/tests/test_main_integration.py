@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 import sys
 import os
+import tempfile
 import pandas as pd
 
 # Add src to path
@@ -12,6 +13,15 @@ import main
 
 class TestMainIntegration(unittest.TestCase):
     
+    def setUp(self):
+        # run_backtest writes a run directory per call; keep it out of the repo's backtests/
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch('main.BACKTEST_DIR', tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backtest_dir = tmp.name
+
     @patch('src.strategies.EMACross.get_default_grid')
     @patch('main.load_config')
     @patch('main.BacktestEngine')
@@ -59,6 +69,57 @@ class TestMainIntegration(unittest.TestCase):
         mock_engine.run_strategy.assert_called()
         mock_engine.optimize_portfolio_selection.assert_called()
         mock_engine.generate_portfolio_report.assert_called()
+        self.assertTrue(os.listdir(self.backtest_dir))
+
+    def _optimizer_run_setup(self, mock_get_assets, mock_engine_cls, mock_load_config, mock_get_grid, **optimization):
+        """Mocks a single-ticker run (no reports) and returns the mocked engine."""
+        mock_load_config.return_value = AppConfig(
+            backtest=BacktestConfig(start_date="2023-01-01", end_date="2023-01-10", instrument_type="forex"),
+            data=DataConfig(cache_enabled=False, cache_dir=".cache", cache_format="parquet"),
+            optimization=OptimizationConfig(metric="Sharpe", enable_portfolio_opt=False, enable_monte_carlo=False, enable_wfo=False, enable_plotting=False, **optimization)
+        )
+        mock_get_assets.return_value = ["EURUSD=X"]
+        mock_engine = MagicMock()
+        mock_engine.tickers = ["EURUSD=X"]
+        mock_engine.results = {}
+        mock_engine_cls.return_value = mock_engine
+        mock_get_grid.return_value = {'fast': [10], 'slow': [20]}
+        results = pd.DataFrame({'fast': [10], 'slow': [20], 'Sharpe': [1.5], 'Return': [0.1]})
+        mock_engine.run_grid_search.return_value = results
+        mock_engine.run_coarse_to_fine_search.return_value = results
+        return mock_engine
+
+    @patch('src.strategies.EMACross.get_default_grid')
+    @patch('main.load_config')
+    @patch('main.BacktestEngine')
+    @patch('main.get_assets')
+    def test_n_jobs_reaches_optimizer(self, *mocks):
+        mock_engine = self._optimizer_run_setup(*mocks, n_jobs=3)
+
+        # Config value is the default...
+        main.run_backtest(strategy_name="EMACross")
+        self.assertEqual(mock_engine.run_grid_search.call_args.kwargs['n_jobs'], 3)
+
+        # ...and the argument (--n_jobs on the CLI) overrides it
+        main.run_backtest(strategy_name="EMACross", n_jobs=-1)
+        self.assertEqual(mock_engine.run_grid_search.call_args.kwargs['n_jobs'], -1)
+
+    @patch('src.strategies.EMACross.get_default_grid')
+    @patch('main.load_config')
+    @patch('main.BacktestEngine')
+    @patch('main.get_assets')
+    def test_coarse_search_mode(self, *mocks):
+        mock_engine = self._optimizer_run_setup(*mocks, search="coarse", n_jobs=2)
+
+        main.run_backtest(strategy_name="EMACross")
+        mock_engine.run_coarse_to_fine_search.assert_called_once()
+        self.assertEqual(mock_engine.run_coarse_to_fine_search.call_args.kwargs, {'metric': 'Sharpe', 'n_jobs': 2})
+        mock_engine.run_grid_search.assert_not_called()
+        mock_engine.run_random_search.assert_not_called()
+
+        # The argument (--search on the CLI) overrides the config
+        main.run_backtest(strategy_name="EMACross", search="grid")
+        mock_engine.run_grid_search.assert_called_once()
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,7 +8,14 @@ import pandas as pd
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.research.pair_scanner import _best_lag_corr, _safe_adf
+from src.research.pair_scanner import (
+    PairScannerConfig,
+    _best_lag_corr,
+    _engle_granger,
+    _pairwise_hedge_ratios,
+    _safe_adf,
+    _scan_pairs,
+)
 
 
 class TestPairScannerHelpers(unittest.TestCase):
@@ -33,6 +40,60 @@ class TestPairScannerHelpers(unittest.TestCase):
         self.assertFalse(pd.isna(res["adf_pvalue"]))
         self.assertLess(res["adf_pvalue"], 0.1)
 
+    def test_engle_granger_matches_statsmodels_coint(self):
+        from statsmodels.tsa.stattools import coint
+
+        rng = np.random.default_rng(11)
+        y = pd.Series(np.cumsum(rng.normal(0, 1, 400)))
+        x = 0.5 + 1.3 * y + pd.Series(rng.normal(0, 1, 400))
+
+        beta, alpha = np.polyfit(y, x, 1)
+        spread = (x - (alpha + beta * y)).to_numpy()
+        stat, pvalue = _engle_granger(spread, lag=1)
+        ref_stat, ref_pvalue, _ = coint(x.values, y.values, maxlag=1, autolag=None)
+
+        self.assertAlmostEqual(stat, ref_stat, places=6)
+        self.assertAlmostEqual(pvalue, ref_pvalue, places=6)
+
+    def test_pairwise_hedge_ratios_match_per_pair_ols(self):
+        rng = np.random.default_rng(3)
+        log_px = np.log(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (300, 3)), axis=0)))
+        log_px[:25, 1] = np.nan
+
+        alpha, beta = _pairwise_hedge_ratios(log_px)
+
+        mask = ~np.isnan(log_px[:, 0]) & ~np.isnan(log_px[:, 1])
+        ref_beta, ref_alpha = np.polyfit(log_px[mask, 1], log_px[mask, 0], 1)
+        self.assertAlmostEqual(beta[0, 1], ref_beta, places=8)
+        self.assertAlmostEqual(alpha[0, 1], ref_alpha, places=8)
+
+    def test_default_scan_is_exact(self):
+        rng = np.random.default_rng(11)
+        n = 600
+        rets = rng.normal(0, 0.01, (n, 4))
+        # B tracks A except on the return rows a stride-4 screen samples (log_px row 0 has
+        # no return, hence the offset), so the screen sees no correlation while the
+        # full-series correlation (~0.75) clears both corr_prefilter and corr_min
+        rets[:, 1] = rets[:, 0]
+        rets[1::4, 1] = rng.normal(0, 0.01, len(rets[1::4]))
+        # D tracks C on every row
+        rets[:, 3] = rets[:, 2] + rng.normal(0, 0.002, n)
+        symbols = ["A", "B", "C", "D"]
+        log_px = np.log(100) + np.cumsum(rets, axis=0)
+
+        def pair_set(config):
+            table = _scan_pairs(symbols, log_px, config)
+            return set(zip(table["ticker_x"], table["ticker_y"]))
+
+        default = pair_set(PairScannerConfig(n_jobs=1))
+        # No prefilter at all: every pair goes on to be scored
+        unfiltered = pair_set(PairScannerConfig(n_jobs=1, corr_prefilter=0.0))
+        self.assertEqual(default, unfiltered)
+        self.assertEqual(default, {("A", "B"), ("C", "D")})
+        # The strided screen is the opt-in path precisely because it can lose pairs like A/B
+        self.assertEqual(PairScannerConfig().prefilter_stride, 1)
+        self.assertNotIn(("A", "B"), pair_set(PairScannerConfig(n_jobs=1, prefilter_stride=4)))
+
 
 if __name__ == "__main__":
     unittest.main()
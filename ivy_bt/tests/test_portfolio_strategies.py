@@ -2,6 +2,7 @@ import unittest
 import pandas as pd
 import numpy as np
 import sys
+import warnings
 import os
 
 # Ensure src is in path
@@ -9,6 +10,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.strategies import PairsTrading, MarketRegimeSentimentFollower, ClusterMeanReversion
 from src.engine import BacktestEngine
+from src.strategies._numba_kernels import pairs_zscore
 
 class TestPortfolioStrategies(unittest.TestCase):
     def setUp(self):
@@ -54,6 +56,20 @@ class TestPortfolioStrategies(unittest.TestCase):
             row = pivoted_sig[mask].iloc[0]
             self.assertEqual(row['X'], -1.0, "X should be Short when Y is Long")
 
+    def test_pairs_zscore_matches_pandas_rolling(self):
+        rng = np.random.default_rng(3)
+        x = pd.Series(np.log(100 * np.exp(rng.normal(0, 0.01, 300).cumsum())))
+        y = pd.Series(np.log(50 * np.exp(rng.normal(0, 0.01, 300).cumsum()))) + 0.5 * x
+        x[120] = np.nan
+
+        beta = y.rolling(30).cov(x) / x.rolling(30).var()
+        spread = y - beta * x
+        z_score = (spread - spread.rolling(30).mean()) / spread.rolling(30).std()
+
+        got_beta, got_z = pairs_zscore(x.to_numpy(), y.to_numpy(), 30)
+        np.testing.assert_allclose(got_beta, beta, rtol=1e-7, atol=1e-9)
+        np.testing.assert_allclose(got_z, z_score, rtol=1e-7, atol=1e-7)
+
     def test_market_regime_sentiment_follower(self):
         # Needs SPY and other tickers
         # Create Ticker A: High Momentum (Up everyday)
@@ -83,9 +99,12 @@ class TestPortfolioStrategies(unittest.TestCase):
         )
         
         # Run
-        res = strategy.strat_apply(combined.copy())
+        res = strategy.strat_apply(combined)
         
         # Verify
+        # mutates_input = False: the universe frame is read, never modified
+        self.assertEqual(list(combined.columns), ['close', 'open'])
+        
         # SPY is Green -> We buy top N (A)
         # A returns > B returns. Rank A = 1. Rank B = 2.
         
@@ -126,13 +145,18 @@ class TestPortfolioStrategies(unittest.TestCase):
             'position': 1
         }, index=self.dates)
         
-        # Run Strategy
+        # Run Strategy; the per-ticker frames come from xs() slices, so writing into
+        # them in place would warn (and might not stick under copy-on-write)
         strategy = PairsTrading(window=20, z_entry=1.0)
-        engine.run_strategy(strategy)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', pd.errors.SettingWithCopyWarning)
+            engine.run_strategy(strategy)
         
         # Check results in engine
         self.assertIn('signal', engine.data['X'].columns)
         self.assertIn('signal', engine.data['Y'].columns)
+        self.assertEqual(engine.data['X']['signal'].dtype, np.int8)
+        self.assertEqual(engine.data['Y']['signal'].dtype, np.int8)
         
         # Since we modified the engine to split the MultiIndex back to self.data
         # We verify that split happened correctly
@@ -48,3 +48,37 @@ class TestRiskManagement(unittest.TestCase):
         sizes = sized_df['position_size']
         # Volatility varies, so size should vary
         self.assertTrue(sizes.std() > 0)
+
+    def test_volatility_sizer_matches_pandas_rolling_std(self):
+        sizer = VolatilitySizer(target_vol=0.20, lookback=20)
+        sized_df = sizer.size_position(self.df)
+
+        log_ret = np.log(self.df['close'] / self.df['close'].shift(1))
+        realized_vol = log_ret.rolling(window=20).std() * np.sqrt(252)
+        expected = (self.df['signal'] * (0.20 / realized_vol).clip(upper=2.0)).fillna(0)
+
+        np.testing.assert_allclose(sized_df['position_size'].values, expected.values, rtol=1e-9)
+
+    def test_kelly_sizer_matches_pandas_expanding(self):
+        sizer = KellySizer(min_periods=10)
+        sized_df = sizer.size_position(self.df)
+
+        strat_ret = self.df['signal'].shift(1).fillna(0) * np.log(self.df['close'] / self.df['close'].shift(1)).fillna(0)
+        kelly = (strat_ret.expanding(min_periods=10).mean() / strat_ret.expanding(min_periods=10).var().replace(0, np.nan)).fillna(0)
+        expected = self.df['signal'] * (kelly * 0.5).clip(lower=0, upper=2.0)
+
+        np.testing.assert_allclose(sized_df['position_size'].values, expected.values, rtol=1e-9)
+
+    def test_volatility_sizer_panel_matches_per_asset(self):
+        sizer = VolatilitySizer(target_vol=0.20, lookback=10)
+        other = self.df.copy()
+        other['close'] = other['close'][::-1].values
+        other['signal'] = -1
+
+        panel = sizer.size_position_panel(
+            np.column_stack([self.df['close'], other['close']]),
+            np.column_stack([self.df['signal'], other['signal']]),
+        )
+
+        np.testing.assert_allclose(panel[:, 0], sizer.size_position(self.df)['position_size'].values)
+        np.testing.assert_allclose(panel[:, 1], sizer.size_position(other)['position_size'].values)
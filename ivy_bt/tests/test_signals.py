@@ -4,6 +4,8 @@ import pandas as pd
 import numpy as np
 import os
 import sys
+import tempfile
+from datetime import datetime
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
@@ -94,5 +96,155 @@ class TestSignals(unittest.TestCase):
         result = signals.generate_signals("EMACross_forex_Optimized_presets.json")
         self.assertEqual(result.iloc[0]['Action'], 'BUY')
 
+    @patch('quanticon.ivy_bt.src.signals.os.path.exists')
+    @patch('quanticon.ivy_bt.src.signals.load_preset')
+    @patch('quanticon.ivy_bt.src.signals.get_assets')
+    @patch('quanticon.ivy_bt.src.signals.BacktestEngine')
+    @patch('quanticon.ivy_bt.src.signals.strategies')
+    def test_generate_signals_skips_trailing_nan_close(self, mock_strategies, mock_engine_cls, mock_get_assets, mock_load_preset, mock_exists):
+        mock_exists.return_value = True
+        mock_load_preset.return_value = [{'p': 1}]
+        mock_get_assets.return_value = ['TEST']
+        mock_strategies.EMACross = MagicMock()
+        
+        mock_engine = MagicMock()
+        mock_engine_cls.return_value = mock_engine
+        mock_engine.tickers = ['TEST']
+        
+        dates = pd.date_range(start='2023-01-01', periods=3)
+        # Last bar is a data gap; the signal should come from the bar before it
+        df = pd.DataFrame({
+            'close': [100, 101, np.nan],
+            'position_size': [0, 1.0, 0],
+            'position': [0, 0, 1.0]
+        }, index=dates)
+        
+        mock_engine.data = {'TEST': df}
+        
+        result = signals.generate_signals("EMACross_forex_Optimized_presets.json")
+        row = result.iloc[0]
+        self.assertEqual(row['Date'], dates[1].date())
+        self.assertEqual(row['Close'], 101)
+        self.assertEqual(row['Action'], 'BUY')
+
+class _FixedDay(datetime):
+    """datetime whose today() can be moved, for end_date rollover."""
+    day = datetime(2024, 1, 2)
+
+    @classmethod
+    def today(cls):
+        return cls.day
+
+@patch('quanticon.ivy_bt.src.signals.datetime', _FixedDay)
+@patch('quanticon.ivy_bt.src.signals.strategies')
+@patch('quanticon.ivy_bt.src.signals.BacktestEngine')
+class TestSignalsCache(unittest.TestCase):
+
+    def setUp(self):
+        signals._signals_cache.clear()
+        _FixedDay.day = datetime(2024, 1, 2)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.preset = os.path.join(tmp.name, "EMACross_forex_Optimized_presets.json")
+        self._write_preset()
+
+    def tearDown(self):
+        signals._signals_cache.clear()
+
+    def _write_preset(self, mtime=1_700_000_000):
+        with open(self.preset, 'w') as f:
+            f.write('[{"p": 1, "tickers": ["TEST"]}]')
+        os.utime(self.preset, (mtime, mtime))
+
+    def _engine(self, mock_engine_cls):
+        mock_engine = MagicMock()
+        mock_engine.tickers = ['TEST']
+        mock_engine.data = {'TEST': pd.DataFrame({
+            'close': [100.0, 101.0],
+            'position_size': [0, 1.0],
+            'position': [0, 0],
+        }, index=pd.date_range(start='2024-01-01', periods=2))}
+        mock_engine_cls.return_value = mock_engine
+
+    def test_cache_hit(self, mock_engine_cls, mock_strategies):
+        self._engine(mock_engine_cls)
+        first = signals.generate_signals(self.preset, use_cache=True)
+        second = signals.generate_signals(self.preset, use_cache=True)
+        self.assertEqual(mock_engine_cls.call_count, 1)
+        pd.testing.assert_frame_equal(first, second)
+        # Callers get a copy, so editing one result can't leak into the next
+        second.loc[0, 'Action'] = 'EDITED'
+        self.assertEqual(signals.generate_signals(self.preset, use_cache=True).loc[0, 'Action'], 'BUY')
+
+    def test_cache_is_opt_in(self, mock_engine_cls, mock_strategies):
+        self._engine(mock_engine_cls)
+        signals.generate_signals(self.preset)
+        signals.generate_signals(self.preset)
+        self.assertEqual(mock_engine_cls.call_count, 2)
+        self.assertEqual(len(signals._signals_cache), 0)
+
+    def test_preset_mtime_invalidates(self, mock_engine_cls, mock_strategies):
+        self._engine(mock_engine_cls)
+        signals.generate_signals(self.preset, use_cache=True)
+        self._write_preset(mtime=1_700_000_100)
+        signals.generate_signals(self.preset, use_cache=True)
+        self.assertEqual(mock_engine_cls.call_count, 2)
+
+    def test_open_end_date_rolls_over(self, mock_engine_cls, mock_strategies):
+        self._engine(mock_engine_cls)
+        signals.generate_signals(self.preset, use_cache=True)
+        _FixedDay.day = datetime(2024, 1, 3)
+        signals.generate_signals(self.preset, use_cache=True)
+        self.assertEqual(mock_engine_cls.call_count, 2)
+        self.assertEqual(mock_engine_cls.call_args.args[2], '2024-01-03')
+
+    def test_cache_is_bounded(self, mock_engine_cls, mock_strategies):
+        self._engine(mock_engine_cls)
+        for lookback in range(signals._SIGNALS_CACHE_SIZE + 2):
+            signals.generate_signals(self.preset, lookback=lookback, use_cache=True)
+        self.assertEqual(len(signals._signals_cache), signals._SIGNALS_CACHE_SIZE)
+        # The oldest entries were evicted; the newest is still served from the cache
+        signals.generate_signals(self.preset, lookback=0, use_cache=True)
+        signals.generate_signals(self.preset, lookback=signals._SIGNALS_CACHE_SIZE + 1, use_cache=True)
+        self.assertEqual(mock_engine_cls.call_count, signals._SIGNALS_CACHE_SIZE + 3)
+
+class TestApplyPanelSizer(unittest.TestCase):
+
+    def test_panel_matches_per_ticker_sizer(self):
+        rng = np.random.default_rng(0)
+        dates = pd.date_range(start='2023-01-01', periods=80)
+        frames = {}
+        # 'OFF' trades on a shorter calendar, so it falls outside the panel
+        for ticker, index in [('A', dates), ('B', dates), ('OFF', dates[::2])]:
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+            frames[ticker] = pd.DataFrame({
+                'close': close,
+                'signal': rng.choice([-1, 0, 1], len(index)).astype(np.int8),
+                'log_return': np.log(close / np.roll(close, 1)),
+            }, index=index)
+
+        engine = signals.BacktestEngine(list(frames), start_date='2023-01-01')
+        engine.data = {t: df.copy() for t, df in frames.items()}
+        engine.results = {}
+        sizer = signals.VolatilitySizer(target_vol=0.15)
+        signals._apply_panel_sizer(engine, sizer)
+
+        self.assertEqual(set(engine.data), set(frames))
+        for ticker, df in frames.items():
+            expected = sizer.size_position(df)
+            expected['position'] = expected['position_size'].shift(1).fillna(0)
+            expected['strategy_return'] = expected['position'] * expected['log_return']
+            expected_metrics = engine.calculate_metrics(expected)
+
+            got = engine.data[ticker]
+            np.testing.assert_allclose(got['position_size'], expected['position_size'])
+            np.testing.assert_allclose(got['strategy_return'], expected['strategy_return'])
+            # Results and trades describe the re-sized positions, not the pre-sizing run
+            np.testing.assert_allclose(got['trades'], expected['trades'])
+            self.assertEqual(engine.results[ticker].keys(), expected_metrics.keys())
+            for key, value in expected_metrics.items():
+                if isinstance(value, (int, float)):
+                    np.testing.assert_allclose(engine.results[ticker][key], value, err_msg=key)
+
 if __name__ == '__main__':
     unittest.main()
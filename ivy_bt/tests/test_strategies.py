@@ -3,11 +3,23 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import subprocess
 
 # Ensure src is in path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.strategies import EMACross, BollingerReversion, RSIReversal
+from src.strategies import (
+    StrategyTemplate, EMACross, BollingerReversion, RSIReversal, MACDReversal, MACDTrend, Newsom10Strategy,
+    TurtleTradingSystem, ChannelBreakoutStrategy, NR7RangeBreakout, BouncyBallReversion,
+    TrendGridTrading, ReversalGridTrading, SwingPointReversal, WasherMeanReversion, DailyHighLowBreakout,
+    BBKCSqueezeBreakout,
+)
+from src.strategies._numba_kernels import (
+    ema_nb, rsi_nb, bbands_nb, vol_filter_nb, rolling_extrema, apply_time_exit, crosses, crosses_series,
+    donchian_channels, true_range_nb, rolling_max, rolling_min,
+)
+from src.strategies import _numba_kernels
+from src.strategies._indicator_cache import cached_ema, cached_macd, cached_table
 
 class TestStrategies(unittest.TestCase):
     def setUp(self):
@@ -87,5 +99,205 @@ class TestStrategies(unittest.TestCase):
         unique_signals = res['signal'].unique()
         self.assertTrue(np.any(unique_signals != 0), f"Should generate non-zero signals. Got: {unique_signals}")
 
+    def test_indicator_kernels_match_pandas(self):
+        rng = np.random.default_rng(0)
+        close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300))))
+        close.iloc[50:53] = np.nan
+        values = close.to_numpy()
+
+        # EMA seeded with the SMA of the first 'length' values
+        seeded = close.copy()
+        seeded.iloc[:9] = np.nan
+        seeded.iloc[9] = close.iloc[:10].mean()
+        np.testing.assert_allclose(ema_nb(values, 10), seeded.ewm(span=10, adjust=False).mean())
+
+        # RSI from Wilder (RMA) averages of up/down moves
+        delta = close.diff()
+        up = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        down = delta.clip(upper=0).abs().ewm(alpha=1 / 14, adjust=False).mean()
+        np.testing.assert_allclose(rsi_nb(values, 14), 100 * up / (up + down))
+
+        lower, mid, upper = bbands_nb(values, 20, 2.0, 0)
+        rolling = close.rolling(20)
+        np.testing.assert_allclose(mid, rolling.mean())
+        np.testing.assert_allclose(upper, rolling.mean() + 2.0 * rolling.std(ddof=0))
+        np.testing.assert_allclose(lower, rolling.mean() - 2.0 * rolling.std(ddof=0))
+
+        # Fused volatility filter equals the unfused ratio > EMA(ratio)
+        atr = np.abs(np.sin(np.arange(300.0)))
+        ratio = (atr / values) * 100
+        vol_ema, vol_active = vol_filter_nb(values, atr, 20)
+        np.testing.assert_array_equal(vol_ema, ema_nb(ratio, 20))
+        np.testing.assert_array_equal(vol_active, ratio > ema_nb(ratio, 20))
+
+        rolling_max, rolling_min = rolling_extrema(values, 22)
+        np.testing.assert_array_equal(rolling_max, close.rolling(22).max())
+        np.testing.assert_array_equal(rolling_min, close.rolling(22).min())
+
+    def test_daily_high_low_exits_after_hold_bars(self):
+        rng = np.random.default_rng(4)
+        df = self.df.copy()
+        df['close'] = 100 + rng.normal(0, 2, len(df)).cumsum()
+        df['high'] = df['close'] + 1
+        df['low'] = df['close'] - 1
+
+        signal = DailyHighLowBreakout(hold_days=3).strat_apply(df)['signal']
+        self.assertTrue(signal.ne(0).any())
+        # Daily bars: a position lasts at most three bars before going flat
+        run_length = signal.groupby(signal.ne(signal.shift()).cumsum()).cumcount() + 1
+        self.assertLessEqual(run_length[signal != 0].max(), 3)
+
+    def test_batch_apply_matches_strat_apply(self):
+        rng = np.random.default_rng(1)
+        df = self.df.copy()
+        df['close'] = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(df))))
+
+        cases = [
+            (EMACross, [{'fast': 5, 'slow': 20}, {'fast': 10, 'slow': 50}]),
+            (BollingerReversion, [{'length': 10, 'std': 1.5}, {'length': 20}]),
+            (RSIReversal, [{'length': 5, 'lower': 35, 'upper': 65}, {'midline': 45}]),
+            (MACDReversal, [{'fast': 8, 'slow': 21, 'signal': 5}, {}]),
+            (BBKCSqueezeBreakout, [{'length': 10, 'k_mult': 2.5, 'trade_with_breakout': True}, {}]),
+            (TurtleTradingSystem, [{'entry_window': 10, 'exit_window': 5}, {'exit_window': 20}, {}]),
+        ]
+        for cls, param_sets in cases:
+            for params, res in zip(param_sets, cls.batch_apply(df, param_sets)):
+                pd.testing.assert_frame_equal(res, cls(**params).strat_apply(df.copy()))
+
+    def test_non_mutating_strategies_leave_input_untouched(self):
+        for cls in (
+            EMACross, BollingerReversion, RSIReversal, MACDReversal, MACDTrend, Newsom10Strategy,
+            TurtleTradingSystem, ChannelBreakoutStrategy, NR7RangeBreakout, BouncyBallReversion,
+            TrendGridTrading, ReversalGridTrading, SwingPointReversal, WasherMeanReversion,
+            BBKCSqueezeBreakout, DailyHighLowBreakout,
+        ):
+            self.assertFalse(cls.mutates_input)
+            df = self.df.copy()
+            cls().strat_apply(df)
+            pd.testing.assert_frame_equal(df, self.df, obj=cls.__name__)
+
+    def test_assemble_signal_matches_ffill_mask_ffill(self):
+        rng = np.random.default_rng(2)
+        long_entry, short_entry, long_exit, short_exit = rng.random((4, 300)) < [[0.05], [0.05], [0.1], [0.1]]
+
+        expected = pd.Series(np.nan, index=range(300))
+        expected[long_entry] = 1
+        expected[short_entry] = -1
+        expected = expected.ffill().fillna(0)
+        expected = expected.mask(((expected == 1) & long_exit) | ((expected == -1) & short_exit), 0)
+
+        signal = StrategyTemplate.assemble_signal(
+            [short_entry, long_entry], [-1, 1], long_exit=long_exit, short_exit=short_exit
+        )
+        np.testing.assert_array_equal(signal, expected.ffill().fillna(0))
+
+    def test_apply_time_exit_matches_groupby_cumcount(self):
+        rng = np.random.default_rng(3)
+        entries = pd.Series(rng.choice([np.nan, np.nan, np.nan, -1.0, 1.0], 300))
+
+        is_entry = entries.notna() & (entries != entries.shift(1))
+        bars_held = entries.groupby(is_entry.cumsum()).cumcount()
+        expected = entries.ffill().fillna(0).mask(bars_held >= 4, 0)
+
+        signal = apply_time_exit(entries.to_numpy(), 4.0)
+        self.assertEqual(signal.dtype, np.int8)
+        np.testing.assert_array_equal(signal, expected)
+
+    def test_donchian_channels_match_shifted_rolling(self):
+        rng = np.random.default_rng(7)
+        high = pd.Series(100 + rng.normal(0, 1, 300).cumsum())
+        low = high - rng.uniform(0, 2, 300)
+        high[[40, 41, 200]] = np.nan
+        low[[90, 250]] = np.nan
+
+        channels = donchian_channels(high.to_numpy(), low.to_numpy(), 20, 7)
+        expected = (
+            high.shift(1).rolling(20).max(), low.shift(1).rolling(20).min(),
+            high.shift(1).rolling(7).max(), low.shift(1).rolling(7).min(),
+        )
+        for got, want in zip(channels, expected):
+            np.testing.assert_array_equal(got, want)
+        np.testing.assert_array_equal(rolling_max(high.to_numpy(), 20, 1), expected[0])
+        np.testing.assert_array_equal(rolling_min(low.to_numpy(), 7, 1), expected[3])
+
+    def test_true_range_matches_pandas(self):
+        high, low, close = self.df['high'].copy(), self.df['low'].copy(), self.df['close']
+        high.iloc[5] = low.iloc[5]  # a zero-range bar nudges every range by epsilon, as in ta
+        low.iloc[9] = np.nan
+
+        prev_close = close.shift(1)
+        hl_range = (high - low) + np.finfo(np.float64).eps
+        expected = pd.concat([hl_range, high - prev_close, prev_close - low], axis=1).abs().max(axis=1)
+
+        np.testing.assert_array_equal(
+            true_range_nb(high.to_numpy(), low.to_numpy(), close.to_numpy()), expected
+        )
+
+    def test_kernels_compile_in_warm_kernels_not_at_import(self):
+        # A fresh interpreter importing the strategies has compiled nothing
+        code = (
+            "import src.strategies, src.strategies._numba_kernels as k; "
+            "print(sum(len(f.signatures) for f in vars(k).values() if hasattr(f, 'signatures')))"
+        )
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), '0')
+
+        # warm_kernels covers every public kernel
+        _numba_kernels.warm_kernels()
+        cold = [
+            name for name, f in vars(_numba_kernels).items()
+            if hasattr(f, 'signatures') and not name.startswith('_') and not f.signatures
+        ]
+        self.assertEqual(cold, [])
+
+    def test_crosses_match_shifted_comparisons(self):
+        rng = np.random.default_rng(5)
+        a = pd.Series(rng.choice([-1.0, 0.0, 1.0, 2.0, np.nan], 300))
+        b = pd.Series(rng.choice([0.0, 1.0, np.nan], 300))
+
+        a_prev, b_prev = a.shift(1), b.shift(1)
+        expected_level = ((a_prev < 1.0) & (a >= 1.0)) | ((a_prev > 1.0) & (a <= 1.0))
+        expected_up = (a_prev < b_prev) & (a >= b)
+        expected_dn = (a_prev > b_prev) & (a <= b)
+
+        np.testing.assert_array_equal(crosses(a.to_numpy(), 1.0), expected_level)
+        np.testing.assert_array_equal(crosses_series(a.to_numpy(), b.to_numpy(), 1), expected_up)
+        np.testing.assert_array_equal(crosses_series(a.to_numpy(), b.to_numpy(), -1), expected_dn)
+        np.testing.assert_array_equal(crosses_series(a.to_numpy(), b.to_numpy(), 0),
+                                      expected_up | expected_dn)
+
+    def test_cached_table_computes_each_distinct_indicator_once(self):
+        close = self.df['close'].to_numpy(dtype=np.float64)
+        (emas,), rows = cached_table(cached_ema, close, [10, 20, 10, 5])
+        self.assertEqual(emas.shape, (3, len(close)))
+        for length, row in zip([10, 20, 10, 5], rows):
+            np.testing.assert_array_equal(emas[row], ema_nb(close, length))
+
+        params = np.array([[12, 26, 9], [8, 21, 5], [12, 26, 9]])
+        (macds, signal_lines), rows = cached_table(cached_macd, close, params)
+        self.assertEqual(rows[0], rows[2])
+        np.testing.assert_array_equal(signal_lines[rows[1]], cached_macd(close, 8, 21, 5)[1])
+
+    def test_as_f64_returns_contiguous_float64(self):
+        strided = pd.DataFrame(np.arange(12).reshape(4, 3), columns=['open', 'close', 'volume'])['close']
+        arr = StrategyTemplate.as_f64(strided)
+        self.assertTrue(arr.flags['C_CONTIGUOUS'])
+        self.assertEqual(arr.dtype, np.float64)
+        np.testing.assert_array_equal(arr, [1.0, 4.0, 7.0, 10.0])
+
+        close = self.df['close'].to_numpy(dtype=np.float64)
+        self.assertIs(StrategyTemplate.as_f64(close), close)
+
+    def test_indicator_cache_reuses_results_per_input(self):
+        close = self.df['close'].to_numpy(dtype=np.float64)
+        ema = cached_ema(close, 10)
+
+        np.testing.assert_array_equal(ema, ema_nb(close, 10))
+        self.assertIs(cached_ema(self.df['close'].to_numpy(dtype=np.float64), 10), ema)
+        self.assertFalse(ema.flags.writeable)
+        # A different frame (even with equal values) is a different cache entry
+        self.assertIsNot(cached_ema(self.df.copy()['close'].to_numpy(dtype=np.float64), 10), ema)
+
 if __name__ == '__main__':
     unittest.main()